@@ -0,0 +1,139 @@
+"""Checks and measures the bitboard Breakthrough engine.
+
+The script first plays random games with pyspiel and, at every move, checks
+that the engine finds the same legal actions, reaches the same board and ends
+the game at the same move with the same winner (the script exits with status 1
+at the first difference). It then measures the random rollouts per second of
+open_spiel's RandomRolloutEvaluator and of the engine for several batch sizes,
+from positions a few random moves into the game, compares the search speed of
+the mcts and mcts_bitboard bots, and plays a match between them at a fixed
+thinking time, swapping seats at every game.
+
+Run with:
+    python benchmarks/breakthrough_bitboard.py --validate-games 1000 --games 10
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+
+import pyspiel
+from open_spiel.python.algorithms import mcts
+
+from pygame_spiel.arena import play_game
+from pygame_spiel.bots import breakthrough_bitboard as bitboard
+from pygame_spiel.utils import init_bot
+
+from mcts_scaling import random_positions
+
+
+def validate(game, num_games: int, rng: np.random.RandomState) -> int:
+    """Plays random games with pyspiel and the engine, returns the moves checked."""
+    num_moves = 0
+    for game_index in range(num_games):
+        state = game.new_initial_state()
+        black, white, _ = (int(board[0]) for board in bitboard.from_states([state]))
+        while True:
+            player = state.current_player()
+            actions = bitboard.legal_actions(black, white, player)
+            if actions != sorted(state.legal_actions()):
+                sys.exit(f"game {game_index}: legal actions differ in\n{state}")
+            action = rng.choice(actions)
+            black, white, won = bitboard.apply_action(black, white, player, action)
+            state.apply_action(action)
+            num_moves += 1
+            if won != state.is_terminal():
+                sys.exit(f"game {game_index}: end of game differs in\n{state}")
+            if won:
+                if state.returns()[player] != 1:
+                    sys.exit(f"game {game_index}: winner differs in\n{state}")
+                break
+            boards = [int(board[0]) for board in bitboard.from_states([state])[:2]]
+            if boards != [black, white]:
+                sys.exit(f"game {game_index}: boards differ in\n{state}")
+    return num_moves
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--validate-games", type=int, default=1000)
+    parser.add_argument("--positions", type=int, default=20)
+    parser.add_argument("--rollouts", type=int, default=500, help="pyspiel rollouts")
+    parser.add_argument(
+        "--batch-sizes", type=int, nargs="+", default=[1, 16, 256, 4096]
+    )
+    parser.add_argument("--think-time", type=float, default=0.5)
+    parser.add_argument("--games", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    game = pyspiel.load_game("breakthrough")
+    rng = np.random.RandomState(args.seed)
+
+    start = time.perf_counter()
+    num_moves = validate(game, args.validate_games, rng)
+    print(
+        f"validation: {args.validate_games} games, {num_moves} moves identical "
+        f"to pyspiel ({time.perf_counter() - start:.1f}s)"
+    )
+
+    positions = random_positions(game, args.positions, args.seed)
+    evaluator = mcts.RandomRolloutEvaluator(1, rng)
+    start = time.perf_counter()
+    for i in range(args.rollouts):
+        evaluator.evaluate(positions[i % len(positions)])
+    reference = args.rollouts / (time.perf_counter() - start)
+    print(f"{'rollouts':>24} {'rollouts/s':>11} {'speed-up':>9}")
+    print(f"{'pyspiel, one by one':>24} {reference:>11.0f} {1:>8.1f}x")
+    black, white, player = bitboard.from_states(positions)
+    for batch_size in args.batch_sizes:
+        batch = np.arange(batch_size) % len(positions)
+        num_batches = max(1, 4096 // batch_size)
+        start = time.perf_counter()
+        for _ in range(num_batches):
+            bitboard.random_playouts(black[batch], white[batch], player[batch], rng)
+        rate = num_batches * batch_size / (time.perf_counter() - start)
+        label = f"bitboard, batch {batch_size}"
+        print(f"{label:>24} {rate:>11.0f} {rate / reference:>8.1f}x")
+
+    print(f"{'bot':>14} {'simulations/s':>14} {'rollouts/s':>11}")
+    for bot_type in ["mcts", "mcts_bitboard"]:
+        simulations, seconds = 0, 0.0
+        for state in positions:
+            bot = init_bot(bot_type, game, state.current_player(), seed=args.seed)
+            bot.step(state)
+            simulations += bot.last_search_stats["simulations"]
+            seconds += bot.last_search_stats["seconds"]
+        rollouts = getattr(bot.evaluator, "n_rollouts", 1)
+        print(
+            f"{bot_type:>14} {simulations / seconds:>14.0f} "
+            f"{simulations * rollouts / seconds:>11.0f}"
+        )
+
+    wins = {"mcts": 0, "mcts_bitboard": 0}
+    for game_index in range(args.games):
+        labels = ["mcts_bitboard", "mcts"]
+        if game_index % 2:
+            labels.reverse()
+        bots = [
+            init_bot(
+                label,
+                game,
+                player_id,
+                seed=args.seed + game_index,
+                time_limit=args.think_time,
+            )
+            for player_id, label in enumerate(labels)
+        ]
+        returns, _ = play_game(game.new_initial_state(), bots)
+        wins[labels[0] if returns[0] > returns[1] else labels[1]] += 1
+    if args.games:
+        print(
+            f"match at {args.think_time}s per move: mcts_bitboard "
+            f"{wins['mcts_bitboard']} - {wins['mcts']} mcts"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Compares two result files of benchmarks/suite.py and flags regressions.
+
+A metric regresses when its new value exceeds the baseline by more than the
+relative threshold and by more than an absolute noise floor, which depends on
+the unit of the metric (the end of its name). The script prints every metric
+present in both files and exits with status 1 if any of them regressed.
+
+Run with:
+    python benchmarks/compare.py baseline.json results.json --threshold 0.1
+"""
+import argparse
+import json
+import sys
+
+# Differences below these values are considered noise, whatever the ratio
+NOISE_FLOORS = {"_s": 0.02, "_ms": 0.05, "_mb": 2.0}
+
+
+def noise_floor(metric: str) -> float:
+    for suffix, floor in NOISE_FLOORS.items():
+        if metric.endswith(suffix):
+            return floor
+    return 0.0
+
+
+def compare(baseline: dict, results: dict, threshold: float) -> list:
+    """
+    Returns (metric, baseline value, new value, ratio, status) for every metric
+    measured in both runs. status is "regression", "improvement" or "".
+    """
+    rows = []
+    for metric in sorted(set(baseline) & set(results)):
+        old, new = baseline[metric], results[metric]
+        ratio = new / old if old else float("inf") if new else 1.0
+        status = ""
+        if abs(new - old) > noise_floor(metric):
+            if new > old * (1 + threshold):
+                status = "regression"
+            elif new < old * (1 - threshold):
+                status = "improvement"
+        rows.append((metric, old, new, ratio, status))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("baseline", help="results of the reference run")
+    parser.add_argument("results", help="results of the run to check")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="relative increase flagged as a regression (default: 0.1, i.e. +10%%)",
+    )
+    parser.add_argument(
+        "--only-changes", action="store_true", help="only print flagged metrics"
+    )
+    args = parser.parse_args()
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)["metrics"]
+    with open(args.results) as f:
+        results = json.load(f)["metrics"]
+
+    rows = compare(baseline, results, args.threshold)
+    width = max([len(row[0]) for row in rows] + [6])
+    print(f"{'metric':<{width}} {'baseline':>10} {'new':>10} {'ratio':>7}")
+    for metric, old, new, ratio, status in rows:
+        if args.only_changes and not status:
+            continue
+        print(f"{metric:<{width}} {old:>10.3f} {new:>10.3f} {ratio:>7.2f}  {status}")
+
+    missing = sorted(set(baseline) - set(results))
+    if missing:
+        print(f"not measured in {args.results}: {', '.join(missing)}")
+    regressions = [row[0] for row in rows if row[4] == "regression"]
+    if regressions:
+        print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+        sys.exit(1)
+    print("no regression")
+
+
+if __name__ == "__main__":
+    main()
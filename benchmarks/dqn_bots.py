@@ -0,0 +1,120 @@
+"""Compares the start-up cost and the move latency of the DQN bot implementations.
+
+For each implementation, a fresh interpreter imports its module (and its
+backend, e.g. TensorFlow) and then builds the bot for one player, as
+pygame_spiel does when the dqn bot is selected. The script reports the cold
+start (import and construction), the construction alone, the growth of the peak
+resident memory caused by both and the mean latency of a move, and checks that
+all implementations choose the same moves on a set of random positions.
+
+Run with:
+    python benchmarks/dqn_bots.py --checkpoint-dir path/to/weights_default
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+# Builder of every implementation, as "module:function"
+BUILDERS = {
+    "agent (bots/dqn.py)": "pygame_spiel.bots.dqn:build_bot",
+    "inference (bots/dqn_inference.py)": "pygame_spiel.bots.dqn_inference:build_bot",
+    "numpy (bots/dqn_numpy.py)": "pygame_spiel.bots.dqn_numpy:build_bot",
+}
+
+CHILD_SCRIPT = """
+import importlib, json, resource, sys, time
+import numpy as np
+import pyspiel
+module_name, function = sys.argv[1].split(":")
+checkpoint_dir, game_name, num_positions = sys.argv[2], sys.argv[3], int(sys.argv[4])
+game = pyspiel.load_game(game_name)
+
+rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+start = time.perf_counter()
+build_bot = getattr(importlib.import_module(module_name), function)
+build_start = time.perf_counter()
+bot = build_bot(game, 0, checkpoint_dir=checkpoint_dir)
+end = time.perf_counter()
+rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+rng = np.random.RandomState(0)
+actions, latencies = [], []
+while len(actions) < num_positions:
+    state = game.new_initial_state()
+    for _ in range(rng.randint(0, 20)):
+        if state.is_terminal():
+            break
+        state.apply_action(rng.choice(state.legal_actions()))
+    if not state.is_terminal() and state.current_player() == 0:
+        move_start = time.perf_counter()
+        actions.append(int(bot.step(state)))
+        latencies.append(time.perf_counter() - move_start)
+print(json.dumps({
+    "cold_start": end - start,
+    "build": end - build_start,
+    "peak_rss_mb": (rss_after - rss_before) / 1024,
+    "move_ms": 1000 * float(np.mean(latencies)),
+    "actions": actions,
+}), flush=True)
+"""
+
+
+def measure(builder: str, checkpoint_dir: str, game_name: str, positions: int) -> dict:
+    """Builds a bot in a fresh interpreter and returns its measurements."""
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            CHILD_SCRIPT,
+            builder,
+            checkpoint_dir,
+            game_name,
+            str(positions),
+        ],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        env=dict(os.environ, TF_CPP_MIN_LOG_LEVEL="3"),
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--game", default="breakthrough")
+    parser.add_argument("--checkpoint-dir", default=None)
+    parser.add_argument("--positions", type=int, default=20)
+    args = parser.parse_args()
+
+    checkpoint_dir = args.checkpoint_dir
+    if checkpoint_dir is None:
+        from pygame_spiel.utils import get_breakpoint_dir
+
+        checkpoint_dir = get_breakpoint_dir("dqn", args.game)
+
+    results = {
+        name: measure(builder, str(checkpoint_dir), args.game, args.positions)
+        for name, builder in BUILDERS.items()
+    }
+    print(
+        f"{'implementation':>34} {'cold start (s)':>15} {'build (s)':>10} "
+        f"{'peak RSS (MB)':>14} {'move (ms)':>10}"
+    )
+    for name, result in results.items():
+        print(
+            f"{name:>34} {result['cold_start']:>15.3f} {result['build']:>10.3f} "
+            f"{result['peak_rss_mb']:>14.1f} {result['move_ms']:>10.3f}"
+        )
+
+    reference = next(iter(results.values()))["actions"]
+    same = all(result["actions"] == reference for result in results.values())
+    print(f"same moves on {args.positions} positions: {same}")
+    if not same:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
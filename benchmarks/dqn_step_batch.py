@@ -0,0 +1,83 @@
+"""Throughput of DQN bots stepping many games at once with step_batch().
+
+The script collects positions where player 0 is to move (as in hundreds of
+concurrent arena or self-play games) and measures the moves per second of the
+DQN bots when each position is stepped on its own with step() and when groups
+of positions are stepped with a single step_batch() call. It also checks that
+both APIs choose the same moves.
+
+Run with:
+    python benchmarks/dqn_step_batch.py --checkpoint-dir path/to/weights_default
+"""
+import argparse
+import time
+
+import numpy as np
+import pyspiel
+
+from pygame_spiel.bots import dqn_numpy
+
+
+def player_positions(game, num_positions, seed):
+    """Returns non-terminal states, reached with random moves, where player 0 moves."""
+    rng = np.random.RandomState(seed)
+    positions = []
+    while len(positions) < num_positions:
+        state = game.new_initial_state()
+        for _ in range(2 * rng.randint(0, 15)):
+            if state.is_terminal():
+                break
+            state.apply_action(rng.choice(state.legal_actions()))
+        if not state.is_terminal() and state.current_player() == 0:
+            positions.append(state)
+    return positions
+
+
+def moves_per_second(step, positions, batch_size):
+    start = time.perf_counter()
+    actions = []
+    for i in range(0, len(positions), batch_size):
+        actions.extend(step(positions[i : i + batch_size]))
+    return len(positions) / (time.perf_counter() - start), actions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--game", default="breakthrough")
+    parser.add_argument("--checkpoint-dir", default=None)
+    parser.add_argument("--positions", type=int, default=1024)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 16, 64, 256])
+    parser.add_argument("--tf", action="store_true", help="also run bots/dqn.DQNBot")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    game = pyspiel.load_game(args.game)
+    checkpoint_dir = args.checkpoint_dir
+    if checkpoint_dir is None:
+        from pygame_spiel.utils import get_breakpoint_dir
+
+        checkpoint_dir = get_breakpoint_dir("dqn", args.game)
+    positions = player_positions(game, args.positions, args.seed)
+
+    bots = {"numpy": dqn_numpy.build_bot(game, 0, checkpoint_dir=checkpoint_dir)}
+    if args.tf:
+        from pygame_spiel.bots.dqn import DQNBot
+
+        bots["tf"] = DQNBot(game, 0, checkpoint_dir=str(checkpoint_dir))
+
+    for name, bot in bots.items():
+        speed, reference = moves_per_second(
+            lambda states: [bot.step(s) for s in states], positions, 1
+        )
+        print(f"{name}: step() {speed:10.0f} moves/s")
+        for batch_size in args.batch_sizes:
+            speed, actions = moves_per_second(bot.step_batch, positions, batch_size)
+            same = actions == [int(a) for a in reference]
+            print(
+                f"{name}: step_batch({batch_size:>3}) {speed:10.0f} moves/s"
+                f"{'' if same else '  DIFFERENT MOVES'}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Environment steps per second of the batched DQN training.
+
+For each number N of games stepped together, the script runs the trainer of
+bots/dqn_train.py for a fixed number of environment steps and reports the
+steps per second, with learning (the default schedule: a learning step every
+10 transitions of a player) and without it (acting only: observations,
+batched forward pass, epsilon-greedy selection and moves).
+
+Run with:
+    python benchmarks/dqn_training.py --game breakthrough --num-envs 1 4 16 64 256
+"""
+import argparse
+import time
+
+import pyspiel
+
+from pygame_spiel.bots.dqn_train import BatchedDQNTrainer
+
+
+def steps_per_second(game, num_envs: int, num_steps: int, learn: bool) -> float:
+    trainer = BatchedDQNTrainer(
+        game,
+        num_envs,
+        # Learning starts right away; without learning, it never happens
+        min_buffer_size=32 if learn else num_steps * 10,
+        learn_every=10 if learn else num_steps * 10,
+    )
+    trainer.run(max(num_envs, 1000))  # Warm-up, fills the replay buffers
+    played = trainer.env_steps
+    start = time.perf_counter()
+    trainer.run(num_steps)
+    return (trainer.env_steps - played) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--game", default="breakthrough")
+    parser.add_argument(
+        "--num-envs", type=int, nargs="+", default=[1, 4, 16, 64, 256]
+    )
+    parser.add_argument("--steps", type=int, default=8192, help="steps per run")
+    args = parser.parse_args()
+
+    game = pyspiel.load_game(args.game)
+    print(f"{args.game}, {args.steps} environment steps per run")
+    print(f"{'N':>5} {'acting (steps/s)':>17} {'training (steps/s)':>19}")
+    for num_envs in args.num_envs:
+        acting = steps_per_second(game, num_envs, args.steps, learn=False)
+        training = steps_per_second(game, num_envs, args.steps, learn=True)
+        print(f"{num_envs:>5} {acting:>17.0f} {training:>19.0f}")
+
+
+if __name__ == "__main__":
+    main()
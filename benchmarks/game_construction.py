@@ -0,0 +1,80 @@
+"""Game-construction time with cold and warm asset caches.
+
+Each measurement runs in a fresh interpreter that opens a (headless) window and
+times the construction of a game, as when a match starts from the menu:
+
+* cold: first game of the process, images decoded from the PNG files
+* warm process: second game of the same process, images taken from the
+  in-memory cache of pygame_spiel.assets
+* warm disk: first game of a new process, with PYGAME_SPIEL_ASSET_CACHE=1 and
+  the decoded images already stored on disk by a previous process
+
+Run with:
+    python benchmarks/game_construction.py --runs 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+CHILD_SCRIPT = """
+import json, sys, time
+import pygame
+from pygame_spiel.games.factory import GameFactory
+pygame.init()
+pygame.display.set_mode((1200, 1200))
+timings = []
+for _ in range(2):
+    start = time.perf_counter()
+    GameFactory.get_game(sys.argv[1], current_player=0)
+    timings.append(time.perf_counter() - start)
+print(json.dumps(timings), flush=True)
+"""
+
+
+def construct(game_name: str, env: dict) -> list:
+    """Returns the construction times of two games built in a fresh interpreter."""
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD_SCRIPT, game_name],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        env=env,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", nargs="+", default=["breakthrough", "tic_tac_toe"])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", PYGAME_HIDE_SUPPORT_PROMPT="1")
+    with tempfile.TemporaryDirectory() as cache:
+        disk_env = dict(env, PYGAME_SPIEL_CACHE_DIR=cache, PYGAME_SPIEL_ASSET_CACHE="1")
+        print(
+            f"{'game':>14} {'cold (ms)':>10} {'warm process (ms)':>18} "
+            f"{'warm disk (ms)':>15}"
+        )
+        for game_name in args.games:
+            cold, warm_process, warm_disk = [], [], []
+            construct(game_name, disk_env)  # Fills the disk cache
+            for _ in range(args.runs):
+                first, second = construct(game_name, env)
+                cold.append(first)
+                warm_process.append(second)
+                warm_disk.append(construct(game_name, disk_env)[0])
+            print(
+                f"{game_name:>14} {statistics.median(cold) * 1000:>10.2f} "
+                f"{statistics.median(warm_process) * 1000:>18.2f} "
+                f"{statistics.median(warm_disk) * 1000:>15.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
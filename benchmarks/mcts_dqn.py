@@ -0,0 +1,89 @@
+"""Compares the MCTS bot evaluating its leaves with the DQN networks to the rollout one.
+
+For several batch sizes, the script measures the search speed and the latency per
+move (with the default budget of 400 simulations) of the mcts_dqn bot on a set
+of random positions, then plays a match against the mcts bot (random rollouts)
+with the same time budget per move and reports the win rate of mcts_dqn.
+
+Run with:
+    python benchmarks/mcts_dqn.py --batch-sizes 1 8 16 32 --think-time 1 --games 10
+"""
+import argparse
+import statistics
+
+import pyspiel
+
+from pygame_spiel.arena import play_game
+from pygame_spiel.bots import mcts, mcts_dqn
+from pygame_spiel.utils import get_breakpoint_dir
+
+from mcts_scaling import random_positions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--game", default="breakthrough")
+    parser.add_argument("--checkpoint-dir", default=None)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8, 16, 32])
+    parser.add_argument("--think-time", type=float, default=1.0)
+    parser.add_argument("--positions", type=int, default=10)
+    parser.add_argument("--games", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    game = pyspiel.load_game(args.game)
+    checkpoint_dir = args.checkpoint_dir or get_breakpoint_dir("mcts_dqn", args.game)
+    positions = random_positions(game, args.positions, args.seed)
+
+    rollout = mcts.build_bot(game, 0, seed=args.seed, time_limit=args.think_time)
+    speeds = []
+    for state in positions:
+        rollout.restart_at(state)
+        rollout.step(state)
+        speeds.append(rollout.last_search_stats["simulations_per_second"])
+    print(f"rollout mcts: {statistics.mean(speeds):.0f} sims/s")
+
+    print(f"{'batch':>5} {'sims/s':>10} {'ms/move':>8} {'win rate':>9}")
+    for batch_size in args.batch_sizes:
+        speeds, latencies = [], []
+        bot = mcts_dqn.build_bot(
+            game, 0, checkpoint_dir=checkpoint_dir, batch_size=batch_size
+        )
+        for state in positions:
+            bot.restart_at(state)
+            bot.step(state)
+            speeds.append(bot.last_search_stats["simulations_per_second"])
+            latencies.append(bot.last_search_stats["seconds"])
+
+        bot = mcts_dqn.build_bot(
+            game,
+            0,
+            checkpoint_dir=checkpoint_dir,
+            seed=args.seed,
+            time_limit=args.think_time,
+            batch_size=batch_size,
+        )
+
+        wins = 0.0
+        for game_index in range(args.games):
+            opponent = mcts.build_bot(
+                game, 0, seed=args.seed + game_index, time_limit=args.think_time
+            )
+            seat = game_index % 2
+            bot.restart_at(game.new_initial_state())
+            bots = [bot, opponent] if seat == 0 else [opponent, bot]
+            returns, _ = play_game(game.new_initial_state(), bots)
+            if returns[seat] > returns[1 - seat]:
+                wins += 1
+            elif returns[seat] == returns[1 - seat]:
+                wins += 0.5
+
+        win_rate = wins / args.games if args.games else float("nan")
+        print(
+            f"{batch_size:>5} {statistics.mean(speeds):>10.0f} "
+            f"{statistics.mean(latencies) * 1000:>8.0f} {win_rate:>9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Scaling of the root-parallel MCTS bot with the number of worker processes.
+
+For every worker count, the script measures the simulations per second of
+ParallelMCTSBot on a set of random positions, then plays a match against the
+single-process MCTS bot with the same time budget per move and reports the win
+rate of the parallel bot.
+
+Run with:
+    python benchmarks/mcts_scaling.py --workers 1 2 4 8 16 --think-time 1 --games 20
+"""
+import argparse
+import os
+import statistics
+
+import numpy as np
+import pyspiel
+
+from pygame_spiel.arena import play_game
+from pygame_spiel.bots import mcts, parallel_mcts
+
+
+def random_positions(game, num_positions, seed):
+    """Returns non-terminal states reached with a few random moves."""
+    rng = np.random.RandomState(seed)
+    positions = []
+    while len(positions) < num_positions:
+        state = game.new_initial_state()
+        for _ in range(rng.randint(0, 20)):
+            if state.is_terminal():
+                break
+            state.apply_action(rng.choice(state.legal_actions()))
+        if not state.is_terminal():
+            positions.append(state)
+    return positions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--game", default="breakthrough")
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=[1, 2, 4, 8, os.cpu_count()]
+    )
+    parser.add_argument("--think-time", type=float, default=1.0)
+    parser.add_argument("--positions", type=int, default=10)
+    parser.add_argument("--games", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    game = pyspiel.load_game(args.game)
+    positions = random_positions(game, args.positions, args.seed)
+
+    print(f"{'workers':>7} {'sims/s':>10} {'speedup':>8} {'win rate':>9}")
+    base_speed = None
+    for num_workers in sorted(set(args.workers)):
+        bot = parallel_mcts.build_bot(
+            game,
+            0,
+            seed=args.seed,
+            time_limit=args.think_time,
+            num_workers=num_workers,
+        )
+        try:
+            # The first move also pays the start-up of the worker processes
+            bot.step(positions[0])
+            speeds = []
+            for state in positions:
+                bot.step(state)
+                speeds.append(bot.last_search_stats["simulations_per_second"])
+            speed = statistics.mean(speeds)
+            base_speed = base_speed or speed
+
+            wins = 0.0
+            for game_index in range(args.games):
+                opponent = mcts.build_bot(
+                    game, 0, seed=args.seed + game_index, time_limit=args.think_time
+                )
+                seat = game_index % 2
+                bots = [bot, opponent] if seat == 0 else [opponent, bot]
+                returns, _ = play_game(game.new_initial_state(), bots)
+                if returns[seat] > returns[1 - seat]:
+                    wins += 1
+                elif returns[seat] == returns[1 - seat]:
+                    wins += 0.5
+        finally:
+            bot.close()
+
+        win_rate = wins / args.games if args.games else float("nan")
+        print(
+            f"{num_workers:>7} {speed:>10.0f} {speed / base_speed:>7.2f}x "
+            f"{win_rate:>9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
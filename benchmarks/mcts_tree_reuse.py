@@ -0,0 +1,86 @@
+"""Compares the MCTS bot with and without tree reuse.
+
+Both bots use the same simulation budget (the root must reach max_simulations
+visits before moving). The bot reusing its tree only runs the simulations that
+the inherited subtree does not already provide. The script reports the number of
+fresh simulations per move of both bots, their search time and the match score.
+
+Run with:
+    python benchmarks/mcts_tree_reuse.py --game breakthrough --games 10
+"""
+import argparse
+import statistics
+
+import numpy as np
+import pyspiel
+from open_spiel.python.algorithms import mcts as os_mcts
+
+from pygame_spiel.arena import play_game
+from pygame_spiel.bots.mcts import MCTSBot
+
+
+class _RecordingBot(MCTSBot):
+    """MCTSBot storing the statistics of every search."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.history_stats = []
+
+    def mcts_search(self, state):
+        root = super().mcts_search(state)
+        self.history_stats.append(self.last_search_stats)
+        return root
+
+
+def make_bot(game, reuse_tree, max_simulations, seed):
+    rng = np.random.RandomState(seed)
+    evaluator = os_mcts.RandomRolloutEvaluator(1, rng)
+    return _RecordingBot(
+        game,
+        2,
+        max_simulations,
+        evaluator,
+        reuse_tree=reuse_tree,
+        random_state=rng,
+        solve=True,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--game", default="breakthrough")
+    parser.add_argument("--games", type=int, default=10)
+    parser.add_argument("--max-simulations", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    game = pyspiel.load_game(args.game)
+    reuse = make_bot(game, True, args.max_simulations, args.seed)
+    fresh = make_bot(game, False, args.max_simulations, args.seed + 1)
+
+    score = {"reuse": 0, "no_reuse": 0, "draws": 0}
+    for game_index in range(args.games):
+        bots = [reuse, fresh] if game_index % 2 == 0 else [fresh, reuse]
+        returns, _ = play_game(game.new_initial_state(), bots)
+        reuse_player = 0 if game_index % 2 == 0 else 1
+        if returns[reuse_player] > returns[1 - reuse_player]:
+            score["reuse"] += 1
+        elif returns[reuse_player] < returns[1 - reuse_player]:
+            score["no_reuse"] += 1
+        else:
+            score["draws"] += 1
+
+    for name, bot in [("reuse", reuse), ("no_reuse", fresh)]:
+        simulations = [s["simulations"] for s in bot.history_stats]
+        reused = [s["reused_visits"] for s in bot.history_stats]
+        seconds = [s["seconds"] for s in bot.history_stats]
+        print(
+            f"{name:>9}: {statistics.mean(simulations):7.1f} fresh simulations/move, "
+            f"{statistics.mean(reused):7.1f} reused visits/move, "
+            f"{statistics.mean(seconds) * 1000:7.1f} ms/move"
+        )
+    print(f"score over {args.games} games: {score}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Latency per move of a bot behind the move cache, on misses and on hits.
+
+The mcts bot (wrapped in a CachedBot with a fresh database) is stepped on a set
+of random positions three times:
+
+* miss: the positions are new, every move is searched and stored
+* memory hit: same bot again, moves answered by the in-memory LRU
+* disk hit: a new cache on the same database, as in a new process, so moves
+  are read from SQLite (and copied into memory)
+
+Run with:
+    python benchmarks/move_cache.py --positions 20 --think-time 0.2
+"""
+import argparse
+import pathlib
+import statistics
+import tempfile
+import time
+
+import pyspiel
+
+from pygame_spiel.bots import mcts
+from pygame_spiel.bots.cached import CachedBot, MoveCache
+
+from mcts_scaling import random_positions
+
+
+def step_all(bot, positions):
+    """Returns the latency of bot.step on each position, in seconds."""
+    latencies = []
+    for state in positions:
+        start = time.perf_counter()
+        bot.step(state)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--game", default="breakthrough")
+    parser.add_argument("--think-time", type=float, default=0.2)
+    parser.add_argument("--positions", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    game = pyspiel.load_game(args.game)
+    positions = random_positions(game, args.positions, args.seed)
+    bot = mcts.build_bot(game, 0, seed=args.seed, time_limit=args.think_time)
+    config = f"mcts seed={args.seed} time_limit={args.think_time}"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = pathlib.Path(tmp, "moves.sqlite")
+        cache = MoveCache(path)
+        cached_bot = CachedBot(bot, config, cache)
+        results = {
+            "miss": step_all(cached_bot, positions),
+            "memory hit": step_all(cached_bot, positions),
+        }
+        cache.close()
+
+        disk_cache = MoveCache(path)
+        results["disk hit"] = step_all(CachedBot(bot, config, disk_cache), positions)
+        disk_cache.close()
+
+        print(f"{'lookup':>12} {'median (ms)':>12} {'max (ms)':>10}")
+        for name, latencies in results.items():
+            print(
+                f"{name:>12} {statistics.median(latencies) * 1000:>12.3f} "
+                f"{max(latencies) * 1000:>10.3f}"
+            )
+        print(f"counters: {cache.counters} then {disk_cache.counters}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Latency per move of the MCTS bot with and without pondering.
+
+The bot plays games against an opponent standing in for the human: an MCTS bot
+searching for --human-search seconds, whose move is then played after a pause
+of --human-time seconds, as if a human was thinking. With pondering, the bot
+searches in the background during the pause only (so both variants get the
+same CPU time). The script reports the latency of the bot's moves (as
+perceived by the opponent), the share of instant moves (ponder hits, under a
+tenth of the thinking time) and the visits of the root inherited from the
+pondering.
+
+Run with:
+    python benchmarks/pondering.py --think-time 1 --human-time 2 --games 4
+"""
+import argparse
+import statistics
+import time
+
+import pyspiel
+
+from pygame_spiel.bots import mcts
+
+
+def play(game, think_time, human_search, human_time, ponder, seed):
+    """Plays a game and returns the latency and reused visits of the bot's moves."""
+    bot = mcts.build_bot(game, 0, seed=seed, time_limit=think_time)
+    opponent = mcts.build_bot(game, 1, seed=seed + 1, time_limit=human_search)
+    state = game.new_initial_state()
+    latencies, reused = [], []
+    while not state.is_terminal():
+        if state.current_player() == 0:
+            start = time.perf_counter()
+            action = bot.step(state)
+            latencies.append(time.perf_counter() - start)
+            reused.append(bot.last_search_stats["reused_visits"])
+            opponent.inform_action(state, 0, action)
+            state.apply_action(action)
+        else:
+            action = opponent.step(state)
+            # The human takes a while before playing
+            if ponder:
+                bot.start_pondering(state)
+            time.sleep(human_time)
+            bot.inform_action(state, 1, action)
+            state.apply_action(action)
+    bot.close()
+    return latencies, reused
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--game", default="breakthrough")
+    parser.add_argument("--think-time", type=float, default=1.0)
+    parser.add_argument("--human-search", type=float, default=1.0)
+    parser.add_argument("--human-time", type=float, default=2.0)
+    parser.add_argument("--games", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    game = pyspiel.load_game(args.game)
+    print(
+        f"{'pondering':>10} {'mean (ms)':>10} {'median (ms)':>12} "
+        f"{'instant moves':>14} {'median reused visits':>21}"
+    )
+    for ponder in [False, True]:
+        latencies, reused = [], []
+        for game_index in range(args.games):
+            game_latencies, game_reused = play(
+                game,
+                args.think_time,
+                args.human_search,
+                args.human_time,
+                ponder,
+                args.seed + game_index,
+            )
+            # The first move cannot benefit from pondering
+            latencies += game_latencies[1:]
+            reused += game_reused[1:]
+        instant = sum(latency < args.think_time / 10 for latency in latencies)
+        print(
+            f"{str(ponder):>10} {statistics.mean(latencies) * 1000:>10.1f} "
+            f"{statistics.median(latencies) * 1000:>12.1f} "
+            f"{instant / len(latencies):>14.0%} {statistics.median(reused):>21.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
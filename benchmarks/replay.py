@@ -0,0 +1,70 @@
+"""Recording and replay speed of the binary game records.
+
+The script plays random games, appends them to a record file with
+GameRecorder (one flushed write per move, as during a real game), then reads
+the file back and replays every game from its actions, without bots. It
+reports the cost of recording a move, the size of the file per move and the
+games read and replayed per second.
+
+Run with:
+    python benchmarks/replay.py --game breakthrough --games 5000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+import pyspiel
+
+from pygame_spiel.records import GameRecorder, read_records, replay
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--game", default="breakthrough")
+    parser.add_argument("--games", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    game = pyspiel.load_game(args.game)
+    rng = np.random.RandomState(args.seed)
+    bots = [{"type": "random", "params": {}}, {"type": "random", "params": {}}]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "games.pgsr")
+        num_moves, record_seconds = 0, 0.0
+        for _ in range(args.games):
+            state = game.new_initial_state()
+            recorder = GameRecorder(path, args.game, bots)
+            while not state.is_terminal():
+                action = rng.choice(state.legal_actions())
+                start = time.perf_counter()
+                recorder.record_move(state.current_player(), action)
+                record_seconds += time.perf_counter() - start
+                state.apply_action(action)
+                num_moves += 1
+            recorder.finish(state.returns())
+            recorder.close()
+        size = os.path.getsize(path)
+
+        start = time.perf_counter()
+        records = list(read_records(path))
+        read_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        for record in records:
+            replay(record)
+        replay_seconds = time.perf_counter() - start
+
+    print(f"{args.games} games, {num_moves} moves, {size / 1024:.0f} KiB")
+    print(f"  recording: {record_seconds / num_moves * 1e6:.1f} us per move")
+    print(f"  size:      {size / num_moves:.1f} bytes per move (headers included)")
+    print(f"  reading:   {args.games / read_seconds:.0f} games/s")
+    print(f"  replaying: {args.games / replay_seconds:.0f} games/s")
+    total = read_seconds + replay_seconds
+    print(f"  total:     {args.games / total:.0f} games/s")
+
+
+if __name__ == "__main__":
+    main()
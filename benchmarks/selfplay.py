@@ -0,0 +1,69 @@
+"""Throughput of the self-play data generator.
+
+The script generates self-play samples with an increasing number of worker
+processes and reports the samples per second, overall and per core. It then
+opens the shards as memory maps and measures how fast random training batches
+are gathered and unpacked from them.
+
+Run with:
+    python benchmarks/selfplay.py --bots random random --games 2000 --workers 1 2 4
+"""
+import argparse
+import tempfile
+import time
+
+import numpy as np
+
+from pygame_spiel.selfplay import generate, open_shards, unpack
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--game", default="breakthrough")
+    parser.add_argument("--bots", nargs=2, default=["random", "random"])
+    parser.add_argument("--games", type=int, default=2000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--think-time", type=float, default=None)
+    parser.add_argument("--shard-size", type=int, default=65536)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--batches", type=int, default=1000)
+    args = parser.parse_args()
+
+    print(f"{args.game}, {' vs '.join(args.bots)}, {args.games} games")
+    for num_workers in args.workers:
+        with tempfile.TemporaryDirectory() as tmp:
+            summary = generate(
+                args.game,
+                args.bots,
+                args.games,
+                tmp,
+                num_workers=num_workers,
+                shard_size=args.shard_size,
+                think_time=args.think_time,
+            )
+            print(
+                f"  {num_workers:>2} workers: {summary['samples_per_second']:>8.0f}"
+                f" samples/s, {summary['samples_per_second_per_core']:>8.0f}"
+                " samples/s per core"
+            )
+
+            start = time.perf_counter()
+            index, shards = open_shards(tmp)
+            open_seconds = time.perf_counter() - start
+            rng = np.random.RandomState(0)
+            start = time.perf_counter()
+            for _ in range(args.batches):
+                shard = shards[rng.randint(len(shards))]
+                rows = np.sort(rng.randint(len(shard), size=args.batch_size))
+                unpack(shard[rows], index)
+            seconds = time.perf_counter() - start
+    samples = args.batches * args.batch_size
+    print(f"  opening the shards: {open_seconds * 1000:.2f} ms")
+    print(
+        f"  reading: {samples / seconds:.0f} samples/s "
+        f"(random batches of {args.batch_size}, unpacked)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Measures pygame_spiel's time-to-menu.
+
+Every run starts a fresh interpreter that imports pygame_spiel, builds the main
+menu and draws its first frame, exactly as the pygame_spiel command does before
+waiting for user input. The wall time from process spawn to the first menu frame
+is compared against TIME_TO_MENU_TARGET and the script exits with status 1 when
+the median exceeds it.
+
+Run headless with:
+    SDL_VIDEODRIVER=dummy python benchmarks/startup.py
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Time-to-menu budget in seconds. No heavy backend (TensorFlow, PyTorch) may be
+# imported before the user selects a bot that needs it.
+TIME_TO_MENU_TARGET = 1.0
+
+HEAVY_MODULES = ["tensorflow", "torch"]
+
+CHILD_SCRIPT = """
+import json, sys
+from pygame_spiel.menu import Menu
+import pygame
+menu = Menu()
+menu._mainmenu.draw(menu._menu_surface)
+pygame.display.flip()
+heavy = [m for m in %r if m in sys.modules]
+print(json.dumps({"heavy_modules": heavy}), flush=True)
+""" % (HEAVY_MODULES,)
+
+
+def time_to_menu() -> dict:
+    """Spawns an interpreter, waits for its first menu frame and returns the timing."""
+    env = dict(os.environ)
+    env.setdefault("SDL_VIDEODRIVER", "dummy")
+    env.setdefault("SDL_AUDIODRIVER", "dummy")
+    env["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+
+    start = time.perf_counter()
+    child = subprocess.Popen(
+        [sys.executable, "-c", CHILD_SCRIPT],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        env=env,
+        text=True,
+    )
+    line = ""
+    for line in child.stdout:
+        if line.startswith("{"):
+            break
+    elapsed = time.perf_counter() - start
+    child.wait()
+    if not line.startswith("{"):
+        raise RuntimeError("The menu process exited without drawing the menu")
+    result = json.loads(line)
+    result["seconds"] = elapsed
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="number of cold starts")
+    parser.add_argument(
+        "--target",
+        type=float,
+        default=TIME_TO_MENU_TARGET,
+        help="time-to-menu budget in seconds",
+    )
+    args = parser.parse_args()
+
+    results = [time_to_menu() for _ in range(args.runs)]
+    timings = [r["seconds"] for r in results]
+    heavy = sorted({m for r in results for m in r["heavy_modules"]})
+    median = statistics.median(timings)
+
+    print(f"time-to-menu over {args.runs} runs:")
+    print(f"  median {median:.3f}s  min {min(timings):.3f}s  max {max(timings):.3f}s")
+    print(f"  target {args.target:.3f}s")
+    if heavy:
+        print(f"  heavy modules imported before the menu: {heavy}")
+
+    if median > args.target or heavy:
+        print("FAIL")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""Runs the benchmark suite and saves the results as JSON.
+
+Every measurement runs in a fresh interpreter, headless (SDL_VIDEODRIVER=dummy):
+
+* startup: import time of pygame_spiel.main, time from process spawn to the
+  first menu frame, and to the first frame of a game
+* frame: cost of Game.play() for every game, when nothing changed (idle
+  frame) and when the whole screen is redrawn (after invalidate())
+* bot: for every game and bot type, growth of the peak resident memory during
+  Game.set_bots() and distribution of the latency of bot.step() on random
+  positions
+
+All the metrics are "lower is better" and their unit ends their name (_s, _ms
+or _mb). Compare two result files with benchmarks/compare.py.
+
+Run with:
+    python benchmarks/suite.py --output results.json
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+from startup import time_to_menu
+
+IMPORT_SCRIPT = """
+import json, time
+start = time.perf_counter()
+import pygame_spiel.main
+print(json.dumps({"seconds": time.perf_counter() - start}), flush=True)
+"""
+
+FIRST_GAME_FRAME_SCRIPT = """
+import json
+import pygame
+from pygame_spiel.games.factory import GameFactory
+game = GameFactory.get_game("tic_tac_toe", current_player=0)
+game.set_bots("human", None, "random", None)
+game.play([])
+print(json.dumps({}), flush=True)
+"""
+
+FRAME_SCRIPT = """
+import json, sys, time
+import pygame
+from pygame_spiel.games.factory import GameFactory
+game_name, num_frames = sys.argv[1], int(sys.argv[2])
+game = GameFactory.get_game(game_name, current_player=0)
+game.set_bots("human", None, "random", None)
+game.play([])
+timings = {"idle": [], "redraw": []}
+for _ in range(num_frames):
+    start = time.perf_counter()
+    game.play([])
+    timings["idle"].append(time.perf_counter() - start)
+    game.invalidate()
+    start = time.perf_counter()
+    game.play([])
+    timings["redraw"].append(time.perf_counter() - start)
+print(json.dumps(timings), flush=True)
+"""
+
+BOT_SCRIPT = """
+import json, resource, sys, time
+import numpy as np
+import pygame
+from pygame_spiel.games.factory import GameFactory
+game_name, bot_type, num_positions = sys.argv[1], sys.argv[2], int(sys.argv[3])
+think_time = None if sys.argv[4] == "none" else float(sys.argv[4])
+game = GameFactory.get_game(game_name, current_player=0, async_bots=False)
+
+rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+game.set_bots("human", None, bot_type, {"time_limit": think_time})
+rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+bot = game._bots[1]
+
+# Random positions where the bot (player 1) has to move
+rng = np.random.RandomState(0)
+latencies = []
+while len(latencies) < num_positions:
+    state = game._game.new_initial_state()
+    for _ in range(rng.randint(1, 20)):
+        if state.is_terminal():
+            break
+        state.apply_action(rng.choice(state.legal_actions()))
+    if not state.is_terminal() and state.current_player() == 1:
+        bot.restart_at(state)
+        start = time.perf_counter()
+        bot.step(state)
+        latencies.append(time.perf_counter() - start)
+game.close()
+print(json.dumps({
+    "set_bots_peak_rss_mb": (rss_after - rss_before) / 1024,
+    "latencies": latencies,
+}), flush=True)
+"""
+
+
+def run_child(script: str, *args: str) -> dict:
+    """Runs script in a fresh headless interpreter and returns its last JSON line."""
+    env = dict(
+        os.environ,
+        SDL_VIDEODRIVER="dummy",
+        SDL_AUDIODRIVER="dummy",
+        PYGAME_HIDE_SUPPORT_PROMPT="1",
+        TF_CPP_MIN_LOG_LEVEL="3",
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script, *args],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        env=env,
+        text=True,
+    )
+    lines = [line for line in output.stdout.splitlines() if line.startswith("{")]
+    if output.returncode != 0 or not lines:
+        error = output.stderr.strip().splitlines()
+        raise RuntimeError(error[-1] if error else f"exit status {output.returncode}")
+    return json.loads(lines[-1])
+
+
+def distribution(prefix: str, seconds: list) -> dict:
+    """Returns the median, 90th and 99th percentiles and maximum of timings, in ms."""
+    ms = sorted(1000 * s for s in seconds)
+    quantiles = statistics.quantiles(ms, n=100, method="inclusive")
+    return {
+        f"{prefix}.median_ms": statistics.median(ms),
+        f"{prefix}.p90_ms": quantiles[89],
+        f"{prefix}.p99_ms": quantiles[98],
+        f"{prefix}.max_ms": ms[-1],
+    }
+
+
+def measure_startup(runs: int) -> dict:
+    imports, menus, first_frames = [], [], []
+    for _ in range(runs):
+        imports.append(run_child(IMPORT_SCRIPT)["seconds"])
+        menus.append(time_to_menu()["seconds"])
+        start = time.perf_counter()
+        run_child(FIRST_GAME_FRAME_SCRIPT)
+        first_frames.append(time.perf_counter() - start)
+    return {
+        "startup.import_s": statistics.median(imports),
+        "startup.time_to_menu_s": statistics.median(menus),
+        "startup.time_to_first_game_frame_s": statistics.median(first_frames),
+    }
+
+
+def measure_frames(game_name: str, num_frames: int) -> dict:
+    timings = run_child(FRAME_SCRIPT, game_name, str(num_frames))
+    metrics = {}
+    for kind, seconds in timings.items():
+        metrics.update(distribution(f"frame.{game_name}.{kind}", seconds))
+    return metrics
+
+
+def measure_bot(
+    game_name: str, bot_type: str, num_positions: int, think_time: float
+) -> dict:
+    result = run_child(
+        BOT_SCRIPT,
+        game_name,
+        bot_type,
+        str(num_positions),
+        "none" if think_time is None else str(think_time),
+    )
+    prefix = f"bot.{game_name}.{bot_type}"
+    metrics = {f"{prefix}.set_bots_peak_rss_mb": result["set_bots_peak_rss_mb"]}
+    metrics.update(distribution(f"{prefix}.step", result["latencies"]))
+    return metrics
+
+
+def main():
+    # Imported here so that --help works without the game's dependencies
+    from pygame_spiel.games.settings import GAMES_BOTS
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--games", nargs="+", default=list(GAMES_BOTS))
+    parser.add_argument(
+        "--bots", nargs="+", default=None, help="bot types (default: all of the game)"
+    )
+    parser.add_argument("--runs", type=int, default=3, help="cold starts to time")
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--positions", type=int, default=20)
+    parser.add_argument(
+        "--think-time",
+        type=float,
+        default=None,
+        help="time limit of the bots in seconds (default: their own budget)",
+    )
+    args = parser.parse_args()
+
+    metrics, skipped = {}, {}
+    print("startup...", flush=True)
+    metrics.update(measure_startup(args.runs))
+    for game_name in args.games:
+        print(f"frames of {game_name}...", flush=True)
+        metrics.update(measure_frames(game_name, args.frames))
+        for bot_type in args.bots or ["random"] + list(GAMES_BOTS[game_name]):
+            if bot_type not in GAMES_BOTS[game_name] and bot_type != "random":
+                continue
+            print(f"bot {bot_type} on {game_name}...", flush=True)
+            try:
+                metrics.update(
+                    measure_bot(game_name, bot_type, args.positions, args.think_time)
+                )
+            except RuntimeError as e:  # e.g. weights that cannot be downloaded
+                print(f"  skipped: {e}")
+                skipped[f"bot.{game_name}.{bot_type}"] = str(e)
+
+    results = {
+        "meta": {
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "arguments": vars(args),
+        },
+        "metrics": metrics,
+        "skipped": skipped,
+    }
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+    print(f"{len(metrics)} metrics written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Compares the tic-tac-toe solver bot to the MCTS bot.
+
+The script measures the latency per move of both bots over all the positions
+of a few games, then plays a match between them, swapping seats at every game.
+The solver must never lose.
+
+Run with:
+    python benchmarks/tic_tac_toe_solver.py --games 20
+"""
+import argparse
+import statistics
+import time
+
+import pyspiel
+
+from pygame_spiel.arena import play_game
+from pygame_spiel.utils import init_bot
+
+from mcts_scaling import random_positions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--positions", type=int, default=50)
+    parser.add_argument("--games", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    game = pyspiel.load_game("tic_tac_toe")
+    positions = random_positions(game, args.positions, args.seed)
+
+    print(f"{'bot':>8} {'median (ms)':>12} {'max (ms)':>10}")
+    for bot_type in ["solver", "mcts"]:
+        bot = init_bot(bot_type, game, player_id=0, seed=args.seed)
+        latencies = []
+        for state in positions:
+            start = time.perf_counter()
+            bot.step(state)
+            latencies.append(time.perf_counter() - start)
+        print(
+            f"{bot_type:>8} {statistics.median(latencies) * 1000:>12.3f} "
+            f"{max(latencies) * 1000:>10.3f}"
+        )
+
+    score = {"solver": 0, "mcts": 0, "draws": 0}
+    for game_index in range(args.games):
+        labels = ["solver", "mcts"] if game_index % 2 == 0 else ["mcts", "solver"]
+        bots = [
+            init_bot(label, game, player_id, seed=args.seed + game_index)
+            for player_id, label in enumerate(labels)
+        ]
+        returns, _ = play_game(game.new_initial_state(), bots)
+        if returns[0] == returns[1]:
+            score["draws"] += 1
+        else:
+            score[labels[0] if returns[0] > returns[1] else labels[1]] += 1
+    print(
+        f"solver wins: {score['solver']}, mcts wins: {score['mcts']}, "
+        f"draws: {score['draws']}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+#!/usr/bin/env python
+"""Headless bot-vs-bot matches.
+
+The arena plays games between two bot types without opening a pygame window
+(SDL is never initialised), spreading the games over a pool of worker
+processes. Each finished game is appended to a JSON Lines file as soon as it
+completes, so long runs can be monitored and interrupted at any time.
+
+Example:
+    pygame_spiel_arena --game breakthrough --bot-a mcts --bot-b random \
+        --games 1000 --workers 16 --output results.jsonl
+"""
+import argparse
+import concurrent.futures
+import json
+import multiprocessing
+import os
+import time
+import typing as t
+
+import pyspiel
+
+from pygame_spiel.registry import GAMES, BOTS
+from pygame_spiel.utils import init_bot, get_breakpoint_dir
+
+# Bots living in each worker process, created on first use by _get_bot()
+_worker_state = {}
+
+
+def play_game(
+    state: pyspiel.State,
+    bots: t.List[pyspiel.Bot],
+    search_stats: t.Optional[t.List[t.Tuple[int, t.Dict[str, float]]]] = None,
+) -> t.Tuple[t.List[float], t.List[int]]:
+    """
+    Plays a game from the given state until it is over.
+
+    Parameters:
+        state (pyspiel.State): initial state (modified in place)
+        bots (list): one bot per player, indexed by player id
+        search_stats (list): if given, (player, bot.last_search_stats) is appended to it
+            after every move of a bot reporting search statistics (e.g. mcts)
+
+    Returns:
+        returns (list): final return of each player
+        actions (list): actions played, in order
+    """
+    for bot in bots:
+        bot.restart_at(state)
+    actions = []
+    while not state.is_terminal():
+        player = state.current_player()
+        action = bots[player].step(state)
+        if search_stats is not None and hasattr(bots[player], "last_search_stats"):
+            search_stats.append((player, bots[player].last_search_stats))
+        for other, bot in enumerate(bots):
+            if other != player:
+                bot.inform_action(state, player, action)
+        state.apply_action(action)
+        actions.append(int(action))
+    return state.returns(), actions
+
+
+def _init_worker(
+    game_name: str,
+    bot_types: t.Dict[str, str],
+    breakpoint_dirs: t.Dict[str, str],
+    seed: int,
+    think_time: t.Optional[float],
+    move_cache: bool,
+    counter: multiprocessing.Value,
+) -> None:
+    """Initialiser of the worker processes: loads the game and assigns a seed."""
+    with counter.get_lock():
+        worker_index = counter.value
+        counter.value += 1
+    _worker_state["game"] = pyspiel.load_game(game_name)
+    _worker_state["bot_types"] = bot_types
+    _worker_state["breakpoint_dirs"] = breakpoint_dirs
+    _worker_state["seed"] = seed + 1000 * worker_index
+    _worker_state["think_time"] = think_time
+    _worker_state["move_cache"] = move_cache
+    _worker_state["bots"] = {}
+
+
+def _get_bot(label: str, player_id: int) -> pyspiel.Bot:
+    """Returns the bot labelled label for player_id, creating it once per worker."""
+    bots = _worker_state["bots"]
+    if (label, player_id) not in bots:
+        bots[(label, player_id)] = init_bot(
+            _worker_state["bot_types"][label],
+            _worker_state["game"],
+            player_id=player_id,
+            breakpoint_dir=_worker_state["breakpoint_dirs"][label],
+            seed=_worker_state["seed"] + len(bots),
+            time_limit=_worker_state["think_time"],
+            move_cache=_worker_state["move_cache"],
+        )
+    return bots[(label, player_id)]
+
+
+def _play_match_game(game_index: int) -> t.Dict[str, t.Any]:
+    """
+    Plays one game in a worker process. Bots swap seats at every game, so bot A
+    is player 0 in even games and player 1 in odd games.
+    """
+    labels = ["A", "B"] if game_index % 2 == 0 else ["B", "A"]
+    bots = [_get_bot(label, player_id) for player_id, label in enumerate(labels)]
+    state = _worker_state["game"].new_initial_state()
+
+    search_stats = []
+    start = time.perf_counter()
+    returns, actions = play_game(state, bots, search_stats)
+    seconds = time.perf_counter() - start
+
+    # Mean search speed of each bot reporting search statistics
+    simulations_per_second = {}
+    for player, label in enumerate(labels):
+        speeds = [
+            stats["simulations_per_second"]
+            for stats_player, stats in search_stats
+            if stats_player == player and "simulations_per_second" in stats
+        ]
+        if speeds:
+            simulations_per_second[label] = sum(speeds) / len(speeds)
+
+    winner = None
+    if returns[0] != returns[1]:
+        winner = labels[0] if returns[0] > returns[1] else labels[1]
+    return {
+        "game_index": game_index,
+        "players": labels,
+        "returns": returns,
+        "winner": winner,
+        "num_moves": len(actions),
+        "seconds": seconds,
+        "simulations_per_second": simulations_per_second,
+        "actions": actions,
+    }
+
+
+def run_arena(
+    game_name: str,
+    bot_a: str,
+    bot_b: str,
+    num_games: int,
+    output: str,
+    num_workers: int = None,
+    seed: int = 0,
+    think_time: float = None,
+    move_cache: bool = False,
+) -> t.Dict[str, t.Any]:
+    """
+    Plays num_games games between bot_a and bot_b and streams the results to output.
+
+    Every line of the output file is a JSON object describing one game; games are
+    written in completion order.
+
+    Parameters:
+        game_name (str): name of the game (e.g. breakthrough)
+        bot_a (str): bot type of the first bot
+        bot_b (str): bot type of the second bot
+        num_games (int): number of games to play
+        output (str): path of the JSON Lines file receiving the results
+        num_workers (int): number of worker processes (default: number of CPUs)
+        seed (int): base seed of the bots' random number generators
+        think_time (float): maximum thinking time per move of both bots, in seconds
+        move_cache (bool): if True, the bots' moves go through the move cache, which
+            is shared by the workers (see pygame_spiel.bots.cached)
+
+    Returns:
+        summary (dict): wins of each bot, draws and throughput
+    """
+    if game_name not in GAMES:
+        raise ValueError(f"Invalid game: {game_name}. Available: {GAMES.names()}")
+    for bot_type in [bot_a, bot_b]:
+        if bot_type not in BOTS or bot_type == "human":
+            raise ValueError(f"Invalid bot type for the arena: {bot_type}")
+
+    bot_types = {"A": bot_a, "B": bot_b}
+    # Weights are downloaded once, here, rather than by every worker
+    breakpoint_dirs = {
+        label: get_breakpoint_dir(bot_type, game_name)
+        for label, bot_type in bot_types.items()
+    }
+    num_workers = num_workers or os.cpu_count()
+    counter = multiprocessing.Value("i", 0)
+
+    summary = {"A": 0, "B": 0, "draws": 0, "games": 0}
+    start = time.perf_counter()
+    with open(output, "a") as results_file, concurrent.futures.ProcessPoolExecutor(
+        max_workers=num_workers,
+        initializer=_init_worker,
+        initargs=(
+            game_name,
+            bot_types,
+            breakpoint_dirs,
+            seed,
+            think_time,
+            move_cache,
+            counter,
+        ),
+    ) as executor:
+        futures = [
+            executor.submit(_play_match_game, game_index)
+            for game_index in range(num_games)
+        ]
+        try:
+            for future in concurrent.futures.as_completed(futures):
+                result = future.result()
+                result["game"] = game_name
+                result["bots"] = bot_types
+                results_file.write(json.dumps(result) + "\n")
+                results_file.flush()
+
+                summary["games"] += 1
+                summary[result["winner"] or "draws"] += 1
+        except KeyboardInterrupt:
+            for future in futures:
+                future.cancel()
+            raise
+
+    seconds = time.perf_counter() - start
+    summary["seconds"] = seconds
+    summary["games_per_hour"] = summary["games"] / seconds * 3600
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Play headless bot-vs-bot matches on a process pool."
+    )
+    parser.add_argument("--game", default="breakthrough", choices=GAMES.names())
+    parser.add_argument("--bot-a", default="mcts", help="bot type of the first bot")
+    parser.add_argument("--bot-b", default="random", help="bot type of the second bot")
+    parser.add_argument("--games", type=int, default=100, help="number of games")
+    parser.add_argument(
+        "--workers", type=int, default=None, help="worker processes (default: CPUs)"
+    )
+    parser.add_argument(
+        "--output", default="arena_results.jsonl", help="JSON Lines results file"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="base random seed")
+    parser.add_argument(
+        "--think-time",
+        type=float,
+        default=None,
+        help="maximum thinking time per move in seconds (default: no limit)",
+    )
+    parser.add_argument(
+        "--move-cache",
+        action="store_true",
+        help="reuse the moves cached for positions seen before (on disk)",
+    )
+    args = parser.parse_args()
+
+    summary = run_arena(
+        args.game,
+        args.bot_a,
+        args.bot_b,
+        args.games,
+        args.output,
+        num_workers=args.workers,
+        seed=args.seed,
+        think_time=args.think_time,
+        move_cache=args.move_cache,
+    )
+    print(
+        f"{summary['games']} games in {summary['seconds']:.1f}s "
+        f"({summary['games_per_hour']:.0f} games/hour)"
+    )
+    print(f"  {args.bot_a} (A) wins: {summary['A']}")
+    print(f"  {args.bot_b} (B) wins: {summary['B']}")
+    print(f"  draws: {summary['draws']}")
+
+
+if __name__ == "__main__":
+    main()
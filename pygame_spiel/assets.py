@@ -0,0 +1,108 @@
+import hashlib
+import importlib.resources
+import io
+import os
+import pathlib
+import typing as t
+
+import pygame
+
+from pygame_spiel.utils import cache_dir
+
+# Set to 1 to keep decoded (and scaled) images on disk, under cache_dir()/assets
+DISK_CACHE_ENV = "PYGAME_SPIEL_ASSET_CACHE"
+
+# (path, size) -> surface, shared by all the games of the process
+_surfaces = {}
+
+
+def load_image(path: str, size: t.Optional[t.Tuple[int, int]] = None) -> pygame.Surface:
+    """
+    Returns an image of the package, converted for fast blitting and scaled to size.
+
+    Each (path, size) pair is loaded and scaled once per process: the same
+    surface is returned to every caller, which must not draw on it. The images
+    are read through importlib.resources, so they are found wherever (and
+    however) the package is installed. A display mode must be set, as required
+    by Surface.convert_alpha().
+
+    With the environment variable PYGAME_SPIEL_ASSET_CACHE=1, the decoded and
+    scaled pixels are also stored in the user cache folder, so that new
+    processes skip the PNG decoding and the scaling.
+
+    Parameters:
+        path (str): path of the image relative to pygame_spiel/images
+            (e.g. "breakthrough/pawn_white.png")
+        size (tuple): (width, height) of the returned surface. If None, the image
+            keeps its size.
+
+    Returns:
+        surface (pygame.Surface): the image
+    """
+    key = (path, None if size is None else tuple(size))
+    surface = _surfaces.get(key)
+    if surface is None:
+        surface = _load(path, key[1])
+        _surfaces[key] = surface
+    return surface
+
+
+def clear_cache() -> None:
+    """Forgets the surfaces loaded in this process (the disk cache is kept)."""
+    _surfaces.clear()
+
+
+def _load(path: str, size: t.Optional[t.Tuple[int, int]]) -> pygame.Surface:
+    data = (importlib.resources.files("pygame_spiel") / "images" / path).read_bytes()
+    disk_path = None
+    if os.environ.get(DISK_CACHE_ENV) == "1":
+        disk_path = _disk_cache_path(data, size)
+        surface = _read_disk_cache(disk_path)
+        if surface is not None:
+            return surface
+
+    surface = pygame.image.load(io.BytesIO(data), path).convert_alpha()
+    if size is not None and surface.get_size() != size:
+        surface = pygame.transform.scale(surface, size)
+
+    if disk_path is not None:
+        _write_disk_cache(disk_path, surface)
+    return surface
+
+
+def _disk_cache_path(
+    data: bytes, size: t.Optional[t.Tuple[int, int]]
+) -> pathlib.Path:
+    """Path of the cached pixels, named after the PNG's content and the size."""
+    digest = hashlib.sha256(data).hexdigest()[:32]
+    suffix = "native" if size is None else f"{size[0]}x{size[1]}"
+    return cache_dir() / "assets" / f"{digest}-{suffix}.rgba"
+
+
+def _read_disk_cache(disk_path: pathlib.Path) -> t.Optional[pygame.Surface]:
+    try:
+        raw = disk_path.read_bytes()
+    except FileNotFoundError:
+        return None
+    # Header: width and height on 4 bytes each
+    width = int.from_bytes(raw[:4], "little")
+    height = int.from_bytes(raw[4:8], "little")
+    if len(raw) != 8 + 4 * width * height:
+        return None  # Truncated by a crash: the image is loaded again
+    return pygame.image.frombuffer(raw[8:], (width, height), "RGBA").convert_alpha()
+
+
+def _write_disk_cache(disk_path: pathlib.Path, surface: pygame.Surface) -> None:
+    width, height = surface.get_size()
+    raw = (
+        width.to_bytes(4, "little")
+        + height.to_bytes(4, "little")
+        + pygame.image.tostring(surface, "RGBA")
+    )
+    try:
+        disk_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = disk_path.with_name(f"{disk_path.name}.{os.getpid()}.tmp")
+        tmp_path.write_bytes(raw)
+        os.replace(tmp_path, disk_path)
+    except OSError as e:  # The disk cache is optional: never fail because of it
+        print(f"Could not write the asset cache {disk_path}: {e}")
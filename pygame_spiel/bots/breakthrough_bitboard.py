@@ -0,0 +1,345 @@
+"""Bitboard Breakthrough engine, for fast batched random rollouts.
+
+open_spiel's RandomRolloutEvaluator plays every rollout move by move through
+pyspiel states, which dominates the time of an MCTS search in Breakthrough.
+Here a board is a pair of 64-bit integers (the pieces of each player, square
+(row, column) being bit row * 8 + column, in pyspiel's coordinates) and many
+games are played together with NumPy: the moves of every game are generated
+with a few shifts and masks of whole arrays of boards, and a uniformly random
+legal move is drawn in each of them with lookup tables (moves are counted and
+located byte by byte).
+
+Like pyspiel's breakthrough (8x8 only), black (player 0) starts on rows 0-1 and
+moves towards row 7, white (player 1) starts on rows 6-7 and moves towards row
+0. A piece moves one row forward, straight to an empty square or diagonally to
+a square without a piece of its player (capturing the opponent's piece there).
+A player wins by reaching the last row or by capturing all the opponent's
+pieces. Actions are numbered like pyspiel's:
+((row * 8 + column) * 6 + direction) * 2 + capture, with directions 0-2 for
+black and 3-5 for white (column offsets -1, 0 and +1).
+
+benchmarks/breakthrough_bitboard.py checks the engine move for move against
+pyspiel and measures its speed.
+"""
+import typing as t
+
+import numpy as np
+
+import pyspiel
+from open_spiel.python.algorithms import mcts as os_mcts
+from open_spiel.python.observation import make_observation
+
+from pygame_spiel.bots.mcts import MCTSBot, MAX_SIMULATIONS_WITH_TIME_LIMIT
+
+SIZE = 8
+NUM_DIRECTIONS = 6
+
+_ONE = np.uint64(1)
+_NOT_FILE_A = np.uint64(0xFEFEFEFEFEFEFEFE)
+_NOT_FILE_H = np.uint64(0x7F7F7F7F7F7F7F7F)
+_SHIFTS = [np.uint64(n) for n in range(10)]
+
+# Offset from the destination square to the source square of a move, for each
+# player and direction (0-2, i.e. column offset -1, 0, +1)
+_SOURCE_OFFSETS = np.array([[-7, -8, -9], [9, 8, 7]], np.int64)
+
+# Number of set bits of every byte, and position of the k-th set bit of every byte
+_POPCOUNT = np.array([bin(byte).count("1") for byte in range(256)], np.int64)
+_KTH_BIT = np.zeros((256, 8), np.int64)
+for _byte in range(256):
+    _bits = [bit for bit in range(8) if _byte >> bit & 1]
+    _KTH_BIT[_byte, : len(_bits)] = _bits
+
+
+def destinations(own: np.ndarray, opp: np.ndarray, player: np.ndarray) -> np.ndarray:
+    """
+    Returns the destination squares of the legal moves of the player to move.
+
+    Parameters:
+        own (np.ndarray): uint64 boards of the pieces of the player to move
+        opp (np.ndarray): uint64 boards of the pieces of the opponent
+        player (np.ndarray): player to move (0 or 1) in each game
+
+    Returns:
+        destinations (np.ndarray): uint64 array of shape [N, 3], the destinations
+            of the moves in each direction (column offset -1, 0, +1)
+    """
+    black = player == 0
+    west, east = own & _NOT_FILE_A, own & _NOT_FILE_H
+    s7, s8, s9 = _SHIFTS[7], _SHIFTS[8], _SHIFTS[9]
+    moves = np.empty((len(own), 3), np.uint64)
+    moves[:, 0] = np.where(black, west << s7, west >> s9) & ~own
+    moves[:, 1] = np.where(black, own << s8, own >> s8) & ~(own | opp)
+    moves[:, 2] = np.where(black, east << s9, east >> s7) & ~own
+    return moves
+
+
+def random_moves(
+    moves: np.ndarray, rng: np.random.RandomState
+) -> t.Tuple[np.ndarray, np.ndarray]:
+    """
+    Draws a legal move uniformly at random in each game.
+
+    Parameters:
+        moves (np.ndarray): destinations of the legal moves, see destinations()
+        rng (np.random.RandomState): random number generator
+
+    Returns:
+        moves (np.ndarray): index of the move drawn (direction * 64 + destination)
+            in each game, undefined for games without legal moves
+        counts (np.ndarray): number of legal moves of each game
+    """
+    num_games = len(moves)
+    # Byte i of a board holds squares 8i to 8i + 7 (little-endian)
+    moves_bytes = moves.view(np.uint8).reshape(num_games, 3 * 8)
+    byte_counts = _POPCOUNT[moves_bytes]
+    cumulated = byte_counts.cumsum(axis=1)
+    counts = cumulated[:, -1]
+    k = (rng.random_sample(num_games) * counts).astype(np.int64)
+    byte_index = np.minimum((cumulated <= k[:, None]).sum(axis=1), 3 * 8 - 1)
+    rows = np.arange(num_games)
+    k -= cumulated[rows, byte_index] - byte_counts[rows, byte_index]
+    bit = _KTH_BIT[moves_bytes[rows, byte_index], np.minimum(k, 7)]
+    return byte_index * 8 + bit, counts
+
+
+def apply_moves(
+    own: np.ndarray, opp: np.ndarray, player: np.ndarray, moves: np.ndarray
+) -> t.Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Plays a move in each game.
+
+    Parameters:
+        own (np.ndarray): uint64 boards of the pieces of the player to move
+        opp (np.ndarray): uint64 boards of the pieces of the opponent
+        player (np.ndarray): player to move (0 or 1) in each game
+        moves (np.ndarray): legal move (direction * 64 + destination) of each game
+
+    Returns:
+        own (np.ndarray): new boards of the player who moved
+        opp (np.ndarray): new boards of the opponent
+        won (np.ndarray): whether the move won the game
+    """
+    direction, destination = np.divmod(moves, 64)
+    source = destination + _SOURCE_OFFSETS[player, direction]
+    source_bit = _ONE << source.astype(np.uint64)
+    destination_bit = _ONE << destination.astype(np.uint64)
+    own = own ^ source_bit ^ destination_bit
+    opp = opp & ~destination_bit
+    last_row = np.where(player == 0, destination >= 56, destination < 8)
+    return own, opp, last_row | (opp == 0)
+
+
+def random_playouts(
+    black: np.ndarray,
+    white: np.ndarray,
+    player: np.ndarray,
+    rng: np.random.RandomState,
+) -> np.ndarray:
+    """
+    Plays uniformly random moves in every game until its end.
+
+    Parameters:
+        black (np.ndarray): uint64 boards of black's pieces
+        white (np.ndarray): uint64 boards of white's pieces
+        player (np.ndarray): player to move (0 or 1) in each game
+        rng (np.random.RandomState): random number generator
+
+    Returns:
+        returns (np.ndarray): final return of black (1, -1, or 0 if a player was
+            left without legal move) in each game
+    """
+    player = np.asarray(player, np.int64)
+    returns = np.zeros(len(black), np.float64)
+    games = np.arange(len(black))
+    own = np.where(player == 0, black, white)
+    opp = np.where(player == 0, white, black)
+    while len(games):
+        moves, counts = random_moves(destinations(own, opp, player), rng)
+        if not counts.all():
+            playable = counts > 0
+            games, own, opp, player, moves = (
+                a[playable] for a in (games, own, opp, player, moves)
+            )
+        own, opp, won = apply_moves(own, opp, player, moves)
+        returns[games[won]] = np.where(player[won] == 0, 1.0, -1.0)
+        going_on = ~won
+        # The opponent is now to move
+        games, own, opp, player = (
+            games[going_on],
+            opp[going_on],
+            own[going_on],
+            1 - player[going_on],
+        )
+    return returns
+
+
+def from_states(
+    states: t.Sequence[pyspiel.State], observation: t.Any = None
+) -> t.Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Returns the bitboards of pyspiel breakthrough states.
+
+    Parameters:
+        states (list): non-terminal states of an 8x8 breakthrough game
+        observation: open_spiel Observation object of the game (created if None)
+
+    Returns:
+        black (np.ndarray): uint64 boards of black's pieces
+        white (np.ndarray): uint64 boards of white's pieces
+        player (np.ndarray): player to move in each state
+    """
+    if observation is None:
+        observation = make_observation(states[0].get_game())
+    planes = np.empty((len(states), 2, SIZE * SIZE), bool)
+    player = np.empty(len(states), np.int64)
+    for i, state in enumerate(states):
+        # Both players observe the whole board: planes of black, white and empty
+        observation.set_from(state, 0)
+        planes[i] = observation.tensor.reshape(3, SIZE * SIZE)[:2]
+        player[i] = state.current_player()
+    boards = np.packbits(planes, axis=2, bitorder="little").view(np.uint64)
+    return boards[:, 0, 0], boards[:, 1, 0], player
+
+
+def legal_actions(black: int, white: int, player: int) -> t.List[int]:
+    """Returns the legal actions of a board, as pyspiel action ids, sorted."""
+    own, opp = (black, white) if player == 0 else (white, black)
+    own, opp = np.array([own], np.uint64), np.array([opp], np.uint64)
+    moves = destinations(own, opp, np.array([player]))[0]
+    actions = []
+    for direction in range(3):
+        board = int(moves[direction])
+        while board:
+            destination = (board & -board).bit_length() - 1
+            board &= board - 1
+            source = destination + _SOURCE_OFFSETS[player, direction]
+            capture = int(opp[0]) >> destination & 1
+            actions.append(
+                (int(source) * NUM_DIRECTIONS + 3 * player + direction) * 2 + capture
+            )
+    return sorted(actions)
+
+
+def apply_action(
+    black: int, white: int, player: int, action: int
+) -> t.Tuple[int, int, bool]:
+    """
+    Plays a legal pyspiel action on a board.
+
+    Returns:
+        black (int): new board of black's pieces
+        white (int): new board of white's pieces
+        won (bool): whether the action won the game
+    """
+    source, direction = divmod(action // 2, NUM_DIRECTIONS)
+    direction -= 3 * player
+    destination = source - _SOURCE_OFFSETS[player, direction]
+    own, opp = (black, white) if player == 0 else (white, black)
+    own, opp, won = apply_moves(
+        np.array([own], np.uint64),
+        np.array([opp], np.uint64),
+        np.array([player]),
+        np.array([direction * 64 + destination]),
+    )
+    own, opp = int(own[0]), int(opp[0])
+    black, white = (own, opp) if player == 0 else (opp, own)
+    return black, white, bool(won[0])
+
+
+class BitboardRolloutEvaluator(os_mcts.Evaluator):
+    """Random rollout evaluator for 8x8 breakthrough, running on bitboards.
+
+    It evaluates states like open_spiel's RandomRolloutEvaluator (average return
+    of n_rollouts uniformly random playouts, uniform priors), but plays all the
+    rollouts of a batch of leaves together (see evaluate_batch(), used by
+    bots/mcts.MCTSBot when its batch_size is above 1).
+    """
+
+    def __init__(self, n_rollouts: int = 1, random_state: np.random.RandomState = None):
+        """
+        Parameters:
+            n_rollouts (int): number of playouts averaged for each state
+            random_state (np.random.RandomState): random number generator
+        """
+        self.n_rollouts = n_rollouts
+        self._random_state = random_state or np.random.RandomState()
+        self._observation = None
+
+    def evaluate(self, state: pyspiel.State) -> np.ndarray:
+        return self.evaluate_batch([state])[0]
+
+    def prior(self, state: pyspiel.State) -> t.List[t.Tuple[int, float]]:
+        legal_actions = state.legal_actions(state.current_player())
+        return [(action, 1.0 / len(legal_actions)) for action in legal_actions]
+
+    def evaluate_batch(self, states: t.Sequence[pyspiel.State]) -> t.List[np.ndarray]:
+        """
+        Returns the values of a batch of non-terminal states.
+
+        Parameters:
+            states (list): states to evaluate
+
+        Returns:
+            returns (list): array of the values of every player, for each state
+        """
+        if self._observation is None:
+            self._observation = make_observation(states[0].get_game())
+        black, white, player = from_states(states, self._observation)
+        returns = random_playouts(
+            np.repeat(black, self.n_rollouts),
+            np.repeat(white, self.n_rollouts),
+            np.repeat(player, self.n_rollouts),
+            self._random_state,
+        )
+        values = returns.reshape(len(states), self.n_rollouts).mean(axis=1)
+        return [np.array([value, -value]) for value in values]
+
+
+def build_bot(
+    game: pyspiel.Game,
+    player_id: int,
+    checkpoint_dir: str = None,
+    seed: int = 42,
+    time_limit: float = None,
+    batch_size: int = 32,
+    n_rollouts: int = 8,
+) -> pyspiel.Bot:
+    """
+    Returns an MCTS bot (like the mcts bot) whose random rollouts run on bitboards.
+
+    The leaves are evaluated in batches, with several rollouts each: playing
+    batch_size * n_rollouts games together costs about as much as a single
+    pyspiel rollout per leaf, and gives better estimates of their values.
+
+    Parameters:
+        game (pyspiel.Game): open_spiel game, 8x8 breakthrough
+        player_id (int): id of the player that the bot will be driving
+        checkpoint_dir (str): not used
+        seed (int): seed of the bot's random number generator
+        time_limit (float): seconds per move. If None, each move uses 1000 simulations
+        batch_size (int): number of leaves whose rollouts are played together
+        n_rollouts (int): number of rollouts averaged for each leaf
+
+    Returns:
+        bot (pyspiel.Bot): MCTS bot
+    """
+    params = game.get_parameters()
+    if game.get_type().short_name != "breakthrough" or (
+        params.get("rows", SIZE),
+        params.get("columns", SIZE),
+    ) != (SIZE, SIZE):
+        raise ValueError(f"The bitboard engine only plays 8x8 breakthrough, not {game}")
+    rng = np.random.RandomState(seed)
+    uct_c = 2  # UCT's exploration constant
+    max_simulations = 1000 if time_limit is None else MAX_SIMULATIONS_WITH_TIME_LIMIT
+    return MCTSBot(
+        game,
+        uct_c,
+        max_simulations,
+        BitboardRolloutEvaluator(n_rollouts, rng),
+        time_limit=time_limit,
+        batch_size=batch_size,
+        random_state=rng,
+        solve=True,
+    )
@@ -0,0 +1,51 @@
+import numpy as np
+
+import pyspiel
+from open_spiel.python.bots import uniform_random, human
+
+
+def build_random(
+    game: pyspiel.Game,
+    player_id: int,
+    checkpoint_dir: str = None,
+    seed: int = 42,
+    time_limit: float = None,
+) -> pyspiel.Bot:
+    """
+    Returns a bot playing uniformly random legal actions.
+
+    Parameters:
+        game (pyspiel.Game): open_spiel game
+        player_id (int): id of the player that the bot will be driving
+        checkpoint_dir (str): not used
+        seed (int): seed of the bot's random number generator
+        time_limit (float): not used
+
+    Returns:
+        bot (pyspiel.Bot): random bot
+    """
+    rng = np.random.RandomState(seed)
+    return uniform_random.UniformRandomBot(player_id, rng)
+
+
+def build_human(
+    game: pyspiel.Game,
+    player_id: int,
+    checkpoint_dir: str = None,
+    seed: int = 42,
+    time_limit: float = None,
+) -> pyspiel.Bot:
+    """
+    Returns a placeholder bot for a human player (moves come from the pygame UI).
+
+    Parameters:
+        game (pyspiel.Game): open_spiel game
+        player_id (int): id of the player that the bot will be driving
+        checkpoint_dir (str): not used
+        seed (int): not used
+        time_limit (float): not used
+
+    Returns:
+        bot (pyspiel.Bot): human bot
+    """
+    return human.HumanBot()
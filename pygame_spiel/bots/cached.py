@@ -0,0 +1,259 @@
+"""Cache of the moves chosen by bots.
+
+A CachedBot sits in front of another bot and remembers the action it chose in
+every position, so that a position seen before (e.g. a popular opening) is
+answered without searching again. Entries are keyed by a hash of the game, the
+configuration of the bot (type, seed, time limit, weights), the player to move
+and the position itself (str(state)): positions reached through different move
+orders share their entry.
+
+Moves are kept in two layers:
+
+    memory  a size-bounded LRU, shared by all the cached bots of the process
+    disk    an SQLite database under utils.cache_dir(), shared by all the
+            processes of the user (the arena's workers, other games, ...)
+
+An entry found on disk is copied into memory. Both layers count their hits, see
+MoveCache.counters.
+"""
+import collections
+import hashlib
+import json
+import pathlib
+import sqlite3
+import threading
+import time
+import typing as t
+
+import pyspiel
+
+from pygame_spiel.utils import cache_dir
+
+# (action, search statistics of the move)
+Entry = t.Tuple[int, t.Dict[str, t.Any]]
+
+
+class MoveCache:
+    """Two-level (memory LRU, then SQLite) store of the moves of the bots."""
+
+    def __init__(self, path: t.Optional[pathlib.Path], capacity: int = 100000):
+        """
+        Parameters:
+            path (Path): SQLite database of the moves. If None, only the memory
+                layer is used.
+            capacity (int): maximum number of moves kept in memory
+        """
+        self.path = path
+        self.capacity = capacity
+        self._memory = collections.OrderedDict()
+        self._connection = None
+        # Moves are looked up from the bot worker thread and from the main thread
+        self._lock = threading.Lock()
+        self._counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+
+    @property
+    def counters(self) -> t.Dict[str, int]:
+        """Returns the number of memory hits, disk hits and misses so far."""
+        with self._lock:
+            return dict(self._counters)
+
+    def get(self, key: str) -> t.Optional[Entry]:
+        """
+        Returns the cached move of a key, or None.
+
+        Parameters:
+            key (str): key of the move, see state_key()
+
+        Returns:
+            entry (tuple): (action, search statistics), or None
+        """
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self._counters["memory_hits"] += 1
+                return entry
+
+            entry = self._read(key)
+            if entry is None:
+                self._counters["misses"] += 1
+                return None
+            self._counters["disk_hits"] += 1
+            self._remember(key, entry)
+            return entry
+
+    def put(self, key: str, action: int, stats: t.Dict[str, t.Any]) -> None:
+        """
+        Stores the move of a key in both layers.
+
+        Parameters:
+            key (str): key of the move, see state_key()
+            action (int): action chosen by the bot
+            stats (dict): search statistics of the move (may be empty)
+        """
+        entry = (int(action), dict(stats))
+        with self._lock:
+            self._remember(key, entry)
+            self._write(key, entry)
+
+    def close(self) -> None:
+        """Closes the database (it is opened again when needed)."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _remember(self, key: str, entry: Entry) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.capacity:
+            self._memory.popitem(last=False)
+
+    def _database(self) -> t.Optional[sqlite3.Connection]:
+        if self._connection is None and self.path is not None:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                connection = sqlite3.connect(
+                    self.path, timeout=30, check_same_thread=False
+                )
+                # Readers of other processes do not block the writer (and vice versa)
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS moves "
+                    "(key TEXT PRIMARY KEY, action INTEGER NOT NULL, stats TEXT)"
+                )
+                connection.commit()
+                self._connection = connection
+            except sqlite3.Error as e:  # The disk layer is optional
+                print(f"Could not open the move cache {self.path}: {e}")
+                self.path = None
+        return self._connection
+
+    def _read(self, key: str) -> t.Optional[Entry]:
+        connection = self._database()
+        if connection is None:
+            return None
+        try:
+            row = connection.execute(
+                "SELECT action, stats FROM moves WHERE key = ?", (key,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            print(f"Could not read the move cache {self.path}: {e}")
+            return None
+        if row is None:
+            return None
+        return row[0], json.loads(row[1] or "{}")
+
+    def _write(self, key: str, entry: Entry) -> None:
+        connection = self._database()
+        if connection is None:
+            return
+        action, stats = entry
+        try:
+            with connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO moves (key, action, stats) "
+                    "VALUES (?, ?, ?)",
+                    (key, action, json.dumps(stats)),
+                )
+        except sqlite3.Error as e:
+            print(f"Could not write the move cache {self.path}: {e}")
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def default_cache() -> MoveCache:
+    """Returns the move cache of the process, stored in cache_dir()/moves.sqlite."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = MoveCache(cache_dir() / "moves.sqlite")
+        return _default_cache
+
+
+def state_key(state: pyspiel.State, bot_config: str) -> str:
+    """
+    Returns the cache key of the move of a bot in a state.
+
+    Parameters:
+        state (pyspiel.State): state where the bot has to move
+        bot_config (str): description of the bot, see CachedBot
+
+    Returns:
+        key (str): hexadecimal SHA-256 digest
+    """
+    text = "\n".join(
+        [str(state.get_game()), bot_config, str(state.current_player()), str(state)]
+    )
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class CachedBot(pyspiel.Bot):
+    """Bot answering the positions it has seen before from a MoveCache.
+
+    On a miss the wrapped bot is stepped and its move is stored. On a hit the
+    wrapped bot is not stepped at all; last_search_stats then reports the
+    statistics of the original search under "search", with "cached": True.
+    """
+
+    def __init__(
+        self,
+        bot: pyspiel.Bot,
+        bot_config: str,
+        cache: t.Optional[MoveCache] = None,
+    ):
+        """
+        Parameters:
+            bot (pyspiel.Bot): bot whose moves are cached
+            bot_config (str): description of everything that changes the moves of the
+                bot (type, seed, time limit, weights, ...). Bots with different
+                configurations never share moves.
+            cache (MoveCache): where the moves are stored (default: default_cache())
+        """
+        pyspiel.Bot.__init__(self)
+        self.bot = bot
+        self.bot_config = bot_config
+        self.cache = cache if cache is not None else default_cache()
+        self.last_search_stats = {}
+
+    def restart_at(self, state: pyspiel.State) -> None:
+        self.bot.restart_at(state)
+
+    def inform_action(self, state: pyspiel.State, player_id: int, action: int) -> None:
+        self.bot.inform_action(state, player_id, action)
+
+    def step(self, state: pyspiel.State) -> int:
+        """Returns bot's action at given state."""
+        start = time.perf_counter()
+        key = state_key(state, self.bot_config)
+        entry = self.cache.get(key)
+        if entry is not None:
+            action, stats = entry
+            self.last_search_stats = {
+                "cached": True,
+                "seconds": time.perf_counter() - start,
+                "search": stats,
+            }
+            return action
+
+        action = self.bot.step(state)
+        stats = getattr(self.bot, "last_search_stats", {})
+        self.cache.put(key, action, stats)
+        self.last_search_stats = stats
+        return action
+
+    def start_pondering(self, state: pyspiel.State) -> None:
+        """Lets the wrapped bot ponder on state, if it can (see bots/mcts.py)."""
+        if hasattr(self.bot, "start_pondering"):
+            self.bot.start_pondering(state)
+
+    def stop_pondering(self) -> None:
+        if hasattr(self.bot, "stop_pondering"):
+            self.bot.stop_pondering()
+
+    def close(self) -> None:
+        """Closes the wrapped bot, if it owns resources."""
+        if hasattr(self.bot, "close"):
+            self.bot.close()
@@ -1,4 +1,5 @@
 import os
+import numpy as np
 import tensorflow.compat.v1 as tf
 
 from open_spiel.python import rl_environment
@@ -6,6 +7,8 @@ from open_spiel.python.algorithms.dqn import DQN
 
 import pyspiel
 
+from pygame_spiel.bots.observations import ObservationBatch
+
 
 class DQNBot(pyspiel.Bot):
     """Bot that uses DQN algorithm."""
@@ -34,6 +37,7 @@ class DQNBot(pyspiel.Bot):
         info_state_size = self._env.observation_spec()["info_state"][0]
         num_actions = self._env.action_spec()["num_actions"]
         self._time_step = self._env.reset()
+        self._observations = ObservationBatch(game)
 
         self._sess = tf.Session()
         hidden_layers_sizes = [int(l) for l in self._hidden_layer_sizes]
@@ -58,6 +62,20 @@ class DQNBot(pyspiel.Bot):
     def restart_at(self, state):
         pass
 
+    def q_values(self, info_states):
+        """Returns the Q-values of a batch of information states.
+
+        Args:
+          info_states: Array of shape [batch_size, info_state_size].
+
+        Returns:
+          Array of shape [batch_size, num_actions].
+        """
+        return self._sess.run(
+            self._agent.q_values,
+            feed_dict={self._agent.info_state_ph: np.asarray(info_states)},
+        )
+
     def step(self, state):
         """Returns bot's action at given state."""
 
@@ -90,3 +108,35 @@ class DQNBot(pyspiel.Bot):
             agent_output.action
         )  # TODO expand functionality to simultaneous games with apply_actions()
         return action
+
+    def step_batch(self, states):
+        """Returns bot's greedy actions in many states with a single forward pass.
+
+        Args:
+          states: Non-terminal states where the bot's player is to move.
+
+        Returns:
+          List with the action of the bot in each state.
+        """
+        info_states, legal_mask = self._observations.fill(states)
+        q_values = self.q_values(info_states)
+        return np.where(legal_mask, q_values, -np.inf).argmax(axis=1).tolist()
+
+
+def build_bot(game, player_id, checkpoint_dir=None, seed=None, time_limit=None):
+    """Returns a DQN bot for player_id, restored from checkpoint_dir.
+
+    Args:
+      game: A pyspiel.Game to play.
+      player_id: ID of the player that the bot will be driving.
+      checkpoint_dir: Path to the DQN weights.
+      seed: Not used, the greedy policy of the bot is deterministic.
+      time_limit: Not used, the bot evaluates a single forward pass.
+    """
+    # We need to load bots for both players, because the models have been trained
+    # using the script breakthrough_dqn.py, causing the issue reported in
+    # https://github.com/deepmind/open_spiel/issues/1104.
+    # Only the bot related to the specified player is returned.
+    bot0 = DQNBot(game, player_id=0, checkpoint_dir=checkpoint_dir)
+    bot1 = DQNBot(game, player_id=1, checkpoint_dir=checkpoint_dir)
+    return bot0 if player_id == 0 else bot1
@@ -0,0 +1,57 @@
+import argparse
+import os
+import typing as t
+
+import numpy as np
+
+from pygame_spiel.bots.dqn_inference import load_q_network
+from pygame_spiel.bots.dqn_numpy import npz_path
+
+
+def export_q_network(
+    checkpoint_dir: str, player_id: int, output_dir: t.Optional[str] = None
+) -> str:
+    """
+    Exports the Q-network of a player from a DQN checkpoint to a .npz file.
+
+    The file contains the arrays weights_0, bias_0, weights_1, bias_1, ... of the
+    layers from input to output, in float32. It is written through a temporary
+    file, so a concurrent reader never sees a partial file.
+
+    Parameters:
+        checkpoint_dir (str): folder of the DQN checkpoints
+        player_id (int): player whose network is exported
+        output_dir (str): folder of the .npz file (created if needed), by default
+            checkpoint_dir
+
+    Returns:
+        path (str): path of the .npz file
+    """
+    arrays = {}
+    for i, (weights, bias) in enumerate(load_q_network(checkpoint_dir, player_id)):
+        arrays[f"weights_{i}"] = weights.astype(np.float32)
+        arrays[f"bias_{i}"] = bias.astype(np.float32)
+
+    output_dir = checkpoint_dir if output_dir is None else output_dir
+    os.makedirs(output_dir, exist_ok=True)
+    path = npz_path(output_dir, player_id)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez(f, **arrays)
+    os.replace(tmp_path, path)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Export the Q-networks of a DQN checkpoint to .npz files"
+    )
+    parser.add_argument("checkpoint_dir", help="folder of the DQN checkpoints")
+    parser.add_argument("--players", type=int, nargs="+", default=[0, 1])
+    args = parser.parse_args()
+    for player_id in args.players:
+        print(export_q_network(args.checkpoint_dir, player_id))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+import os
+import re
+
+import numpy as np
+import tensorflow.compat.v1 as tf
+
+import pyspiel
+
+
+# Variables of open_spiel's simple_nets.MLP: "<scope>/weights", "<scope>/bias",
+# then "<scope>/weights_1", "<scope>/bias_1", ... for the following layers
+_LAYER_VARIABLE = re.compile(r"^.+/(weights|bias)(?:_(\d+))?$")
+
+
+def checkpoint_path(checkpoint_dir: str, player_id: int) -> str:
+    """Returns the path of a player's Q-network checkpoint, as saved by DQN.save()."""
+    return os.path.join(checkpoint_dir, f"q_network_pid{player_id}")
+
+
+def load_q_network(checkpoint_dir: str, player_id: int) -> list:
+    """
+    Reads the layers of a player's Q-network from a checkpoint of open_spiel's DQN.
+
+    Only the Q-network of the player is read: the target network, the other
+    player's networks and the optimizer state in the same folder are ignored.
+
+    Parameters:
+        checkpoint_dir (str): folder of the DQN checkpoints
+        player_id (int): player whose network is read
+
+    Returns:
+        layers (list): (weights, bias) arrays of every layer, from input to output
+    """
+    path = checkpoint_path(checkpoint_dir, player_id)
+    if not os.path.exists(path + ".index"):
+        raise FileNotFoundError(f"No Q-network checkpoint found at {path}")
+    reader = tf.train.load_checkpoint(path)
+
+    layers = {}  # index -> {"weights": name, "bias": name}
+    for name in reader.get_variable_to_shape_map():
+        match = _LAYER_VARIABLE.match(name)
+        if match is None:
+            continue
+        kind, index = match.group(1), int(match.group(2) or 0)
+        layers.setdefault(index, {})[kind] = name
+    if not layers or any(len(names) != 2 for names in layers.values()):
+        raise ValueError(f"Unexpected variables in the Q-network checkpoint {path}")
+
+    return [
+        (reader.get_tensor(names["weights"]), reader.get_tensor(names["bias"]))
+        for _, names in sorted(layers.items())
+    ]
+
+
+class DQNInferenceBot(pyspiel.Bot):
+    """Greedy bot using the Q-network of a trained DQN agent.
+
+    Unlike bots/dqn.DQNBot, which builds a full open_spiel DQN agent (replay
+    buffer, target network, optimizer), this bot only restores the Q-network of
+    its player into a small private graph. It plays like the DQN agent in
+    evaluation mode: the legal action with the largest Q-value.
+    """
+
+    def __init__(self, game: pyspiel.Game, player_id: int, checkpoint_dir: str):
+        """
+        Parameters:
+            game (pyspiel.Game): open_spiel game
+            player_id (int): id of the player whose network is restored
+            checkpoint_dir (str): folder of the DQN checkpoints
+        """
+        pyspiel.Bot.__init__(self)
+        self._player_id = player_id
+        layers = load_q_network(checkpoint_dir, player_id)
+
+        # The weights are constants of a graph owned by the bot, so bots can be
+        # created any number of times without clashing variable names
+        self._graph = tf.Graph()
+        with self._graph.as_default():
+            self._info_state_ph = tf.placeholder(
+                tf.float32, shape=[None, layers[0][0].shape[0]], name="info_state_ph"
+            )
+            x = self._info_state_ph
+            for i, (weights, bias) in enumerate(layers):
+                x = tf.matmul(x, tf.constant(weights)) + tf.constant(bias)
+                if i < len(layers) - 1:
+                    x = tf.nn.relu(x)
+            self._q_values = x
+        self._sess = tf.Session(graph=self._graph)
+
+    def restart_at(self, state: pyspiel.State) -> None:
+        pass
+
+    def q_values(self, info_states) -> np.ndarray:
+        """
+        Returns the Q-values of a batch of information states.
+
+        Parameters:
+            info_states (array): array of shape [batch_size, info_state_size]
+
+        Returns:
+            q_values (np.ndarray): array of shape [batch_size, num_actions]
+        """
+        return self._sess.run(
+            self._q_values, feed_dict={self._info_state_ph: np.asarray(info_states)}
+        )
+
+    def step(self, state: pyspiel.State) -> int:
+        """Returns bot's action at given state."""
+        player_id = state.current_player()
+        q_values = self.q_values([state.observation_tensor(player_id)])[0]
+        legal_actions = state.legal_actions(player_id)
+        return legal_actions[int(np.argmax(q_values[legal_actions]))]
+
+
+def build_bot(
+    game: pyspiel.Game,
+    player_id: int,
+    checkpoint_dir: str = None,
+    seed: int = 42,
+    time_limit: float = None,
+) -> pyspiel.Bot:
+    """
+    Returns a greedy bot restoring only the Q-network of player_id.
+
+    Parameters:
+        game (pyspiel.Game): open_spiel game
+        player_id (int): id of the player that the bot will be driving
+        checkpoint_dir (str): Path to the DQN weights
+        seed (int): not used, the greedy policy of the bot is deterministic
+        time_limit (float): not used, the bot evaluates a single forward pass
+
+    Returns:
+        bot (pyspiel.Bot): DQN bot
+    """
+    if checkpoint_dir is None:
+        raise ValueError("The dqn bot needs the folder of its weights")
+    return DQNInferenceBot(game, player_id, str(checkpoint_dir))
@@ -0,0 +1,171 @@
+import os
+import typing as t
+
+import numpy as np
+
+import pyspiel
+
+from pygame_spiel.bots.observations import ObservationBatch
+from pygame_spiel.weights import exports_dir
+
+
+def npz_path(checkpoint_dir: str, player_id: int) -> str:
+    """Returns the path of the Q-network of a player exported by bots/dqn_export.py."""
+    return os.path.join(checkpoint_dir, f"q_network_pid{player_id}.npz")
+
+
+def load_npz(path: str) -> t.List[t.Tuple[np.ndarray, np.ndarray]]:
+    """
+    Reads the layers of a Q-network exported by bots/dqn_export.py.
+
+    Parameters:
+        path (str): path of the .npz file
+
+    Returns:
+        layers (list): (weights, bias) arrays of every layer, from input to output
+    """
+    with np.load(path) as arrays:
+        num_layers = len(arrays.files) // 2
+        return [
+            (arrays[f"weights_{i}"], arrays[f"bias_{i}"]) for i in range(num_layers)
+        ]
+
+
+class NumpyDQNBot(pyspiel.Bot):
+    """Greedy DQN bot whose Q-network runs in NumPy.
+
+    The Q-network of open_spiel's DQN is a small MLP (ReLU hidden layers, linear
+    output), so its forward pass is a few matrix products. This bot loads the
+    weights exported to .npz by bots/dqn_export.py and needs neither TensorFlow
+    nor a session. It plays like the DQN agent in evaluation mode: the legal
+    action with the largest Q-value.
+    """
+
+    def __init__(
+        self,
+        game: pyspiel.Game,
+        player_id: int,
+        layers: t.List[t.Tuple[np.ndarray, np.ndarray]],
+    ):
+        """
+        Parameters:
+            game (pyspiel.Game): open_spiel game
+            player_id (int): id of the player that the bot will be driving
+            layers (list): (weights, bias) arrays of the layers of the Q-network
+        """
+        pyspiel.Bot.__init__(self)
+        self._player_id = player_id
+        self._layers = [
+            (weights.astype(np.float32), bias.astype(np.float32))
+            for weights, bias in layers
+        ]
+        self._observations = ObservationBatch(game)
+
+    def restart_at(self, state: pyspiel.State) -> None:
+        pass
+
+    def q_values(self, info_states) -> np.ndarray:
+        """
+        Returns the Q-values of a batch of information states.
+
+        Parameters:
+            info_states (array): array of shape [batch_size, info_state_size]
+
+        Returns:
+            q_values (np.ndarray): array of shape [batch_size, num_actions]
+        """
+        x = np.asarray(info_states, dtype=np.float32)
+        last = len(self._layers) - 1
+        for i, (weights, bias) in enumerate(self._layers):
+            x = x @ weights
+            x += bias
+            if i < last:
+                np.maximum(x, 0, out=x)
+        return x
+
+    def greedy_actions(
+        self, q_values: np.ndarray, legal_mask: np.ndarray
+    ) -> np.ndarray:
+        """
+        Returns the legal action with the largest Q-value of every row of a batch.
+
+        Parameters:
+            q_values (np.ndarray): array of shape [batch_size, num_actions]
+            legal_mask (np.ndarray): boolean array of the same shape, True for the
+                legal actions
+
+        Returns:
+            actions (np.ndarray): array of shape [batch_size]
+        """
+        return np.where(legal_mask, q_values, -np.inf).argmax(axis=1)
+
+    def step(self, state: pyspiel.State) -> int:
+        """Returns bot's action at given state."""
+        return self.step_batch([state])[0]
+
+    def step_batch(self, states: t.Sequence[pyspiel.State]) -> t.List[int]:
+        """
+        Returns the bot's actions in many states with a single forward pass.
+
+        Parameters:
+            states (list): non-terminal states where the bot's player is to move
+
+        Returns:
+            actions (list): action of the bot in each state
+        """
+        info_states, legal_mask = self._observations.fill(states)
+        return self.greedy_actions(self.q_values(info_states), legal_mask).tolist()
+
+
+def load_bot(game: pyspiel.Game, player_id: int, checkpoint_dir: str) -> NumpyDQNBot:
+    """
+    Returns the NumPy DQN bot of a player, exporting its weights first if needed.
+
+    The .npz file is read from checkpoint_dir if it is there (archives written by
+    pygame_spiel_train_dqn include it), else from weights.exports_dir(), where
+    it is exported the first time. The export (bots/dqn_export.py) is the only
+    step needing TensorFlow, and it runs once per archive. Nothing is written to
+    checkpoint_dir, which may be an installed (read-only) object of the cache.
+
+    Parameters:
+        game (pyspiel.Game): open_spiel game
+        player_id (int): id of the player that the bot will be driving
+        checkpoint_dir (str): folder of the DQN checkpoints
+
+    Returns:
+        bot (NumpyDQNBot): DQN bot
+    """
+    path = npz_path(checkpoint_dir, player_id)
+    if not os.path.exists(path):
+        path = npz_path(str(exports_dir(checkpoint_dir)), player_id)
+    if not os.path.exists(path):
+        from pygame_spiel.bots.dqn_export import export_q_network
+
+        print(f"Exporting the Q-network of player {player_id} to {path}")
+        path = export_q_network(checkpoint_dir, player_id, os.path.dirname(path))
+    return NumpyDQNBot(game, player_id, load_npz(path))
+
+
+def build_bot(
+    game: pyspiel.Game,
+    player_id: int,
+    checkpoint_dir: str = None,
+    seed: int = 42,
+    time_limit: float = None,
+) -> pyspiel.Bot:
+    """
+    Returns a greedy DQN bot running its Q-network in NumPy.
+
+    Parameters:
+        game (pyspiel.Game): open_spiel game
+        player_id (int): id of the player that the bot will be driving
+        checkpoint_dir (str): Path to the DQN weights
+        seed (int): not used, the greedy policy of the bot is deterministic
+        time_limit (float): not used, the bot evaluates a single forward pass
+
+    Returns:
+        bot (pyspiel.Bot): DQN bot
+    """
+    if checkpoint_dir is None:
+        raise ValueError("The dqn bot needs the folder of its weights")
+    return load_bot(game, player_id, str(checkpoint_dir))
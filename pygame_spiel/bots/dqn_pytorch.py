@@ -1,5 +1,4 @@
 import os
-import tensorflow.compat.v1 as tf
 
 from open_spiel.python import rl_environment
 from open_spiel.python.pytorch import dqn as dqn_pt
@@ -35,7 +34,6 @@ class DQNBot(pyspiel.Bot):
         num_actions = self._env.action_spec()["num_actions"]
         self._time_step = self._env.reset()
 
-        self._sess = tf.Session()
         hidden_layers_sizes = [int(l) for l in self._hidden_layer_sizes]
 
         self._agent = dqn_pt.DQN(
@@ -51,8 +49,6 @@ class DQNBot(pyspiel.Bot):
             if not os.path.exists(checkpoint_dir):
                 raise FileNotFoundError("No folder exists at the location specified")
             self._agent.restore(checkpoint_dir)
-        else:
-            self._sess.run(tf.global_variables_initializer())
 
     def restart_at(self, state):
         pass
@@ -0,0 +1,352 @@
+"""Training of the DQN bots with batched environments.
+
+N games are stepped together: at every step, the observations of all of them
+are gathered in one array and the actions of both players are selected with a
+single session.run() (one forward pass of each player's Q-network over the
+games where it is to move). Transitions are stored in the replay buffers of
+open_spiel's DQN agents, which learn from them as in open_spiel's
+breakthrough_dqn.py example. Training runs on CPU only.
+
+Checkpoints are written to <output>/weights_default, the layout restored by
+bots/dqn.py (and read by the inference and NumPy DQN bots, whose .npz exports
+are refreshed at every save). The folder is also zipped to
+<output>/dqn/<game>.zip, so <output> can be used as a weights mirror
+(PYGAME_SPIEL_WEIGHTS_MIRROR, see weights.py).
+
+Run with:
+    pygame_spiel_train_dqn --game breakthrough --num-envs 64 --steps 2000000 \
+        --output dqn_weights
+"""
+import argparse
+import os
+import pathlib
+import shutil
+import time
+import typing as t
+
+import numpy as np
+import tensorflow.compat.v1 as tf
+
+import pyspiel
+from open_spiel.python.algorithms import dqn
+from open_spiel.python.observation import make_observation
+
+from pygame_spiel.bots.dqn_export import export_q_network
+from pygame_spiel.bots.observations import ObservationBatch
+
+
+class BatchedDQNTrainer:
+    """Trains one open_spiel DQN agent per player on N games stepped together."""
+
+    def __init__(
+        self,
+        game: pyspiel.Game,
+        num_envs: int,
+        hidden_layers_sizes: t.Sequence[int] = (64, 64),
+        replay_buffer_capacity: int = int(1e5),
+        batch_size: int = 32,
+        learning_rate: float = 0.01,
+        learn_every: int = 10,
+        update_target_every: int = 1000,
+        min_buffer_size: int = 1000,
+        epsilon_start: float = 1.0,
+        epsilon_end: float = 0.1,
+        epsilon_decay_steps: int = int(1e6),
+        seed: int = 0,
+    ):
+        """
+        Parameters:
+            game (pyspiel.Game): two-player, turn-based open_spiel game
+            num_envs (int): number of games stepped together
+            hidden_layers_sizes (list): sizes of the hidden layers of the Q-networks
+                (the bots restore [64, 64])
+            replay_buffer_capacity (int): transitions kept per player
+            batch_size (int): transitions per learning step
+            learning_rate (float): learning rate of the SGD optimizer
+            learn_every (int): transitions of a player between its learning steps
+            update_target_every (int): transitions of a player between updates of
+                its target network
+            min_buffer_size (int): transitions needed before learning starts
+            epsilon_start (float): exploration rate at the start of the training
+            epsilon_end (float): exploration rate at the end of the decay
+            epsilon_decay_steps (int): environment steps of the linear decay
+            seed (int): seed of the exploration and of the weights initialization
+        """
+        self._game = game
+        self._num_envs = num_envs
+        self._num_actions = game.num_distinct_actions()
+        self._learn_every = learn_every
+        self._update_target_every = update_target_every
+        self._epsilon_start = epsilon_start
+        self._epsilon_end = epsilon_end
+        self._epsilon_decay_steps = epsilon_decay_steps
+        self._rng = np.random.RandomState(seed)
+
+        # A private graph, in which the agents are created in the same order as
+        # in bots/dqn.build_bot, so the variable names saved in the checkpoints
+        # are the ones it restores.
+        self._graph = tf.Graph()
+        with self._graph.as_default():
+            tf.set_random_seed(seed)
+            self._session = tf.Session(config=tf.ConfigProto(device_count={"GPU": 0}))
+            self._agents = [
+                dqn.DQN(
+                    session=self._session,
+                    player_id=player_id,
+                    state_representation_size=game.observation_tensor_size(),
+                    num_actions=self._num_actions,
+                    hidden_layers_sizes=[int(size) for size in hidden_layers_sizes],
+                    replay_buffer_capacity=replay_buffer_capacity,
+                    batch_size=batch_size,
+                    learning_rate=learning_rate,
+                    min_buffer_size_to_learn=min_buffer_size,
+                )
+                for player_id in range(game.num_players())
+            ]
+            self._session.run(tf.global_variables_initializer())
+
+        self._observations = ObservationBatch(game, num_envs)
+        self._final_observation = make_observation(game)
+        self._states = [game.new_initial_state() for _ in range(num_envs)]
+        # (info_state, action) of the last move of each player in each game,
+        # completed into a transition at the player's next turn
+        self._pending = [[None] * game.num_players() for _ in range(num_envs)]
+        self._transitions = [0] * game.num_players()
+        self._losses = [None] * game.num_players()
+        self.env_steps = 0
+        self.episodes = 0
+        self.learning_steps = 0
+
+    @property
+    def epsilon(self) -> float:
+        progress = min(1.0, self.env_steps / self._epsilon_decay_steps)
+        start, end = self._epsilon_start, self._epsilon_end
+        return start + progress * (end - start)
+
+    @property
+    def losses(self) -> t.List[t.Optional[float]]:
+        """Loss of the last learning step of each player (None before learning)."""
+        return list(self._losses)
+
+    def greedy_actions(
+        self, info_states: np.ndarray, legal_mask: np.ndarray, players: np.ndarray
+    ) -> np.ndarray:
+        """
+        Returns the greedy action in every state, with a single session.run().
+
+        Parameters:
+            info_states (np.ndarray): observations, of shape [N, size]
+            legal_mask (np.ndarray): legal actions, boolean array of shape
+                [N, num_actions]
+            players (np.ndarray): player to move in every state
+
+        Returns:
+            actions (np.ndarray): action of the player to move in every state
+        """
+        groups, feed_dict = [], {}
+        for player_id, agent in enumerate(self._agents):
+            rows = np.flatnonzero(players == player_id)
+            if len(rows):
+                groups.append((agent, rows))
+                feed_dict[agent.info_state_ph] = info_states[rows]
+        outputs = self._session.run(
+            [agent.q_values for agent, _ in groups], feed_dict=feed_dict
+        )
+        q_values = np.empty((len(info_states), self._num_actions), np.float32)
+        for (_, rows), output in zip(groups, outputs):
+            q_values[rows] = output
+        return np.where(legal_mask, q_values, -np.inf).argmax(axis=1)
+
+    def step(self) -> None:
+        """Plays one epsilon-greedy move in every game and learns from it."""
+        states = self._states
+        info_states, legal_mask = self._observations.fill(states)
+        players = np.array([state.current_player() for state in states])
+        actions = self.greedy_actions(info_states, legal_mask, players)
+        for i in np.flatnonzero(self._rng.random_sample(len(states)) < self.epsilon):
+            actions[i] = self._rng.choice(np.flatnonzero(legal_mask[i]))
+
+        for i, state in enumerate(states):
+            player, action = players[i], int(actions[i])
+            info_state = info_states[i].copy()
+            pending = self._pending[i]
+            if pending[player] is not None:
+                self._add_transition(
+                    player,
+                    pending[player],
+                    0.0,
+                    info_state,
+                    legal_mask[i].astype(np.float32),
+                    False,
+                )
+            pending[player] = (info_state, action)
+            state.apply_action(action)
+            if state.is_terminal():
+                self._finish_episode(i)
+        self.env_steps += len(states)
+
+    def run(self, num_env_steps: int) -> None:
+        """Steps the games until num_env_steps more moves have been played."""
+        target = self.env_steps + num_env_steps
+        while self.env_steps < target:
+            self.step()
+
+    def _finish_episode(self, i: int) -> None:
+        state = self._states[i]
+        returns = state.returns()
+        no_legal_action = np.zeros(self._num_actions, np.float32)
+        for player, pending in enumerate(self._pending[i]):
+            if pending is None:
+                continue
+            self._final_observation.set_from(state, player)
+            self._add_transition(
+                player,
+                pending,
+                returns[player],
+                self._final_observation.tensor.ravel().copy(),
+                no_legal_action,
+                True,
+            )
+        self._states[i] = self._game.new_initial_state()
+        self._pending[i] = [None] * len(self._pending[i])
+        self.episodes += 1
+
+    def _add_transition(
+        self,
+        player: int,
+        pending: t.Tuple[np.ndarray, int],
+        reward: float,
+        next_info_state: np.ndarray,
+        next_legal_mask: np.ndarray,
+        is_final_step: bool,
+    ) -> None:
+        agent = self._agents[player]
+        info_state, action = pending
+        agent.replay_buffer.add(
+            dqn.Transition(
+                info_state=info_state,
+                action=action,
+                reward=reward,
+                next_info_state=next_info_state,
+                is_final_step=float(is_final_step),
+                legal_actions_mask=next_legal_mask,
+            )
+        )
+        self._transitions[player] += 1
+        count = self._transitions[player]
+        if count % self._learn_every == 0:
+            loss = agent.learn()
+            if loss is not None:
+                self._losses[player] = float(loss)
+                self.learning_steps += 1
+        if count % self._update_target_every == 0:
+            # open_spiel's DQN only runs this op from its own step()
+            self._session.run(agent._update_target_network)
+
+    def evaluate(self, num_games: int) -> t.List[float]:
+        """
+        Plays the greedy agents against a uniform random opponent, num_games
+        games per seat, all games of a seat being stepped together.
+
+        Returns:
+            mean_returns (list): mean return of the agent of each player
+        """
+        mean_returns = []
+        observations = ObservationBatch(self._game, num_games)
+        for seat in range(len(self._agents)):
+            states = [self._game.new_initial_state() for _ in range(num_games)]
+            active = states
+            while active:
+                info_states, legal_mask = observations.fill(active)
+                players = np.array([state.current_player() for state in active])
+                actions = self.greedy_actions(info_states, legal_mask, players)
+                for i, state in enumerate(active):
+                    if players[i] != seat:
+                        actions[i] = self._rng.choice(np.flatnonzero(legal_mask[i]))
+                    state.apply_action(int(actions[i]))
+                active = [state for state in active if not state.is_terminal()]
+            mean_returns.append(float(np.mean([s.returns()[seat] for s in states])))
+        return mean_returns
+
+    def save(self, output: str) -> pathlib.Path:
+        """
+        Saves the Q-networks of the agents.
+
+        Parameters:
+            output (str): output folder
+
+        Returns:
+            checkpoint_dir (Path): <output>/weights_default, the folder to pass to
+                the bots as checkpoint_dir
+        """
+        checkpoint_dir = pathlib.Path(output, "weights_default")
+        checkpoint_dir.mkdir(parents=True, exist_ok=True)
+        for agent in self._agents:
+            agent.save(str(checkpoint_dir))
+            export_q_network(str(checkpoint_dir), agent.player_id)
+        archive = pathlib.Path(output, "dqn", self._game.get_type().short_name)
+        archive.parent.mkdir(exist_ok=True)
+        shutil.make_archive(str(archive), "zip", output, "weights_default")
+        return checkpoint_dir
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Train the DQN bots with batched environments (CPU only)"
+    )
+    parser.add_argument("--game", default="breakthrough")
+    parser.add_argument(
+        "--num-envs", type=int, default=64, help="games stepped together"
+    )
+    parser.add_argument(
+        "--steps", type=int, default=int(2e6), help="environment steps to play"
+    )
+    parser.add_argument("--output", default="dqn_weights", help="output folder")
+    parser.add_argument("--hidden-layers", type=int, nargs="+", default=[64, 64])
+    parser.add_argument("--replay-buffer-capacity", type=int, default=int(1e5))
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--learning-rate", type=float, default=0.01)
+    parser.add_argument("--epsilon-decay-steps", type=int, default=int(1e6))
+    parser.add_argument(
+        "--save-every", type=int, default=int(1e5), help="environment steps"
+    )
+    parser.add_argument(
+        "--eval-games",
+        type=int,
+        default=100,
+        help="games per seat against a random bot at every save",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    # Hide the GPUs from TensorFlow, in addition to the session's device count
+    os.environ["CUDA_VISIBLE_DEVICES"] = ""
+    trainer = BatchedDQNTrainer(
+        pyspiel.load_game(args.game),
+        args.num_envs,
+        hidden_layers_sizes=args.hidden_layers,
+        replay_buffer_capacity=args.replay_buffer_capacity,
+        batch_size=args.batch_size,
+        learning_rate=args.learning_rate,
+        epsilon_decay_steps=args.epsilon_decay_steps,
+        seed=args.seed,
+    )
+    start = time.perf_counter()
+    while trainer.env_steps < args.steps:
+        trainer.run(min(args.save_every, args.steps - trainer.env_steps))
+        checkpoint_dir = trainer.save(args.output)
+        seconds = time.perf_counter() - start
+        losses = ", ".join("-" if l is None else f"{l:.4f}" for l in trainer.losses)
+        print(
+            f"{trainer.env_steps} steps ({trainer.env_steps / seconds:.0f}/s), "
+            f"{trainer.episodes} episodes, epsilon {trainer.epsilon:.3f}, "
+            f"losses {losses}"
+        )
+        if args.eval_games:
+            returns = trainer.evaluate(args.eval_games)
+            print(f"  mean return against random: {returns}")
+        print(f"  saved to {checkpoint_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,532 @@
+import threading
+import time
+import typing as t
+
+import numpy as np
+
+import pyspiel
+from open_spiel.python.algorithms import mcts
+
+
+# Simulations run by a pondering bot between two pauses, and length of the pauses
+# (in seconds) during which the render loop can take the GIL
+PONDER_SLICE = 8
+PONDER_PAUSE = 0.002
+# Visits of the root spent ranking the opponent's replies before pondering on
+# the likeliest ones
+PONDER_RANKING_VISITS = 500
+
+
+class MCTSBot(mcts.MCTSBot):
+    """MCTS bot that keeps its search tree between moves.
+
+    open_spiel's MCTSBot builds a new tree at every step. In a game like
+    Breakthrough most of the previous search lies in the subtree that the game
+    actually follows, so this bot re-roots its tree on every move (its own, and
+    the opponent's ones received through inform_action) and keeps the visit
+    counts and values of the new root's subtree. A search then only runs the
+    simulations needed to bring the root to max_simulations visits.
+
+    With a time_limit, the search is anytime: simulations run until the per-move
+    deadline (or until the root reaches max_simulations visits, whichever comes
+    first), so the time spent on a move does not depend on the position or on the
+    host's speed.
+
+    Discarded branches are not freed all at once (which could stall the bot for
+    the time needed to deallocate a large tree): they are queued and released a
+    few nodes at a time during the following searches.
+
+    With batch_size > 1, each simulation step descends the tree batch_size times
+    before evaluating the leaves, so that an evaluator running a neural network
+    (see bots/mcts_dqn.py) does a single forward pass per batch. Paths that are
+    waiting for their evaluation carry a virtual loss, which steers the following
+    descents of the batch towards other leaves.
+
+    The bot can also ponder: start_pondering() keeps searching the current root
+    (the position where the opponent has to move) on a background thread, so the
+    likeliest replies get explored while the opponent thinks. When the reply
+    arrives (inform_action() or step()), pondering stops and the search resumes
+    from the reply's subtree with the visits gathered meanwhile. The background
+    search runs in slices of a few simulations separated by short pauses, which
+    hand the GIL back to the render loop.
+    """
+
+    def __init__(
+        self,
+        game: pyspiel.Game,
+        uct_c: float,
+        max_simulations: int,
+        evaluator: mcts.Evaluator,
+        time_limit: t.Optional[float] = None,
+        reuse_tree: bool = True,
+        release_per_simulation: int = 64,
+        batch_size: int = 1,
+        ponder_simulations: int = 20000,
+        **kwargs,
+    ):
+        """
+        Parameters:
+            game (pyspiel.Game): open_spiel game
+            uct_c (float): UCT's exploration constant
+            max_simulations (int): number of visits of the root required before moving.
+                Visits inherited from the previous search count towards this number.
+                With a time_limit, it caps the search.
+            evaluator (mcts.Evaluator): evaluator of the leaves (e.g. random rollouts)
+            time_limit (float): maximum time (in seconds) spent searching for a move.
+                If None, the search only stops at max_simulations.
+            reuse_tree (bool): if False, behave like open_spiel's MCTSBot
+            release_per_simulation (int): maximum number of discarded nodes released
+                after each simulation
+            batch_size (int): maximum number of leaves evaluated together. Leaves are
+                passed to evaluator.evaluate_batch() if the evaluator has it, else
+                to evaluator.evaluate() one by one.
+            ponder_simulations (int): maximum simulations run while pondering (bounds
+                the memory used by the tree while the opponent thinks)
+            kwargs: other arguments of open_spiel's MCTSBot (solve, random_state, ...)
+        """
+        super().__init__(game, uct_c, max_simulations, evaluator, **kwargs)
+        self.time_limit = time_limit
+        self._reuse_tree = reuse_tree
+        self._release_per_simulation = release_per_simulation
+        self._batch_size = batch_size
+        self._pending_leaves = set()  # ids of the leaves waiting for an evaluation
+        self._root = None
+        self._root_history = []  # Actions leading from the initial state to the root
+        self._discarded = []  # Detached subtrees waiting to be released
+        self.last_search_stats = {}
+
+        self.ponder_simulations = ponder_simulations
+        self._ponder_thread = None
+        self._ponder_stop = threading.Event()
+        # With a time_limit, a search following a ponder stops once the root has
+        # the visits of a full search (see _search_visits)
+        self._pondered = False
+        self._simulations_per_second = None
+        self.last_ponder_stats = {}
+
+    @property
+    def bot_config(self) -> str:
+        """Search parameters that change the moves of the bot (see utils.init_bot)."""
+        selection = getattr(self._child_selection_fn, "__name__", "custom")
+        return (
+            f"uct_c={self.uct_c} max_simulations={self.max_simulations} "
+            f"solve={self.solve} reuse_tree={self._reuse_tree} "
+            f"batch_size={self._batch_size} selection={selection} "
+            f"evaluator={type(self.evaluator).__name__} "
+            f"n_rollouts={getattr(self.evaluator, 'n_rollouts', None)}"
+        )
+
+    def restart_at(self, state: pyspiel.State) -> None:
+        self.stop_pondering()
+        self._discard_tree()
+
+    def inform_action(self, state: pyspiel.State, player_id: int, action: int) -> None:
+        """Moves the root of the tree to the child reached with the opponent's action."""
+        self.stop_pondering()
+        self._advance_root(action)
+
+    def step_with_policy(
+        self, state: pyspiel.State
+    ) -> t.Tuple[t.List[t.Tuple[int, float]], int]:
+        self.stop_pondering()
+        policy, action = super().step_with_policy(state)
+        self._advance_root(action)
+        return policy, action
+
+    def start_pondering(self, state: pyspiel.State) -> None:
+        """
+        Starts searching state in the background, until stop_pondering() is called
+        (implicitly by inform_action(), step() and restart_at()), or until
+        ponder_simulations simulations have run.
+
+        Parameters:
+            state (pyspiel.State): state where the opponent has to move. The caller
+                keeps ownership of it: the search works on a clone.
+        """
+        self.stop_pondering()
+        if state.is_terminal():
+            return
+        self._ponder_stop.clear()
+        self._ponder_thread = threading.Thread(
+            target=self._ponder, args=(state.clone(),), name="mcts-ponder", daemon=True
+        )
+        self._ponder_thread.start()
+
+    def stop_pondering(self) -> None:
+        """Stops the background search, if any, and waits for its current slice."""
+        if self._ponder_thread is not None:
+            self._ponder_stop.set()
+            self._ponder_thread.join()
+            self._ponder_thread = None
+
+    def close(self) -> None:
+        """Stops pondering."""
+        self.stop_pondering()
+
+    def _ponder(self, state: pyspiel.State) -> None:
+        """
+        Background search. The replies are first ranked by a short search of the
+        root, then the likeliest ones (most visited first) are searched one after
+        the other until their subtree has the visits of a full search, so that
+        expected replies are answered almost immediately.
+        """
+        start = time.perf_counter()
+        root = self._get_root(state)
+        reused_visits = root.explore_count
+        budget = self._search_visits()
+        simulations = 0
+
+        def search(node: mcts.SearchNode, node_state: pyspiel.State, visits: int):
+            nonlocal simulations
+            while (
+                not self._ponder_stop.is_set()
+                and node.outcome is None
+                and node.explore_count < visits
+                and simulations < self.ponder_simulations
+            ):
+                simulations += self._ponder_slice(node, node_state)
+
+        search(root, state, PONDER_RANKING_VISITS)
+        replies = sorted(root.children, key=lambda c: c.explore_count, reverse=True)
+        for child in replies:
+            child_state = state.child(child.action)
+            if not child_state.is_terminal():
+                search(child, child_state, budget)
+
+        self._pondered = True
+        self.last_ponder_stats = {
+            "simulations": simulations,
+            "reused_visits": reused_visits,
+            "seconds": time.perf_counter() - start,
+        }
+
+    def _ponder_slice(self, root: mcts.SearchNode, state: pyspiel.State) -> int:
+        """Runs a few simulations from root and pauses. Returns the simulations run."""
+        simulations = 0
+        while simulations < PONDER_SLICE and root.outcome is None:
+            if self._batch_size > 1 and root.children:
+                batch_simulations = self._simulate_batch(root, state)
+            else:
+                self._simulate(root, state)
+                batch_simulations = 1
+            simulations += batch_simulations
+            self._release_discarded(self._release_per_simulation * batch_simulations)
+        # Yield to the render loop (and to whoever wants to stop the search)
+        time.sleep(PONDER_PAUSE)
+        return simulations
+
+    def _search_visits(self) -> int:
+        """
+        Returns the visits of the root at which a search stops: max_simulations, or
+        with a time_limit, the simulations that the previous searches would have
+        run in that time.
+        """
+        if self.time_limit is None or not self._simulations_per_second:
+            return self.max_simulations
+        return min(
+            self.max_simulations, int(self._simulations_per_second * self.time_limit)
+        )
+
+    def mcts_search(self, state: pyspiel.State) -> mcts.SearchNode:
+        """
+        Runs the search from state, starting from the subtree of the previous search
+        when state is a descendant of the current root.
+
+        Parameters:
+            state (pyspiel.State): state to search from
+
+        Returns:
+            root (mcts.SearchNode): root of the search tree
+        """
+        start = time.perf_counter()
+        deadline = start + self.time_limit if self.time_limit is not None else None
+        root = self._get_root(state)
+        reused_visits = root.explore_count
+
+        # After pondering, the visits gathered in the background count towards
+        # the time budget, at the speed of the previous searches
+        max_visits = self._search_visits() if self._pondered else self.max_simulations
+        self._pondered = False
+
+        # The root always gets expanded, even past the deadline, to have a move
+        simulations = 0
+        while root.outcome is None and (
+            not root.children
+            or (
+                root.explore_count < max_visits
+                and (deadline is None or time.perf_counter() < deadline)
+            )
+        ):
+            if self._batch_size > 1 and root.children:
+                batch_simulations = self._simulate_batch(root, state)
+            else:
+                self._simulate(root, state)
+                batch_simulations = 1
+            simulations += batch_simulations
+            self._release_discarded(self._release_per_simulation * batch_simulations)
+
+        seconds = time.perf_counter() - start
+        self.last_search_stats = {
+            "simulations": simulations,
+            "reused_visits": reused_visits,
+            "seconds": seconds,
+            "simulations_per_second": simulations / seconds if seconds > 0 else 0.0,
+        }
+        if simulations >= PONDER_SLICE:
+            self._simulations_per_second = self.last_search_stats[
+                "simulations_per_second"
+            ]
+        return root
+
+    def _simulate(self, root: mcts.SearchNode, state: pyspiel.State) -> None:
+        """Runs one simulation: descends the tree, evaluates the leaf and backs up its value."""
+        visit_path, working_state = self._apply_tree_policy(root, state)
+        if working_state.is_terminal():
+            returns = working_state.returns()
+            visit_path[-1].outcome = returns
+            solved = self.solve
+        else:
+            returns = self.evaluator.evaluate(working_state)
+            solved = False
+        self._backpropagate(visit_path, returns, solved)
+
+    def _simulate_batch(self, root: mcts.SearchNode, state: pyspiel.State) -> int:
+        """
+        Runs up to batch_size simulations whose leaves are evaluated together.
+
+        The batch ends early when a descent reaches a leaf that is already waiting
+        for its evaluation, or when the root gets solved.
+
+        Returns:
+            simulations (int): number of simulations run
+        """
+        paths, leaf_states = [], []
+        simulations = 0
+        while simulations < self._batch_size and root.outcome is None:
+            visit_path, working_state = self._apply_tree_policy(root, state)
+            if id(visit_path[-1]) in self._pending_leaves:
+                break
+            simulations += 1
+            if working_state.is_terminal():
+                returns = working_state.returns()
+                visit_path[-1].outcome = returns
+                self._backpropagate(visit_path, returns, self.solve)
+            else:
+                self._add_virtual_loss(visit_path, 1)
+                self._pending_leaves.add(id(visit_path[-1]))
+                paths.append(visit_path)
+                leaf_states.append(working_state)
+
+        if leaf_states:
+            evaluate_batch = getattr(self.evaluator, "evaluate_batch", None)
+            if evaluate_batch is not None:
+                batch_returns = evaluate_batch(leaf_states)
+            else:
+                batch_returns = [self.evaluator.evaluate(s) for s in leaf_states]
+            for visit_path, returns in zip(paths, batch_returns):
+                self._add_virtual_loss(visit_path, -1)
+                self._backpropagate(visit_path, returns, False)
+            self._pending_leaves.clear()
+        return simulations
+
+    def _apply_tree_policy(
+        self, root: mcts.SearchNode, state: pyspiel.State
+    ) -> t.Tuple[t.List[mcts.SearchNode], pyspiel.State]:
+        """
+        Same descent as open_spiel's MCTSBot, except that it stops at leaves waiting
+        for their evaluation in a batch instead of expanding them (their visit count
+        includes the virtual loss).
+        """
+        visit_path = [root]
+        working_state = state.clone()
+        current_node = root
+        while (
+            not working_state.is_terminal()
+            and current_node.explore_count > 0
+            and id(current_node) not in self._pending_leaves
+        ) or (working_state.is_chance_node() and self.dont_return_chance_node):
+            if not current_node.children:
+                # For a new node, initialize its state, then choose a child as normal.
+                legal_actions = self.evaluator.prior(working_state)
+                if current_node is root and self._dirichlet_noise:
+                    epsilon, alpha = self._dirichlet_noise
+                    noise = self._random_state.dirichlet([alpha] * len(legal_actions))
+                    legal_actions = [
+                        (a, (1 - epsilon) * p + epsilon * n)
+                        for (a, p), n in zip(legal_actions, noise)
+                    ]
+                # Reduce bias from move generation order.
+                self._random_state.shuffle(legal_actions)
+                player = working_state.current_player()
+                current_node.children = [
+                    mcts.SearchNode(action, player, prior)
+                    for action, prior in legal_actions
+                ]
+
+            if working_state.is_chance_node():
+                outcomes = working_state.chance_outcomes()
+                action_list, prob_list = zip(*outcomes)
+                action = self._random_state.choice(action_list, p=prob_list)
+                chosen_child = next(
+                    c for c in current_node.children if c.action == action
+                )
+            else:
+                chosen_child = max(
+                    current_node.children,
+                    key=lambda c: self._child_selection_fn(
+                        c, current_node.explore_count, self.uct_c
+                    ),
+                )
+
+            working_state.apply_action(chosen_child.action)
+            current_node = chosen_child
+            visit_path.append(current_node)
+
+        return visit_path, working_state
+
+    @staticmethod
+    def _add_virtual_loss(visit_path: t.List[mcts.SearchNode], sign: int) -> None:
+        """Adds (sign=1) or removes (sign=-1) a lost visit to the nodes of a path."""
+        for node in visit_path:
+            node.explore_count += sign
+            node.total_reward -= sign
+
+    def _backpropagate(
+        self, visit_path: t.List[mcts.SearchNode], returns: t.List[float], solved: bool
+    ) -> None:
+        """
+        Adds the returns of a simulation to the nodes of its visit path and, with
+        MCTS-Solver, propagates proven outcomes. Same update as open_spiel's MCTSBot.
+        """
+        while visit_path:
+            # For chance nodes, walk up the tree to find the decision-maker.
+            decision_node_idx = -1
+            while visit_path[decision_node_idx].player == pyspiel.PlayerId.CHANCE:
+                decision_node_idx -= 1
+            # Chance node targets are for the respective decision-maker.
+            target_return = returns[visit_path[decision_node_idx].player]
+            node = visit_path.pop()
+            node.total_reward += target_return
+            node.explore_count += 1
+
+            if solved and node.children:
+                player = node.children[0].player
+                if player == pyspiel.PlayerId.CHANCE:
+                    # Only back up chance nodes if all have the same outcome.
+                    outcome = node.children[0].outcome
+                    if outcome is not None and all(
+                        np.array_equal(c.outcome, outcome) for c in node.children
+                    ):
+                        node.outcome = outcome
+                    else:
+                        solved = False
+                else:
+                    # If any have max utility (won?), or all children are solved,
+                    # choose the one best for the player choosing.
+                    best = None
+                    all_solved = True
+                    for child in node.children:
+                        if child.outcome is None:
+                            all_solved = False
+                        elif best is None or child.outcome[player] > best.outcome[player]:
+                            best = child
+                    if best is not None and (
+                        all_solved or best.outcome[player] == self.max_utility
+                    ):
+                        node.outcome = best.outcome
+                    else:
+                        solved = False
+
+    def _get_root(self, state: pyspiel.State) -> mcts.SearchNode:
+        """Returns the node of the current tree matching state, or a new root."""
+        history = state.history()
+        n_root_actions = len(self._root_history)
+        if (
+            self._root is not None
+            and history[:n_root_actions] == self._root_history
+        ):
+            for action in history[n_root_actions:]:
+                self._advance_root(action)
+        else:
+            self._discard_tree()
+
+        if self._root is None:
+            self._root = mcts.SearchNode(None, state.current_player(), 1)
+            self._root_history = history
+        return self._root
+
+    def _advance_root(self, action: int) -> None:
+        """Makes the child reached with action the new root, discarding its siblings."""
+        if not self._reuse_tree or self._root is None:
+            self._discard_tree()
+            return
+        old_root, self._root = self._root, None
+        for child in old_root.children:
+            if child.action == action:
+                self._root = child
+            else:
+                self._discarded.append(child)
+        old_root.children = []
+        if self._root is None:
+            # The action had never been explored: nothing to reuse
+            self._root_history = []
+        else:
+            self._root_history.append(action)
+
+    def _discard_tree(self) -> None:
+        """Drops the whole tree; its nodes are released by _release_discarded()."""
+        if self._root is not None:
+            self._discarded.append(self._root)
+        self._root = None
+        self._root_history = []
+
+    def _release_discarded(self, max_nodes: int) -> None:
+        """Frees at most max_nodes discarded nodes, detaching their children first."""
+        discarded = self._discarded
+        for _ in range(min(max_nodes, len(discarded))):
+            node = discarded.pop()
+            discarded.extend(node.children)
+            node.children = []
+
+
+# Simulation cap of time-budgeted searches
+MAX_SIMULATIONS_WITH_TIME_LIMIT = 1000000
+
+
+def build_bot(
+    game: pyspiel.Game,
+    player_id: int,
+    checkpoint_dir: str = None,
+    seed: int = 42,
+    time_limit: float = None,
+) -> pyspiel.Bot:
+    """
+    Returns an MCTS bot (with tree reuse) using random rollouts to evaluate the leaves.
+
+    Parameters:
+        game (pyspiel.Game): open_spiel game
+        player_id (int): id of the player that the bot will be driving
+        checkpoint_dir (str): not used
+        seed (int): seed of the bot's random number generator
+        time_limit (float): seconds per move. If None, each move uses 1000 simulations
+
+    Returns:
+        bot (pyspiel.Bot): MCTS bot
+    """
+    rng = np.random.RandomState(seed)
+    utc = 2  # UCT's exploration constant
+    max_simulations = 1000 if time_limit is None else MAX_SIMULATIONS_WITH_TIME_LIMIT
+    rollout_count = 1
+    evaluator = mcts.RandomRolloutEvaluator(rollout_count, rng)
+    solve = True  # Whether to use MCTS-Solver.
+    verbose = False
+    return MCTSBot(
+        game,
+        utc,
+        max_simulations,
+        evaluator,
+        time_limit=time_limit,
+        random_state=rng,
+        solve=solve,
+        verbose=verbose,
+    )
@@ -0,0 +1,154 @@
+import collections
+import typing as t
+
+import numpy as np
+
+import pyspiel
+from open_spiel.python.algorithms import mcts as os_mcts
+
+from pygame_spiel.bots import dqn_numpy
+from pygame_spiel.bots.mcts import MCTSBot, MAX_SIMULATIONS_WITH_TIME_LIMIT
+from pygame_spiel.bots.observations import ObservationBatch
+
+
+class DQNEvaluator(os_mcts.Evaluator):
+    """MCTS evaluator using the Q-networks of the DQN bots (see bots/dqn_numpy.py).
+
+    The value of a leaf is the largest Q-value among its legal actions (for the
+    player to move, clipped to [-1, 1] like the game's returns), and the priors of
+    its children are a softmax of those Q-values. Each player's states are
+    evaluated by the network trained for that player.
+
+    evaluate_batch() gathers the observations and legal actions of a whole batch
+    of leaves with an ObservationBatch and runs one forward pass per player.
+    Results are cached by history, so the prior() call made when a leaf
+    is later expanded does not run the network again.
+    """
+
+    def __init__(
+        self,
+        game: pyspiel.Game,
+        networks: t.Sequence[dqn_numpy.NumpyDQNBot],
+        prior_temperature: float = 0.1,
+        cache_size: int = 100000,
+    ):
+        """
+        Parameters:
+            game (pyspiel.Game): open_spiel game
+            networks (list): DQN bot of every player, indexed by player id
+            prior_temperature (float): temperature of the softmax giving the priors
+            cache_size (int): maximum number of cached evaluations
+        """
+        self._networks = networks
+        self._prior_temperature = prior_temperature
+        self._cache_size = cache_size
+        self._observations = ObservationBatch(game)
+        # history string -> (value for the player to move, [(action, prior)])
+        self._cache = collections.OrderedDict()
+
+    def evaluate(self, state: pyspiel.State) -> np.ndarray:
+        return self.evaluate_batch([state])[0]
+
+    def prior(self, state: pyspiel.State) -> t.List[t.Tuple[int, float]]:
+        if state.is_chance_node():
+            return state.chance_outcomes()
+        return self._lookup([state])[0][1]
+
+    def evaluate_batch(self, states: t.Sequence[pyspiel.State]) -> t.List[np.ndarray]:
+        """
+        Returns the values of a batch of non-terminal states.
+
+        Parameters:
+            states (list): states to evaluate
+
+        Returns:
+            returns (list): array of the values of every player, for each state
+        """
+        batch_returns = []
+        for state, (value, _) in zip(states, self._lookup(states)):
+            returns = np.full(state.num_players(), -value)
+            returns[state.current_player()] = value
+            batch_returns.append(returns)
+        return batch_returns
+
+    def _lookup(self, states: t.Sequence[pyspiel.State]) -> t.List[tuple]:
+        """Returns the cached evaluations of states, computing the missing ones."""
+        keys = [state.history_str() for state in states]
+        missing = collections.defaultdict(dict)  # player -> {key: state}
+        for key, state in zip(keys, states):
+            if key in self._cache:
+                self._cache.move_to_end(key)
+            else:
+                missing[state.current_player()][key] = state
+
+        for player, player_states in missing.items():
+            info_states, legal_mask = self._observations.fill(
+                list(player_states.values())
+            )
+            q_values = self._networks[player].q_values(info_states)
+            for key, q, mask in zip(player_states, q_values, legal_mask):
+                self._store(key, self._evaluation(q, mask))
+
+        return [self._cache[key] for key in keys]
+
+    def _evaluation(self, q_values: np.ndarray, legal_mask: np.ndarray) -> tuple:
+        legal_actions = np.flatnonzero(legal_mask)
+        legal_q = q_values[legal_actions]
+        value = float(np.clip(legal_q.max(), -1.0, 1.0))
+        logits = (legal_q - legal_q.max()) / self._prior_temperature
+        priors = np.exp(logits)
+        priors /= priors.sum()
+        return value, list(zip(legal_actions.tolist(), priors.tolist()))
+
+    def _store(self, key: str, evaluation: tuple) -> None:
+        self._cache[key] = evaluation
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+
+def build_bot(
+    game: pyspiel.Game,
+    player_id: int,
+    checkpoint_dir: str = None,
+    seed: int = 42,
+    time_limit: float = None,
+    batch_size: int = 16,
+) -> pyspiel.Bot:
+    """
+    Returns an MCTS bot evaluating its leaves with the networks of the DQN bots.
+
+    The search uses PUCT, with the priors given by the networks, and evaluates
+    the leaves in batches.
+
+    Parameters:
+        game (pyspiel.Game): open_spiel game
+        player_id (int): id of the player that the bot will be driving
+        checkpoint_dir (str): Path to the DQN weights
+        seed (int): seed of the bot's random number generator
+        time_limit (float): seconds per move. If None, each move uses 400 simulations
+        batch_size (int): number of leaves evaluated in a single forward pass
+
+    Returns:
+        bot (pyspiel.Bot): MCTS bot
+    """
+    # The networks of both players are needed: the leaves of the search are states
+    # where either player is to move
+    networks = [
+        dqn_numpy.load_bot(game, player, str(checkpoint_dir))
+        for player in range(game.num_players())
+    ]
+    evaluator = DQNEvaluator(game, networks)
+    rng = np.random.RandomState(seed)
+    uct_c = 2  # PUCT's exploration constant
+    max_simulations = 400 if time_limit is None else MAX_SIMULATIONS_WITH_TIME_LIMIT
+    return MCTSBot(
+        game,
+        uct_c,
+        max_simulations,
+        evaluator,
+        time_limit=time_limit,
+        batch_size=batch_size,
+        random_state=rng,
+        solve=True,
+        child_selection_fn=os_mcts.SearchNode.puct_value,
+    )
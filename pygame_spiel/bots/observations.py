@@ -0,0 +1,65 @@
+import typing as t
+
+import numpy as np
+
+import pyspiel
+from open_spiel.python.observation import make_observation
+
+
+class ObservationBatch:
+    """Gathers the observations of many states into preallocated arrays.
+
+    state.observation_tensor() returns a new Python list at every call, which
+    then has to be converted into an array. Instead, the tensor of each state is
+    written by pyspiel into the buffer of an Observation object and copied into
+    a row of an array allocated once, next to the mask of the legal actions of
+    the state. The arrays only grow when a larger batch is requested.
+
+    The returned arrays are views of the internal buffers: they are only valid
+    until the next call to fill().
+    """
+
+    def __init__(self, game: pyspiel.Game, capacity: int = 64):
+        """
+        Parameters:
+            game (pyspiel.Game): open_spiel game
+            capacity (int): initial number of rows of the arrays
+        """
+        self._observation = make_observation(game)
+        self._num_actions = game.num_distinct_actions()
+        self._info_states = np.zeros((0, self._observation.tensor.size), np.float32)
+        self._legal_mask = np.zeros((0, self._num_actions), bool)
+        self._reserve(capacity)
+
+    def fill(
+        self, states: t.Sequence[pyspiel.State]
+    ) -> t.Tuple[np.ndarray, np.ndarray]:
+        """
+        Writes the observations and legal actions of states, seen by the player to
+        move in each of them.
+
+        Parameters:
+            states (list): non-terminal states
+
+        Returns:
+            info_states (np.ndarray): float32 array of shape [len(states), size]
+            legal_mask (np.ndarray): boolean array of shape [len(states), num_actions]
+        """
+        num_states = len(states)
+        self._reserve(num_states)
+        info_states = self._info_states[:num_states]
+        legal_mask = self._legal_mask[:num_states]
+        legal_mask.fill(False)
+        for i, state in enumerate(states):
+            player = state.current_player()
+            self._observation.set_from(state, player)
+            info_states[i] = self._observation.tensor
+            legal_mask[i, state.legal_actions(player)] = True
+        return info_states, legal_mask
+
+    def _reserve(self, num_states: int) -> None:
+        if num_states <= len(self._info_states):
+            return
+        size = max(num_states, 2 * len(self._info_states))
+        self._info_states = np.zeros((size, self._info_states.shape[1]), np.float32)
+        self._legal_mask = np.zeros((size, self._num_actions), bool)
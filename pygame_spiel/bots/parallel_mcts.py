@@ -0,0 +1,209 @@
+import multiprocessing
+import os
+import time
+import typing as t
+
+import numpy as np
+
+import pyspiel
+from open_spiel.python.algorithms import mcts
+
+from pygame_spiel.bots.mcts import MCTSBot, MAX_SIMULATIONS_WITH_TIME_LIMIT
+
+
+def _worker_loop(connection, game_string, uct_c, max_simulations, time_limit):
+    """
+    Main function of a search process. It receives (history, seed) requests, searches
+    from the state reached with history and sends back the statistics of the root's
+    children. The loop stops when None is received.
+    """
+    game = pyspiel.load_game(game_string)
+    rng = np.random.RandomState()
+    bot = MCTSBot(
+        game,
+        uct_c,
+        max_simulations,
+        mcts.RandomRolloutEvaluator(1, rng),
+        time_limit=time_limit,
+        reuse_tree=False,
+        random_state=rng,
+        solve=True,
+    )
+    while True:
+        request = connection.recv()
+        if request is None:
+            break
+        history, seed = request
+        state = game.new_initial_state()
+        for action in history:
+            state.apply_action(action)
+        rng.seed(seed)
+        root = bot.mcts_search(state)
+        children = [
+            (c.action, c.explore_count, c.total_reward, c.outcome)
+            for c in root.children
+        ]
+        connection.send((children, bot.last_search_stats))
+        bot.restart_at(state)
+    connection.close()
+
+
+class ParallelMCTSBot(pyspiel.Bot):
+    """Root-parallel MCTS bot.
+
+    Each move is searched independently by several worker processes, all starting
+    from the current state with their own random seed. The visit counts and total
+    rewards of the root's children are then summed over the workers (a proven
+    outcome found by any worker is kept) and the move is chosen like in
+    open_spiel's MCTSBot: proven wins first, then the most visited action.
+
+    Each worker gets the full budget of the bot (time_limit or max_simulations),
+    so with N workers a move takes about as long as with one, with N times the
+    simulations.
+    """
+
+    def __init__(
+        self,
+        game: pyspiel.Game,
+        uct_c: float,
+        max_simulations: int,
+        num_workers: int,
+        time_limit: t.Optional[float] = None,
+        seed: int = 42,
+    ):
+        """
+        Parameters:
+            game (pyspiel.Game): open_spiel game
+            uct_c (float): UCT's exploration constant
+            max_simulations (int): simulations per move of every worker
+            num_workers (int): number of search processes
+            time_limit (float): maximum search time per move in seconds (optional)
+            seed (int): seed of the generator of the workers' seeds
+        """
+        pyspiel.Bot.__init__(self)
+        self._rng = np.random.RandomState(seed)
+        self._uct_c = uct_c
+        self._max_simulations = max_simulations
+        self.last_search_stats = {}
+
+        # Spawned (not forked) processes: the bot may be created while other threads
+        # (e.g. the pygame loop and the bot worker) are running
+        context = multiprocessing.get_context("spawn")
+        self._connections = []
+        self._processes = []
+        for _ in range(num_workers):
+            parent_connection, child_connection = context.Pipe()
+            process = context.Process(
+                target=_worker_loop,
+                args=(child_connection, str(game), uct_c, max_simulations, time_limit),
+                daemon=True,
+            )
+            process.start()
+            child_connection.close()
+            self._connections.append(parent_connection)
+            self._processes.append(process)
+
+    @property
+    def num_workers(self) -> int:
+        return len(self._processes)
+
+    @property
+    def bot_config(self) -> str:
+        """Search parameters that change the moves of the bot (see utils.init_bot)."""
+        return (
+            f"uct_c={self._uct_c} max_simulations={self._max_simulations} "
+            f"num_workers={self.num_workers}"
+        )
+
+    def restart_at(self, state: pyspiel.State) -> None:
+        pass
+
+    def step(self, state: pyspiel.State) -> int:
+        """Returns bot's action at given state."""
+        start = time.perf_counter()
+        history = state.history()
+        for connection in self._connections:
+            connection.send((history, int(self._rng.randint(2**31))))
+
+        # action -> [explore_count, total_reward, outcome]
+        merged = {}
+        simulations = 0
+        for connection in self._connections:
+            children, stats = connection.recv()
+            simulations += stats["simulations"]
+            for action, explore_count, total_reward, outcome in children:
+                child = merged.setdefault(action, [0, 0.0, None])
+                child[0] += explore_count
+                child[1] += total_reward
+                if outcome is not None:
+                    child[2] = outcome
+
+        player = state.current_player()
+
+        def sort_key(item):
+            # Same ordering as open_spiel's SearchNode.sort_key
+            explore_count, total_reward, outcome = item[1]
+            return (
+                0 if outcome is None else outcome[player],
+                explore_count,
+                total_reward,
+            )
+
+        action = max(merged.items(), key=sort_key)[0]
+
+        seconds = time.perf_counter() - start
+        self.last_search_stats = {
+            "simulations": simulations,
+            "seconds": seconds,
+            "simulations_per_second": simulations / seconds if seconds > 0 else 0.0,
+            "workers": self.num_workers,
+        }
+        return action
+
+    def close(self) -> None:
+        """Stops the search processes."""
+        for connection in self._connections:
+            try:
+                connection.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            connection.close()
+        for process in self._processes:
+            process.join(timeout=1)
+            if process.is_alive():
+                process.terminate()
+        self._connections, self._processes = [], []
+
+
+def build_bot(
+    game: pyspiel.Game,
+    player_id: int,
+    checkpoint_dir: str = None,
+    seed: int = 42,
+    time_limit: float = None,
+    num_workers: int = None,
+) -> pyspiel.Bot:
+    """
+    Returns a root-parallel MCTS bot using random rollouts to evaluate the leaves.
+
+    Parameters:
+        game (pyspiel.Game): open_spiel game
+        player_id (int): id of the player that the bot will be driving
+        checkpoint_dir (str): not used
+        seed (int): seed of the bot's random number generator
+        time_limit (float): seconds per move. If None, each worker runs 1000 simulations
+        num_workers (int): number of search processes (default: number of CPUs)
+
+    Returns:
+        bot (pyspiel.Bot): parallel MCTS bot
+    """
+    utc = 2  # UCT's exploration constant
+    max_simulations = 1000 if time_limit is None else MAX_SIMULATIONS_WITH_TIME_LIMIT
+    return ParallelMCTSBot(
+        game,
+        utc,
+        max_simulations,
+        num_workers=num_workers or os.cpu_count(),
+        time_limit=time_limit,
+        seed=seed,
+    )
@@ -0,0 +1,147 @@
+"""Perfect tic-tac-toe bot reading its moves from a precomputed table.
+
+Every reachable position is solved once by negamax and the best move of each
+one is stored in an int8 array indexed by the base-3 encoding of the board
+(cell i contributes 3**i times 0 if empty, 1 for x and 2 for o). The array,
+19683 bytes, is shipped in pygame_spiel/bots/tables and choosing a move is a
+single lookup. Regenerate it with:
+
+    python -m pygame_spiel.bots.tic_tac_toe_solver
+"""
+import functools
+import importlib.resources
+import io
+import pathlib
+import typing as t
+
+import numpy as np
+
+import pyspiel
+
+TABLE_PATH = "bots/tables/tic_tac_toe.npy"
+
+NUM_CELLS = 9
+POWERS = [3**cell for cell in range(NUM_CELLS)]
+
+# Entry of the positions that are terminal or not reachable
+NO_MOVE = -1
+
+
+def encode(history: t.Sequence[int]) -> int:
+    """
+    Returns the index of a position in the table.
+
+    Player 0 (x) plays the even moves of the history and player 1 (o) the odd
+    ones, and open_spiel's action of a move is the index of its cell.
+
+    Parameters:
+        history (list): actions played since the start of the game
+
+    Returns:
+        index (int): base-3 encoding of the board
+    """
+    return sum((1 + ply % 2) * POWERS[action] for ply, action in enumerate(history))
+
+
+def solve(game: pyspiel.Game) -> np.ndarray:
+    """
+    Computes the best move of every reachable position.
+
+    Among moves with the same outcome, the table prefers the fastest win and
+    the slowest loss.
+
+    Parameters:
+        game (pyspiel.Game): the tic_tac_toe game
+
+    Returns:
+        table (np.ndarray): int8 array of 3**9 moves, NO_MOVE for the positions
+            without one
+    """
+    table = np.full(3**NUM_CELLS, NO_MOVE, np.int8)
+    values = {}  # index -> value for the player to move
+
+    def negamax(state: pyspiel.State, index: int) -> int:
+        if index in values:
+            return values[index]
+        num_moves = len(state.history())
+        if state.is_terminal():
+            # Winning sooner is worth more: |value| = empty cells + 1
+            value = int(state.returns()[num_moves % 2]) * (NUM_CELLS + 1 - num_moves)
+        else:
+            value = None
+            weight = 1 + num_moves % 2
+            for action in state.legal_actions():
+                child_value = -negamax(
+                    state.child(action), index + weight * POWERS[action]
+                )
+                if value is None or child_value > value:
+                    value = child_value
+                    table[index] = action
+        values[index] = value
+        return value
+
+    negamax(game.new_initial_state(), 0)
+    return table
+
+
+@functools.lru_cache(maxsize=None)
+def load_table() -> np.ndarray:
+    """Returns the table shipped with the package (read once per process)."""
+    data = (importlib.resources.files("pygame_spiel") / TABLE_PATH).read_bytes()
+    return np.load(io.BytesIO(data))
+
+
+class TicTacToeSolverBot(pyspiel.Bot):
+    """Bot playing the precomputed perfect move of each position."""
+
+    def __init__(self, table: np.ndarray):
+        """
+        Parameters:
+            table (np.ndarray): best move of each position, see solve()
+        """
+        pyspiel.Bot.__init__(self)
+        self._table = table
+
+    def restart_at(self, state: pyspiel.State) -> None:
+        pass
+
+    def step(self, state: pyspiel.State) -> int:
+        """Returns bot's action at given state."""
+        return int(self._table[encode(state.history())])
+
+
+def build_bot(
+    game: pyspiel.Game,
+    player_id: int,
+    checkpoint_dir: str = None,
+    seed: int = 42,
+    time_limit: float = None,
+) -> pyspiel.Bot:
+    """
+    Returns the perfect tic-tac-toe bot.
+
+    Parameters:
+        game (pyspiel.Game): open_spiel game (must be tic_tac_toe)
+        player_id (int): id of the player that the bot will be driving
+        checkpoint_dir (str): not used
+        seed (int): not used, the bot is deterministic
+        time_limit (float): not used, every move is a table lookup
+
+    Returns:
+        bot (pyspiel.Bot): solver bot
+    """
+    if game.get_type().short_name != "tic_tac_toe":
+        raise ValueError(f"The solver bot only plays tic_tac_toe, not {game}")
+    return TicTacToeSolverBot(load_table())
+
+
+def main():
+    path = pathlib.Path(__file__).resolve().parents[1] / TABLE_PATH
+    table = solve(pyspiel.load_game("tic_tac_toe"))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    np.save(path, table)
+    print(f"{np.count_nonzero(table != NO_MOVE)} positions solved, written to {path}")
+
+
+if __name__ == "__main__":
+    main()
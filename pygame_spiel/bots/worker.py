@@ -0,0 +1,100 @@
+import threading
+import typing as t
+
+import pyspiel
+
+from pygame_spiel import instrumentation
+
+
+class _PendingMove:
+    """Result slot shared between BotWorker and one background search."""
+
+    __slots__ = ["done", "action", "error"]
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.action = None
+        self.error = None
+
+
+class BotWorker:
+    """Computes a bot's moves on a background thread.
+
+    The pygame loop must keep drawing frames and processing events while a bot
+    is searching for its move. BotWorker runs bot.step() on a daemon thread and
+    lets the caller poll for the resulting action, so the frame loop never blocks.
+    Only one move can be pending at any time.
+    """
+
+    def __init__(
+        self, bot: pyspiel.Bot, on_done: t.Optional[t.Callable[[], None]] = None
+    ):
+        """
+        Parameters:
+            bot (pyspiel.Bot): bot whose moves are computed in the background
+            on_done (callable): called from the worker thread when a move is ready,
+                e.g. to wake up an event loop blocked waiting for events
+        """
+        self._bot = bot
+        self._on_done = on_done
+        self._pending = None
+
+    @property
+    def busy(self) -> bool:
+        """True while a move is being computed."""
+        return self._pending is not None and not self._pending.done.is_set()
+
+    def submit(self, state: pyspiel.State) -> None:
+        """
+        Starts computing the bot's action for the given state.
+
+        The bot searches on a clone of the state, so the caller is free to keep
+        reading (but not modifying) its own copy in the meantime.
+
+        Parameters:
+            state (pyspiel.State): state in which the bot has to move
+        """
+        if self._pending is not None:
+            raise RuntimeError("A bot move is already pending")
+        self._pending = _PendingMove()
+        thread = threading.Thread(
+            target=self._run,
+            args=(self._pending, state.clone()),
+            name="bot-move",
+            daemon=True,
+        )
+        thread.start()
+
+    def poll(self) -> t.Optional[int]:
+        """
+        Returns the computed action if it is ready, None otherwise.
+
+        Exceptions raised by the bot are re-raised here, in the caller's thread.
+
+        Returns:
+            action (int): bot's action, or None if no result is available yet
+        """
+        if self._pending is None or not self._pending.done.is_set():
+            return None
+        pending, self._pending = self._pending, None
+        if pending.error is not None:
+            raise pending.error
+        return pending.action
+
+    def cancel(self) -> None:
+        """
+        Forgets the pending move, if any.
+
+        A search that is already running cannot be interrupted, but its thread is a
+        daemon and its result is discarded, so closing the window never waits for it.
+        """
+        self._pending = None
+
+    def _run(self, pending: _PendingMove, state: pyspiel.State) -> None:
+        try:
+            pending.action = instrumentation.bot_step(self._bot, state)
+        except Exception as e:
+            pending.error = e
+        pending.done.set()
+        if self._on_done is not None and pending is self._pending:
+            self._on_done()
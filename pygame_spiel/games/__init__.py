@@ -1,4 +0,0 @@
-import sys
-import importlib
-from pygame_spiel.games.tic_tac_toe import TicTacToe
-from pygame_spiel.games.breakthrough import Breakthrough
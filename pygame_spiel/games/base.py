@@ -2,45 +2,63 @@ import abc
 import pygame
 import pyspiel
 import typing as t
-import site
-from pathlib import Path
-import os
 
-from pygame_spiel.games.settings import SCREEN_SIZE, BREAKPOINTS_DRIVE_IDS
-from pygame_spiel.utils import init_bot, download_weights
+from pygame_spiel import instrumentation
+from pygame_spiel.games.settings import SCREEN_SIZE
+from pygame_spiel.records import GameRecorder
+from pygame_spiel.utils import init_bot, get_breakpoint_dir
+from pygame_spiel.bots.worker import BotWorker
+
+# Posted by the background worker when the opponent bot's move is ready
+BOT_MOVE_READY = pygame.event.custom_type()
 
 
 class Game(metaclass=abc.ABCMeta):
-    def __init__(self, name, current_player):
+    def __init__(self, name, current_player, async_bots=True):
         self._name = name
         self._current_player = current_player
 
+        # If True, the opponent bot computes its moves on a background thread
+        self._async_bots = async_bots
+        self._bot_worker = None
+        # If True, the opponent bot searches during the human's turn (see set_bots)
+        self._ponder = False
+        # Writes the moves to a record file (see start_recording)
+        self._recorder = None
+
         #  Initialise game
         self._game = pyspiel.load_game(name)
         self._state = self._game.new_initial_state()
-        self._state_string = self._state.to_string()
         pygame.init()
 
         self._screen = pygame.display.set_mode(SCREEN_SIZE[name])
         pygame.display.set_caption(name)
+        self._status_font = pygame.font.SysFont("Arial", 30)
 
-        self._package_path = site.getsitepackages()[0]
+        # Rendering layer: static background drawn once, cells redrawn only when
+        # their content changes (see _render)
+        self._background_surface = None
+        self._rendered_cells = {}
+        self._full_redraw = True
 
     @abc.abstractmethod
-    def play(
-        self, mouse_pos: t.Tuple[int, int], mouse_pressed: t.Tuple[bool, bool, bool]
-    ) -> None:
+    def play(self, events: t.List[pygame.event.Event]) -> None:
         """
-        Abstact interface of the function play(). At each iteration, it requires the mouse position
-        and state (which button was pressed, if any).
+        Abstact interface of the function play(). At each iteration, it receives the input
+        events collected since the previous call (e.g. pygame.MOUSEBUTTONDOWN), advances the
+        game accordingly (human and bot moves) and updates the display through _render().
 
         Parameters:
-            mouse_pos (tuple): Position of the mouse (X,Y coordinates)
-            mouse_pressed (tuple): 1 if the i-th button is pressed
+            events (list): pygame events received since the last call
         """
 
     def set_bots(
-        self, bot1_type: str, bot1_params: str, bot2_type: str, bot2_params: str
+        self,
+        bot1_type: str,
+        bot1_params: t.Optional[t.Dict[str, t.Any]],
+        bot2_type: str,
+        bot2_params: t.Optional[t.Dict[str, t.Any]],
+        ponder: bool = False,
     ) -> None:
         """
         Set a Bot for each player. Available bots are: random, human, mcts, dqn.
@@ -48,35 +66,242 @@ class Game(metaclass=abc.ABCMeta):
 
         Parameters:
             bot1_type (str): Bot type of player 0
-            bot1_params (str): Bot's parameters (e.g., neural network breakpoints)
+            bot1_params (dict): Bot's parameters, passed to init_bot (e.g. {"time_limit": 2.0})
             bot2_type (str): Bot type of player 1
-            bot2_params (str): Bot's parameters (e.g., neural network breakpoints)
+            bot2_params (dict): Bot's parameters, passed to init_bot (e.g. {"time_limit": 2.0})
+            ponder (bool): if True and the opponent bot can ponder (e.g. mcts), it keeps
+                searching in the background while the human thinks about their move
         """
-        # TODO self._bot_params is not used. Remove
-
-        self._bot_params = [bot1_params, bot2_params]
+        self._bot_types = [bot1_type, bot2_type]
+        self._bot_params = [bot1_params or {}, bot2_params or {}]
         self._bots = []
 
         for i, bot_type in enumerate([bot1_type, bot2_type]):
-            bot_breakpoint_dir = None
-            if bot_type in ["dqn"]:
-                breakpoint_dest_dir = Path(
-                    self._package_path,
-                    "pygame_spiel/data/breakpoints",
-                    bot_type,
-                    self._name,
-                )
-                file_id = BREAKPOINTS_DRIVE_IDS[self._name][bot_type]
-                print(breakpoint_dest_dir)
-                if not os.path.exists(breakpoint_dest_dir):
-                    print(
-                        f"Downloading breakpoints for bot {bot_type} and game {self._name}"
-                    )
-                    download_weights(
-                        file_id=file_id, dest_folder=str(breakpoint_dest_dir)
-                    )
-                bot_breakpoint_dir = Path(breakpoint_dest_dir, "weights_default")
+            bot_breakpoint_dir = get_breakpoint_dir(bot_type, self._name)
             bot = init_bot(
-                bot_type, self._game, player_id=i, breakpoint_dir=bot_breakpoint_dir
+                bot_type,
+                self._game,
+                player_id=i,
+                breakpoint_dir=bot_breakpoint_dir,
+                **self._bot_params[i],
             )
             self._bots.append(bot)
+        self._ponder = ponder and hasattr(self._bots[1], "start_pondering")
+
+        if self._async_bots:
+            self._bot_worker = BotWorker(
+                self._bots[1],
+                on_done=lambda: pygame.event.post(pygame.event.Event(BOT_MOVE_READY)),
+            )
+
+    def start_recording(self, path: str) -> None:
+        """
+        Appends the game to a record file (see pygame_spiel.records): the bots'
+        configurations now, then every move as soon as it is played. Must be called
+        after set_bots() and before the first move.
+
+        Parameters:
+            path (str): record file
+        """
+        bots = [
+            {"type": bot_type, "params": params}
+            for bot_type, params in zip(self._bot_types, self._bot_params)
+        ]
+        self._recorder = GameRecorder(path, self._name, bots)
+
+    def _get_bot_action(self) -> t.Optional[int]:
+        """
+        Returns the action chosen by the opponent bot (player 1).
+
+        In asynchronous mode the first call starts the search in the background and
+        returns None; subsequent calls return None until the search is over, and then
+        return the bot's action exactly once. In synchronous mode the bot is stepped
+        directly and the call blocks until the action is available.
+
+        Returns:
+            action (int): bot's action, or None if the bot is still thinking
+        """
+        if self._bot_worker is None:
+            # Show the position (e.g. the human's last move) before blocking
+            self._render()
+            return instrumentation.bot_step(self._bots[1], self._state)
+
+        action = self._bot_worker.poll()
+        if action is None and not self._bot_worker.busy:
+            self._bot_worker.submit(self._state)
+        return action
+
+    def _apply_action(self, action: int) -> None:
+        """
+        Applies an action (of the human or of the bot) to the game's state. Games
+        keeping a model of the state next to it (e.g. a board) update it here. The
+        move is also appended to the record file, if the game is recorded.
+
+        When pondering is enabled, the opponent bot starts searching as soon as it is
+        the human's turn. It stops when it is informed of the human's move.
+
+        Parameters:
+            action (int): action of the current player
+        """
+        if self._recorder is not None:
+            self._recorder.record_move(self._state.current_player(), action)
+        with instrumentation.span("apply_action"):
+            self._state.apply_action(action)
+        if self._recorder is not None and self._state.is_terminal():
+            self._recorder.finish(self._state.returns())
+        # The human is player 0 (games may update _current_player after this call)
+        if self._ponder and self._state.current_player() == 0:
+            self._bots[1].start_pondering(self._state)
+
+    def _is_bot_turn(self) -> bool:
+        """Returns True if the opponent bot (player 1) has to move."""
+        return self._state.current_player() == 1
+
+    def is_idle(self) -> bool:
+        """
+        Returns True if the game cannot change until a new event arrives: either a human
+        has to move, the game is over, or the bot is thinking in the background (in which
+        case a BOT_MOVE_READY event is posted as soon as its move is ready).
+        """
+        return not self._is_bot_turn() or self.is_bot_thinking()
+
+    def is_bot_thinking(self) -> bool:
+        """Returns True while the opponent bot is computing its move in the background."""
+        return self._bot_worker is not None and self._bot_worker.busy
+
+    @abc.abstractmethod
+    def _build_background(self) -> pygame.Surface:
+        """
+        Returns the static part of the board, as a surface of the size of the screen.
+        It is built once and used to erase cells before redrawing them.
+
+        Returns:
+            background (pygame.Surface): static background
+        """
+
+    @abc.abstractmethod
+    def _get_cells(self) -> t.List[t.Tuple[t.Hashable, pygame.Rect, t.Hashable]]:
+        """
+        Returns the dynamic elements of the board, in drawing order.
+
+        Each cell is a tuple (cell_id, rect, key): rect is the screen area covered by the
+        cell and key describes its content (e.g. the token and whether it is selected).
+        A cell is redrawn only when its key changes; cells whose key is None are empty.
+
+        Returns:
+            cells (list): list of (cell_id, rect, key) tuples
+        """
+
+    @abc.abstractmethod
+    def _draw_cell(self, cell_id: t.Hashable, rect: pygame.Rect, key: t.Hashable) -> None:
+        """
+        Draws the content of a non-empty cell on the screen.
+
+        Parameters:
+            cell_id (hashable): cell's id, as returned by _get_cells()
+            rect (pygame.Rect): screen area covered by the cell
+            key (hashable): cell's content, as returned by _get_cells()
+        """
+
+    def _get_overlays(self) -> t.Dict[str, t.Tuple[t.Tuple[int, int], t.Optional[str]]]:
+        """
+        Returns the text labels drawn over the board, as {name: ((x, y), text)}.
+        A label whose text is None is hidden. By default the labels are the
+        "Thinking..." indicator, shown in the bottom-left corner while the bot searches,
+        and the performance overlay (see instrumentation.overlay_text), in the
+        top-left corner.
+
+        Returns:
+            overlays (dict): position and text of each label
+        """
+        text = "Thinking..." if self.is_bot_thinking() else None
+        return {
+            "thinking": ((10, self._screen.get_height() - 45), text),
+            "performance": ((10, 10), instrumentation.overlay_text()),
+        }
+
+    def _draw_overlay(self, rect: pygame.Rect, text: str) -> None:
+        """Draws a text label (black on white) at the top-left corner of rect."""
+        img = self._status_font.render(text, True, (0, 0, 0), (255, 255, 255))
+        self._screen.blit(img, rect.topleft)
+
+    def invalidate(self) -> None:
+        """Forces the next frame to redraw the whole screen (e.g. after a window expose)."""
+        self._full_redraw = True
+
+    def _render(self) -> None:
+        """
+        Draws the board and pushes the changes to the display.
+
+        The first frame (or any frame after invalidate()) blits the cached background
+        and every cell, and flips the whole display. Afterwards only the cells whose key
+        changed are redrawn: their area is restored from the background, every cell
+        overlapping it is drawn again (clipped to the area) and only the dirty rectangles
+        are sent to pygame.display.update(). Frames in which nothing changed cost nothing.
+        """
+        with instrumentation.span("render"):
+            self._render_frame()
+
+    def _render_frame(self) -> None:
+        if self._background_surface is None:
+            self._background_surface = self._build_background()
+
+        cells = self._get_cells()
+        overlay_ids = set()
+        for name, (pos, text) in self._get_overlays().items():
+            cell_id = ("overlay", name)
+            size = self._status_font.size(text) if text is not None else (0, 0)
+            cells.append((cell_id, pygame.Rect(pos, size), text))
+            overlay_ids.add(cell_id)
+
+        def draw(cell_id, rect, key):
+            if key is None:
+                return
+            if cell_id in overlay_ids:
+                self._draw_overlay(rect, key)
+            else:
+                self._draw_cell(cell_id, rect, key)
+
+        rendered_cells = {cell_id: (rect, key) for cell_id, rect, key in cells}
+
+        if self._full_redraw:
+            self._screen.blit(self._background_surface, (0, 0))
+            for cell in cells:
+                draw(*cell)
+            with instrumentation.span("display.flip"):
+                pygame.display.flip()
+            self._rendered_cells = rendered_cells
+            self._full_redraw = False
+            return
+
+        dirty_rects = []
+        for cell_id, rect, key in cells:
+            previous_rect, previous_key = self._rendered_cells.get(cell_id, (rect, None))
+            if key != previous_key or rect != previous_rect:
+                dirty_rects.append(previous_rect.union(rect))
+        self._rendered_cells = rendered_cells
+        if not dirty_rects:
+            return
+
+        for area in dirty_rects:
+            self._screen.blit(self._background_surface, area, area)
+            self._screen.set_clip(area)
+            for cell_id, rect, key in cells:
+                if rect.colliderect(area):
+                    draw(cell_id, rect, key)
+            self._screen.set_clip(None)
+        with instrumentation.span("display.flip"):
+            pygame.display.update(dirty_rects)
+
+    def close(self) -> None:
+        """
+        Releases the game's resources. Pending bot moves are discarded and bots owning
+        resources (e.g. the processes of mcts_parallel) are closed.
+        """
+        if self._bot_worker is not None:
+            self._bot_worker.cancel()
+        for bot in getattr(self, "_bots", []):
+            if hasattr(bot, "close"):
+                bot.close()
+        if self._recorder is not None:
+            self._recorder.close()
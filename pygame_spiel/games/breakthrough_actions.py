@@ -0,0 +1,126 @@
+import typing as t
+
+import pyspiel
+
+# Directions of open_spiel's Breakthrough (lines 36-40 of):
+# https://github.com/google-deepmind/open_spiel/blob/efa004d8c5f5088224e49fdc198c5d74b6b600d0/open_spiel/games/breakthrough.cc#L36
+# Black pawns (player 0) move with directions 0-2, white pawns with 3-5.
+DIR_ROW_OFFSETS = [1, 1, 1, -1, -1, -1]
+DIR_COL_OFFSETS = [-1, 0, 1, -1, 0, 1]
+
+# (row, col, dest_row, dest_col, capture)
+Move = t.Tuple[int, int, int, int, bool]
+
+
+class ActionTable:
+    """Precomputed mapping between Breakthrough's action ids and moves.
+
+    open_spiel ranks an action as the mixed-base number
+    [row, col, direction, capture] with bases [rows, cols, 6, 2] (see
+    RankActionMixedBase in spiel_utils.cc). Every move, including the ones that
+    would leave the board, is enumerated once here, so encoding and decoding are
+    a dict and a list lookup instead of a mixed-base loop.
+    """
+
+    def __init__(self, n_rows: int = 8, n_cols: int = 8):
+        """
+        Parameters:
+            n_rows (int): rows of the board
+            n_cols (int): columns of the board
+        """
+        self.n_rows, self.n_cols = n_rows, n_cols
+        self._moves = []  # action -> Move
+        self._actions = {}  # Move -> action
+        for row in range(n_rows):
+            for col in range(n_cols):
+                for direction in range(len(DIR_ROW_OFFSETS)):
+                    for capture in (False, True):
+                        move = (
+                            row,
+                            col,
+                            row + DIR_ROW_OFFSETS[direction],
+                            col + DIR_COL_OFFSETS[direction],
+                            capture,
+                        )
+                        self._actions[move] = len(self._moves)
+                        self._moves.append(move)
+
+    @property
+    def num_actions(self) -> int:
+        return len(self._moves)
+
+    def encode(
+        self, row: int, col: int, dest_row: int, dest_col: int, capture: bool
+    ) -> t.Optional[int]:
+        """
+        Returns the action id of a move, or None if no direction leads from the
+        start cell to the destination cell.
+
+        Parameters:
+            row (int): row of the pawn
+            col (int): column of the pawn
+            dest_row (int): row of the destination cell
+            dest_col (int): column of the destination cell
+            capture (bool): whether the move captures an opponent's pawn
+
+        Returns:
+            action (int): open_spiel's action id
+        """
+        return self._actions.get((row, col, dest_row, dest_col, bool(capture)))
+
+    def decode(self, action: int) -> Move:
+        """
+        Returns the move of an action id.
+
+        Parameters:
+            action (int): open_spiel's action id
+
+        Returns:
+            move (tuple): (row, col, dest_row, dest_col, capture)
+        """
+        return self._moves[action]
+
+    def to_string(self, action: int) -> str:
+        """
+        Returns the action in open_spiel's notation (e.g. "a8a7", or "a7b6*" for a
+        capture), like BreakthroughState::ActionToString.
+        """
+        row, col, dest_row, dest_col, capture = self._moves[action]
+
+        def label(r: int, c: int) -> str:
+            return chr(ord("a") + c) + chr(ord("1") + self.n_rows - 1 - r)
+
+        return label(row, col) + label(dest_row, dest_col) + ("*" if capture else "")
+
+
+class LegalMoves:
+    """Legal moves of a state, indexed by the cell of the pawn.
+
+    It is computed once from state.legal_actions() and answers membership
+    queries and "where can this pawn go" queries with dict lookups.
+    """
+
+    def __init__(self, table: ActionTable, state: pyspiel.State):
+        """
+        Parameters:
+            table (ActionTable): action table of the game
+            state (pyspiel.State): state whose legal moves are indexed
+        """
+        self.actions = frozenset(state.legal_actions())
+        # (row, col) -> {(dest_row, dest_col): action}
+        self._destinations = {}
+        for action in self.actions:
+            row, col, dest_row, dest_col, _ = table.decode(action)
+            self._destinations.setdefault((row, col), {})[(dest_row, dest_col)] = action
+
+    def __contains__(self, action: int) -> bool:
+        return action in self.actions
+
+    def destinations(self, row: int, col: int) -> t.Dict[t.Tuple[int, int], int]:
+        """
+        Returns the legal destinations of the pawn on (row, col).
+
+        Returns:
+            destinations (dict): action id of each (dest_row, dest_col)
+        """
+        return self._destinations.get((row, col), {})
@@ -0,0 +1,70 @@
+import typing as t
+
+import numpy as np
+
+import pyspiel
+
+from pygame_spiel.games.breakthrough_actions import Move
+
+# Content of a cell. The values are the indices of the planes of open_spiel's
+# observation tensor, which has a plane per cell state (black, white, empty).
+BLACK, WHITE, EMPTY = 0, 1, 2
+
+# Tokens used by open_spiel's string representation of the board
+TOKENS = {BLACK: "b", WHITE: "w", EMPTY: "."}
+
+
+class BreakthroughBoard:
+    """Board of a Breakthrough game, stored as an int8 array of shape (rows, cols).
+
+    The board is read once from the observation tensor of the initial state, and
+    afterwards only updated when a move is applied: the moving pawn takes the
+    destination cell (capturing whatever was there) and its start cell becomes
+    empty. Reading a cell is an array lookup and never allocates.
+    """
+
+    def __init__(self, cells: np.ndarray):
+        """
+        Parameters:
+            cells (np.ndarray): int8 array of BLACK, WHITE and EMPTY values
+        """
+        self.cells = cells
+
+    @classmethod
+    def from_state(cls, state: pyspiel.State) -> "BreakthroughBoard":
+        """
+        Returns the board of a state.
+
+        Parameters:
+            state (pyspiel.State): Breakthrough state
+
+        Returns:
+            board (BreakthroughBoard): board of the state
+        """
+        shape = state.get_game().observation_tensor_shape()
+        planes = np.asarray(state.observation_tensor(0)).reshape(shape)
+        return cls(np.argmax(planes, axis=0).astype(np.int8))
+
+    @property
+    def shape(self) -> t.Tuple[int, int]:
+        return self.cells.shape
+
+    def __getitem__(self, position: t.Tuple[int, int]) -> int:
+        return self.cells[position]
+
+    def apply(self, move: Move) -> None:
+        """
+        Updates the board with a move.
+
+        Parameters:
+            move (tuple): (row, col, dest_row, dest_col, capture), see ActionTable
+        """
+        row, col, dest_row, dest_col, _ = move
+        self.cells[dest_row, dest_col] = self.cells[row, col]
+        self.cells[row, col] = EMPTY
+
+    def to_string(self) -> str:
+        """Returns the cells row by row, with open_spiel's tokens (for debugging)."""
+        return "\n".join(
+            "".join(TOKENS[cell] for cell in row) for row in self.cells.tolist()
+        )
@@ -1,14 +1,12 @@
-from pygame_spiel.games import *
-
-DICT_GAMES = {"tic_tac_toe": "TicTacToe", "breakthrough": "Breakthrough"}
+from pygame_spiel.registry import GAMES
 
 
 class GameFactory:
     @classmethod
-    def get_game(cls, name, current_player):
+    def get_game(cls, name, current_player, async_bots=True):
         assert (
-            name in DICT_GAMES.keys()
-        ), f"Game {name} not in list of available games: {DICT_GAMES.keys()}"
-        Game_product = globals()[DICT_GAMES[name]]
-        game = Game_product(name, current_player)
+            name in GAMES
+        ), f"Game {name} not in list of available games: {GAMES.names()}"
+        Game_product = GAMES.load(name)
+        game = Game_product(name, current_player, async_bots=async_bots)
         return game
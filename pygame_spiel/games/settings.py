@@ -1,8 +1,28 @@
 GAMES_BOTS = {
-    "tic_tac_toe": {"mcts": []},
-    "breakthrough": {"mcts": [], "dqn": ["breakthrough_weights"]},
+    "tic_tac_toe": {"mcts": [], "solver": []},
+    "breakthrough": {
+        "mcts": [],
+        "mcts_parallel": [],
+        "mcts_bitboard": [],
+        "dqn": ["breakthrough_weights"],
+        "mcts_dqn": ["breakthrough_weights"],
+    },
 }
 
 SCREEN_SIZE = {"tic_tac_toe": [600, 600], "breakthrough": [1200, 1200]}
 
 BREAKPOINTS_DRIVE_IDS = {"breakthrough": {"dqn": "1c7y-vFezKvNF6qT3kGgEodkv0z6kvwPZ"}}
+
+# Expected SHA-256 of the weight archives, e.g. {"breakthrough": {"dqn": "3f5a..."}}.
+# When a bot's weights are pinned here, archives with another hash are rejected
+# (see weights.py). Unpinned weights are trusted on first use: the SHA-256 of the
+# first archive downloaded is printed, and later downloads must match it.
+WEIGHTS_SHA256 = {}
+
+# Bots using the weights of another bot type (e.g. the MCTS bot evaluating its
+# leaves with the DQN networks)
+BOT_WEIGHTS = {"mcts_dqn": "dqn"}
+
+# Choices of maximum thinking time per bot move (seconds) offered in the menu.
+# None means no time limit: search bots use their default simulation budget.
+THINK_TIMES = [None, 0.5, 1.0, 2.0, 5.0, 10.0]
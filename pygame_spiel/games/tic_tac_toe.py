@@ -1,16 +1,13 @@
 import typing as t
 import pygame
-import site
-from pathlib import Path
 
+from pygame_spiel import assets, instrumentation
 from pygame_spiel.games import base
 
 
 class TicTacToe(base.Game):
-    def __init__(self, name, current_player):
-        super().__init__(name, current_player)
-
-        self._text_font = pygame.font.SysFont("Arial", 30)
+    def __init__(self, name, current_player, async_bots=True):
+        super().__init__(name, current_player, async_bots)
 
         # TicTacToe vertical/horizontal lines
         self._line_h1_x_start, self._line_h1_y_start = 0, 200
@@ -22,11 +19,7 @@ class TicTacToe(base.Game):
         self._line_v2_x_start, self._line_v2_y_start = 400, 0
         self._line_v2_x_end, self._line_v2_y_end = 400, 600
 
-        package_path = site.getsitepackages()[0]
-
-        self._x_image = pygame.image.load(
-            Path(package_path) / "pygame_spiel/images/tic_tac_toe/x_image.png"
-        ).convert_alpha()
+        self._x_image = assets.load_image("tic_tac_toe/x_image.png")
 
         self._quadrant_pos_map_x = [
             (20, 20),
@@ -95,79 +88,116 @@ class TicTacToe(base.Game):
             else:
                 return 8
 
-    def _draw_text(self, text: str, text_col: t.Tuple[int, int, int], x: int, y: int):
+    def _handle_click(self, mouse_pos: t.Tuple[int, int]) -> None:
         """
-        Draws a text on the board. Used to write whether the player has won or
-        lost the game
+        Places a cross in the quadrant that was clicked, if it is free.
 
         Parameters:
-            text (str): text to visualize
-            text_col (tuple): text's color in the format (red, blue, green)
-            x (int): x coordinate
-            y (int): y coordinate
+            mouse_pos (tuple): contains the x/y position of the click (0: X, 1: Y)
         """
-        img = self._text_font.render(text, True, text_col)
-        self._screen.blit(img, (x, y))
-
-    def play(self, mouse_pos, mouse_pressed):
-        if self._current_player == 0 and (mouse_pressed[0]):
-            action = self._get_quadrant(mouse_pos[0], mouse_pos[1])
+        action = self._get_quadrant(mouse_pos[0], mouse_pos[1])
+        if self._quadrant_pos_map_x[action] not in self._list_x_pos:
+            self._apply_action(action)
+            self._bots[1].inform_action(self._state, self._current_player, action)
             if self._quadrant_pos_map_x[action] not in self._list_x_pos:
-                self._state.apply_action(action)
-                self._bots[1].inform_action(self._state, self._current_player, action)
-                if self._quadrant_pos_map_x[action] not in self._list_x_pos:
-                    self._list_x_pos.append(self._quadrant_pos_map_x[action])
-        elif self._current_player == 1:
-            action = self._bots[1].step(self._state)
-            if self._quadrant_pos_map_circle[action] not in self._list_o_pos:
-                self._state.apply_action(action)
+                self._list_x_pos.append(self._quadrant_pos_map_x[action])
+
+    def play(self, events):
+        with instrumentation.span("input"):
+            for event in events:
+                if (
+                    event.type == pygame.MOUSEBUTTONDOWN
+                    and event.button == 1
+                    and self._current_player == 0
+                ):
+                    self._handle_click(event.pos)
+                    self._current_player = self._state.current_player()
+
+        if self._current_player == 1:
+            action = self._get_bot_action()
+            if (
+                action is not None
+                and self._quadrant_pos_map_circle[action] not in self._list_o_pos
+            ):
+                self._apply_action(action)
                 if self._quadrant_pos_map_circle[action] not in self._list_o_pos:
                     self._list_o_pos.append(self._quadrant_pos_map_circle[action])
 
         self._current_player = self._state.current_player()
 
-        # Visualization
-        self._screen.fill("white")
+        self._render()
+
+    def _build_background(self) -> pygame.Surface:
+        background = pygame.Surface(self._screen.get_size()).convert()
+        background.fill("white")
 
         pygame.draw.line(
-            self._screen,
+            background,
             "black",
             (self._line_h1_x_start, self._line_h1_y_start),
             (self._line_h1_x_end, self._line_h1_y_end),
             2,
         )
         pygame.draw.line(
-            self._screen,
+            background,
             "black",
             (self._line_h2_x_start, self._line_h2_y_start),
             (self._line_h2_x_end, self._line_h2_y_end),
             2,
         )
         pygame.draw.line(
-            self._screen,
+            background,
             "black",
             (self._line_v1_x_start, self._line_v1_y_start),
             (self._line_v1_x_end, self._line_v1_y_end),
             2,
         )
         pygame.draw.line(
-            self._screen,
+            background,
             "black",
             (self._line_v2_x_start, self._line_v2_y_start),
             (self._line_v2_x_end, self._line_v2_y_end),
             2,
         )
-
-        for x_pos in self._list_x_pos:
-            self._screen.blit(self._x_image, x_pos)
-        for o_pos in self._list_o_pos:
-            pygame.draw.circle(self._screen, "black", o_pos, 60, width=4)
-
+        return background
+
+    def _get_cells(self) -> t.List[t.Tuple[t.Hashable, pygame.Rect, t.Hashable]]:
+        cells = []
+        for quadrant in range(9):
+            if self._quadrant_pos_map_x[quadrant] in self._list_x_pos:
+                key = "x"
+            elif self._quadrant_pos_map_circle[quadrant] in self._list_o_pos:
+                key = "o"
+            else:
+                key = None
+            rect = pygame.Rect((quadrant % 3) * 200, (quadrant // 3) * 200, 200, 200)
+            cells.append((quadrant, rect, key))
+        return cells
+
+    def _draw_cell(self, cell_id: int, rect: pygame.Rect, key: str) -> None:
+        if key == "x":
+            self._screen.blit(self._x_image, self._quadrant_pos_map_x[cell_id])
+        else:
+            pygame.draw.circle(
+                self._screen,
+                "black",
+                self._quadrant_pos_map_circle[cell_id],
+                60,
+                width=4,
+            )
+
+    def _get_overlays(
+        self,
+    ) -> t.Dict[str, t.Tuple[t.Tuple[int, int], t.Optional[str]]]:
+        overlays = super()._get_overlays()
+        text = None
         if self._current_player == -4:
             rewards = self._state.rewards()
             if rewards[0] == 0 and rewards[1] == 0:
-                self._draw_text(f"DRAW", (0, 0, 0), 220, 300)
+                text = "DRAW"
             elif rewards[0] == 1:
-                self._draw_text(f"Winner: player 0", (0, 0, 0), 220, 300)
+                text = "Winner: player 0"
             else:
-                self._draw_text(f"Winner: player 1", (0, 0, 0), 220, 300)
+                text = "Winner: player 1"
+        overlays["result"] = ((220, 300), text)
+        return overlays
@@ -0,0 +1,287 @@
+"""Performance instrumentation of the frame loop and of the bots.
+
+The code of the games and of the main loop is annotated with spans:
+
+    with instrumentation.span("render"):
+        ...
+
+Instrumentation is disabled by default, and span() then returns a shared
+object whose __enter__ and __exit__ do nothing, so an annotated block only
+pays for one function call. Once enabled with configure(), every span updates
+the counters of its name (count, total and maximum duration), and with
+trace=True it is also recorded as a Chrome trace event (open the file written by
+export_trace() in chrome://tracing or https://ui.perfetto.dev).
+
+Besides spans, the module keeps gauges (last value of a quantity, e.g. the
+think time of the last bot move) shown by the optional on-screen overlay, and
+can profile a single bot move with cProfile or tracemalloc (see
+profile_next_bot_move()).
+"""
+import json
+import os
+import pathlib
+import threading
+import time
+import typing as t
+
+import pyspiel
+
+# Maximum number of trace events kept in memory (later events are dropped)
+MAX_TRACE_EVENTS = 1000000
+
+_enabled = False
+_overlay = False
+_trace = False
+
+_lock = threading.Lock()
+# span name -> [count, total seconds, max seconds]
+_counters = {}
+# name -> last value
+_gauges = {}
+_trace_events = []
+_start_ns = time.perf_counter_ns()
+# Timestamps of the last frames, for the FPS of the overlay
+_frame_times = []
+# (mode, output path) of the next bot move to profile
+_profile_request = None
+
+
+class _NullSpan:
+    __slots__ = []
+
+    def __enter__(self) -> None:
+        pass
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ["name", "start"]
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter_ns()
+
+    def __exit__(self, *exc_info) -> None:
+        end = time.perf_counter_ns()
+        seconds = (end - self.start) / 1e9
+        with _lock:
+            counter = _counters.get(self.name)
+            if counter is None:
+                _counters[self.name] = [1, seconds, seconds]
+            else:
+                counter[0] += 1
+                counter[1] += seconds
+                counter[2] = max(counter[2], seconds)
+            if _trace and len(_trace_events) < MAX_TRACE_EVENTS:
+                _trace_events.append(
+                    {
+                        "name": self.name,
+                        "ph": "X",
+                        "ts": (self.start - _start_ns) / 1000,
+                        "dur": (end - self.start) / 1000,
+                        "pid": os.getpid(),
+                        "tid": threading.get_ident(),
+                    }
+                )
+
+
+def configure(enabled: bool = True, overlay: bool = False, trace: bool = False) -> None:
+    """
+    Turns instrumentation on or off. Counters and trace events are kept.
+
+    Parameters:
+        enabled (bool): whether spans are measured
+        overlay (bool): whether the games draw the performance overlay
+        trace (bool): whether spans are also recorded as trace events
+    """
+    global _enabled, _overlay, _trace
+    _enabled = enabled
+    _overlay = enabled and overlay
+    _trace = enabled and trace
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def overlay_enabled() -> bool:
+    return _overlay
+
+
+def span(name: str) -> t.ContextManager[None]:
+    """
+    Returns a context manager measuring the duration of its block.
+
+    Parameters:
+        name (str): name of the span (e.g. "render"); spans with the same name
+            share their counters
+    """
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span(name)
+
+
+def set_gauge(name: str, value: float) -> None:
+    """Records the last value of a quantity (ignored when disabled)."""
+    if _enabled:
+        _gauges[name] = value
+
+
+def frame() -> None:
+    """Marks the end of a frame of the main loop, for the FPS of the overlay."""
+    if not _enabled:
+        return
+    now = time.perf_counter()
+    _frame_times.append(now)
+    while _frame_times and _frame_times[0] < now - 1.0:
+        _frame_times.pop(0)
+    _gauges["fps"] = len(_frame_times)
+
+
+def overlay_text() -> t.Optional[str]:
+    """Returns the text of the performance overlay, or None if it is disabled."""
+    if not _overlay:
+        return None
+    text = f"{_gauges.get('fps', 0):.0f} FPS"
+    if "bot.think_s" in _gauges:
+        text += f" | bot {_gauges['bot.think_s']:.2f}s"
+    if "bot.simulations_per_second" in _gauges:
+        text += f" | {_gauges['bot.simulations_per_second']:.0f} sims/s"
+    return text
+
+
+def bot_step(bot: pyspiel.Bot, state: pyspiel.State) -> int:
+    """
+    Returns bot.step(state), measured by the "bot.step" span. The think time and
+    the search speed (for bots reporting last_search_stats) are recorded as
+    gauges, and the move is profiled if profile_next_bot_move() was called.
+
+    Parameters:
+        bot (pyspiel.Bot): bot to step
+        state (pyspiel.State): state in which the bot has to move
+
+    Returns:
+        action (int): bot's action
+    """
+    if not _enabled:
+        return bot.step(state)
+    start = time.perf_counter()
+    with span("bot.step"):
+        if _profile_request is not None:
+            action = _profiled_step(bot, state)
+        else:
+            action = bot.step(state)
+    set_gauge("bot.think_s", time.perf_counter() - start)
+    stats = getattr(bot, "last_search_stats", {})
+    if "simulations_per_second" in stats:
+        set_gauge("bot.simulations_per_second", stats["simulations_per_second"])
+    return action
+
+
+def profile_next_bot_move(mode: str, output: str) -> None:
+    """
+    Profiles the next bot move made through bot_step(). Instrumentation must be
+    enabled.
+
+    Parameters:
+        mode (str): "cprofile" (time per function, written in pstats format, to
+            read with python -m pstats or snakeviz) or "tracemalloc" (memory
+            allocated per line, written as text)
+        output (str): path of the profile
+    """
+    global _profile_request
+    if mode not in ["cprofile", "tracemalloc"]:
+        raise ValueError(f"Invalid profiling mode: {mode}")
+    _profile_request = (mode, output)
+
+
+def _profiled_step(bot: pyspiel.Bot, state: pyspiel.State) -> int:
+    global _profile_request
+    (mode, output), _profile_request = _profile_request, None
+    if mode == "cprofile":
+        import cProfile
+        import pstats
+
+        profile = cProfile.Profile()
+        action = profile.runcall(bot.step, state)
+        profile.dump_stats(output)
+        pstats.Stats(profile).sort_stats("cumulative").print_stats(15)
+    else:
+        import tracemalloc
+
+        tracemalloc.start()
+        action = bot.step(state)
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        with open(output, "w") as f:
+            f.write(f"Peak traced memory: {peak / 2**20:.1f} MiB\n")
+            for stat in snapshot.statistics("lineno")[:50]:
+                f.write(f"{stat}\n")
+    print(f"Profile ({mode}) of the bot move written to {output}")
+    return action
+
+
+def counters() -> t.List[t.Dict[str, t.Any]]:
+    """
+    Returns the counters of the spans, sorted by name.
+
+    Returns:
+        counters (list): dicts with keys name, count, total_ms, mean_ms and max_ms
+    """
+    with _lock:
+        items = sorted((name, list(counter)) for name, counter in _counters.items())
+    return [
+        {
+            "name": name,
+            "count": count,
+            "total_ms": 1000 * total,
+            "mean_ms": 1000 * total / count,
+            "max_ms": 1000 * maximum,
+        }
+        for name, (count, total, maximum) in items
+    ]
+
+
+def export_counters(path: str) -> None:
+    """
+    Writes the counters of the spans and the gauges to path, as CSV if it ends
+    with .csv, else as JSON.
+    """
+    rows = counters()
+    if pathlib.Path(path).suffix.lower() == ".csv":
+        import csv
+
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(
+                f, fieldnames=["name", "count", "total_ms", "mean_ms", "max_ms"]
+            )
+            writer.writeheader()
+            writer.writerows(rows)
+    else:
+        with open(path, "w") as f:
+            json.dump({"spans": rows, "gauges": dict(_gauges)}, f, indent=2)
+
+
+def export_trace(path: str) -> None:
+    """Writes the recorded spans to path in Chrome's trace event format."""
+    with _lock:
+        events = list(_trace_events)
+    with open(path, "w") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+
+def reset() -> None:
+    """Forgets the counters, gauges and trace events recorded so far."""
+    with _lock:
+        _counters.clear()
+        _gauges.clear()
+        _trace_events.clear()
+        _frame_times.clear()
@@ -1,53 +1,167 @@
 #!/usr/bin/env python
 
+import argparse
+import typing as t
+
 import pygame
 import pygame_menu
 from pygame_menu import themes
 
+from pygame_spiel import instrumentation
 from pygame_spiel.games.settings import GAMES_BOTS
 from pygame_spiel.games.factory import GameFactory
 from pygame_spiel.menu import Menu
+from pygame_spiel.utils import get_breakpoint_dir
+from pygame_spiel.weights import WeightsNotFoundError
 
 
 def select_game(game, index):
     pass
 
 
-def pygame_spiel():
-    menu = Menu()
-    menu.display()
-    game_name = menu.get_selected_game()
-    bot_type = menu.get_selected_opponent()
+def parse_args(argv: t.Optional[t.List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Play OpenSpiel board games against AI bots."
+    )
+    parser.add_argument(
+        "--think-time",
+        type=float,
+        default=None,
+        help="maximum thinking time per bot move, in seconds (default: no limit)",
+    )
+    parser.add_argument(
+        "--move-cache",
+        action="store_true",
+        help="answer positions seen before from the bot's move cache (on disk)",
+    )
+    parser.add_argument(
+        "--ponder",
+        action="store_true",
+        help="let the bot search during your turn, to answer faster (mcts bots)",
+    )
+    parser.add_argument(
+        "--record",
+        metavar="PATH",
+        default=None,
+        help="append the game to the record file PATH (replay it with "
+        "pygame_spiel_replay PATH)",
+    )
+    perf = parser.add_argument_group("performance instrumentation")
+    perf.add_argument(
+        "--perf-overlay",
+        action="store_true",
+        help="show FPS, bot think time and simulations per second on the board",
+    )
+    perf.add_argument(
+        "--perf-counters",
+        metavar="PATH",
+        default=None,
+        help="on exit, write the timing counters to PATH (CSV if it ends with .csv, "
+        "else JSON)",
+    )
+    perf.add_argument(
+        "--perf-trace",
+        metavar="PATH",
+        default=None,
+        help="on exit, write a Chrome trace (chrome://tracing, Perfetto) to PATH",
+    )
+    perf.add_argument(
+        "--profile-bot-move",
+        choices=["cprofile", "tracemalloc"],
+        default=None,
+        help="profile the first move of the bot (time per function or memory per line)",
+    )
+    perf.add_argument(
+        "--profile-output",
+        metavar="PATH",
+        default="bot_move.prof",
+        help="where --profile-bot-move writes the profile (default: bot_move.prof)",
+    )
+    return parser.parse_args(argv)
+
+
+def pygame_spiel(argv: t.Optional[t.List[str]] = None):
+    args = parse_args(argv)
+    perf_options = [
+        args.perf_overlay,
+        args.perf_counters,
+        args.perf_trace,
+        args.profile_bot_move,
+    ]
+    if any(perf_options):
+        instrumentation.configure(
+            overlay=args.perf_overlay, trace=args.perf_trace is not None
+        )
+        if args.profile_bot_move:
+            instrumentation.profile_next_bot_move(
+                args.profile_bot_move, args.profile_output
+            )
 
-    player_id = 0
+    menu = Menu(think_time=args.think_time)
+    while True:
+        menu.display()
+        game_name = menu.get_selected_game()
+        bot_type = menu.get_selected_opponent()
+        think_time = menu.get_selected_think_time()
+
+        assert (
+            bot_type in GAMES_BOTS[game_name].keys()
+        ), f"""Bot type {bot_type} not available for game {game_name}. List of 
+            available bots: {list(GAMES_BOTS[game_name].keys())}"""
 
-    assert (
-        bot_type in GAMES_BOTS[game_name].keys()
-    ), f"""Bot type {bot_type} not available for game {game_name}. List of 
-        available bots: {list(GAMES_BOTS[game_name].keys())}"""
+        # Fetch the bot's weights (if any) while the menu is still shown, so that a
+        # bot whose weights cannot be found is disabled instead of crashing the game
+        try:
+            get_breakpoint_dir(bot_type, game_name)
+        except WeightsNotFoundError as e:
+            print(e)
+            menu.disable_opponent(game_name, bot_type, str(e))
+            continue
+        break
+
+    player_id = 0
 
     game = GameFactory.get_game(game_name, current_player=player_id)
-    game.set_bots(
-        bot1_type="human",
-        bot1_params=None,
-        bot2_type=bot_type,
-        bot2_params=None,
-    )
+    try:
+        game.set_bots(
+            bot1_type="human",
+            bot1_params=None,
+            bot2_type=bot_type,
+            bot2_params={"time_limit": think_time, "move_cache": args.move_cache},
+            ponder=args.ponder,
+        )
+    except WeightsNotFoundError as e:
+        # E.g. the cached weights were removed by another process in the meantime
+        print(f"Could not create the {bot_type} bot: {e}")
+        game.close()
+        return
+    if args.record:
+        game.start_recording(args.record)
 
+    # Event-driven loop: when nothing can change without user input (or without the
+    # bot's background search completing, which posts BOT_MOVE_READY), the loop
+    # sleeps in pygame.event.wait() instead of polling.
     done = False
-    clock = pygame.time.Clock()
+    game.play([])
 
     while not done:
-        clock.tick(10)
-
-        events = pygame.event.get()
-        for event in events:
-            if event.type == pygame.QUIT:
-                done = True
-
-        mouse_pos = pygame.mouse.get_pos()
-        mouse_pressed = pygame.mouse.get_pressed()
+        events = [] if not game.is_idle() else [pygame.event.wait()]
+        with instrumentation.span("events"):
+            events += pygame.event.get()
+            for event in events:
+                if event.type == pygame.QUIT:
+                    done = True
+                elif event.type in [pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED]:
+                    game.invalidate()
 
-        game.play(mouse_pos=mouse_pos, mouse_pressed=mouse_pressed)
+        with instrumentation.span("play"):
+            game.play(events)
+        instrumentation.frame()
 
-        pygame.display.flip()
+    game.close()
+    if args.perf_counters:
+        instrumentation.export_counters(args.perf_counters)
+        print(f"Timing counters written to {args.perf_counters}")
+    if args.perf_trace:
+        instrumentation.export_trace(args.perf_trace)
+        print(f"Trace written to {args.perf_trace}")
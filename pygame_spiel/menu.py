@@ -3,22 +3,39 @@ import pygame
 import pygame_menu
 from pygame_menu import themes
 
-from pygame_spiel.games.settings import GAMES_BOTS
+from pygame_spiel.games.settings import GAMES_BOTS, THINK_TIMES
+from pygame_spiel.utils import weights_available
 
 
 class Menu:
-    def __init__(self):
+    def __init__(self, think_time: t.Optional[float] = None):
+        """
+        Parameters:
+            think_time (float): initially selected thinking time per bot move, in seconds
+                (None for no limit)
+        """
         pygame.init()
         self._menu_surface = pygame.display.set_mode([600, 600])
         pygame.display.set_caption("Pygame Open Spiel")
 
         self._selected_game = "breakthrough"
         self._selected_opponent_type = "mcts"
+        # (game, bot type) pairs that could not be created, see disable_opponent()
+        self._disabled_opponents = set()
+        self._error_labels = []
         self._list_opponent_types = self._get_game_available_bots(self._selected_game)
         drop_select_items = [
             (opp_type, i) for i, opp_type in enumerate(self._list_opponent_types)
         ]
 
+        self._selected_think_time = think_time
+        think_times = list(THINK_TIMES)
+        if think_time not in think_times:
+            think_times.append(think_time)
+        think_time_items = [
+            (self._think_time_label(value), value) for value in think_times
+        ]
+
         self._mainmenu = pygame_menu.Menu(
             "Pygame spiel", 600, 600, theme=themes.THEME_SOLARIZED
         )
@@ -33,26 +50,71 @@ class Menu:
         self._menu_dropselect_opponent = self._mainmenu.add.dropselect(
             "Opponent :", drop_select_items, onchange=self._select_opponent, default=0
         )
+        self._menu_dropselect_think_time = self._mainmenu.add.dropselect(
+            "Think time :",
+            think_time_items,
+            onchange=self._select_think_time,
+            default=think_times.index(think_time),
+        )
         self._mainmenu.add.button("Play", self._start_game)
 
     def display(
         self,
     ):
         """Run the Pygame display function which visualizes the menu on screen."""
+        self._mainmenu.enable()
         self._mainmenu.mainloop(self._menu_surface)
 
+    def disable_opponent(self, game: str, bot_type: str, message: str):
+        """
+        Removes a bot type from the opponents offered for a game (e.g. because its
+        weights could not be fetched) and shows why. The first remaining opponent is
+        selected.
+
+        Parameters:
+            game (str): game for which the bot is removed
+            bot_type (str): bot type to remove
+            message (str): error shown under the menu
+        """
+        self._disabled_opponents.add((game, bot_type))
+        for label in self._error_labels:
+            self._mainmenu.remove_widget(label)
+        labels = self._mainmenu.add.label(
+            f"{bot_type} is not available: {message}", max_char=-1, font_size=14
+        )
+        # add.label() returns a list of labels when the text is wrapped
+        self._error_labels = labels if isinstance(labels, list) else [labels]
+        if game == self._selected_game:
+            self._update_opponents()
+
     def _get_game_available_bots(self, game: str) -> t.List:
         """
-        Returns the list of available bots for a specified game.
+        Returns the list of available bots for a specified game. Bots whose weights
+        cannot be found, or disabled with disable_opponent(), are left out.
         Example: _get_game_available_bots('breaktrhough') -> ['mcts', 'dqn']
 
         Parameters:
             game (str): selected game
         """
         dict_game_info = GAMES_BOTS[game]
-        list_bot_types = list(dict_game_info.keys())
+        list_bot_types = [
+            bot_type
+            for bot_type in dict_game_info.keys()
+            if (game, bot_type) not in self._disabled_opponents
+            and weights_available(bot_type, game)
+        ]
         return list_bot_types
 
+    def _update_opponents(self):
+        """Refreshes the opponents offered for the selected game, selects the first."""
+        self._list_opponent_types = self._get_game_available_bots(self._selected_game)
+        drop_select_items = [
+            (opp_type, i) for i, opp_type in enumerate(self._list_opponent_types)
+        ]
+        self._menu_dropselect_opponent.update_items(drop_select_items)
+        self._menu_dropselect_opponent.set_value(0)
+        self._selected_opponent_type = self._list_opponent_types[0]
+
     def _select_game(self, game: str, game_index: int):
         """
         Callback function for the Dropselect menu used to select the game.
@@ -62,12 +124,7 @@ class Menu:
             game_index (int): index of the selected game
         """
         self._selected_game = game[0][0]
-        self._list_opponent_types = self._get_game_available_bots(self._selected_game)
-
-        drop_select_items = [
-            (opp_type, i) for i, opp_type in enumerate(self._list_opponent_types)
-        ]
-        self._menu_dropselect_opponent.update_items(drop_select_items)
+        self._update_opponents()
 
     def _select_opponent(self, bot_type: str, opp_index: int):
         """
@@ -79,6 +136,21 @@ class Menu:
         """
         self._selected_opponent_type = bot_type[0][0]
 
+    @staticmethod
+    def _think_time_label(think_time: t.Optional[float]) -> str:
+        """Returns the text shown in the menu for a thinking time (e.g. "2 s")."""
+        return "no limit" if think_time is None else f"{think_time:g} s"
+
+    def _select_think_time(self, item: t.Tuple, think_time: t.Optional[float]):
+        """
+        Callback function for the Dropselect menu used to select the bot's thinking time.
+
+        Parameters:
+            item (tuple): item selected in the drop-select menu
+            think_time (float): thinking time per move in seconds (None for no limit)
+        """
+        self._selected_think_time = think_time
+
     def _start_game(self):
         """Callback function used when the button Play is selected, which turns off the menu."""
         self._mainmenu.disable()
@@ -100,3 +172,12 @@ class Menu:
             selected_opponent_type (str): opponent's type selected in the menu
         """
         return self._selected_opponent_type
+
+    def get_selected_think_time(self) -> t.Optional[float]:
+        """
+        Getter which returns the current selected thinking time per bot move.
+
+        Returns:
+            selected_think_time (float): seconds per move, or None for no limit
+        """
+        return self._selected_think_time
@@ -0,0 +1,266 @@
+#!/usr/bin/env python
+"""Binary game records.
+
+A record file is a sequence of length-prefixed records:
+
+    <uint32 length> <uint8 kind> <payload of length - 1 bytes>
+
+with integers in little-endian order. A game is a HEADER record (JSON payload:
+format version, game name, bot configurations and start time), followed by one
+MOVE record per action (payload <int8 player> <uint32 action> <float32
+seconds>, the time elapsed since the previous move) and, if the game was
+finished, an END record (JSON payload: returns of the players). Several games
+can follow each other in the same file.
+
+Every record is written with a single write() and flushed, so an interrupted
+process loses at most the move being written. Reading stops at the first
+truncated or malformed record, and GameRecorder truncates the file after the
+last complete record before appending to it, so a record left partial by a
+crash never shifts the records written after it.
+
+Games are replayed by applying the recorded actions to a new open_spiel state,
+without creating any bot:
+
+    pygame_spiel_replay games.pgsr --show
+"""
+import argparse
+import json
+import os
+import struct
+import time
+import typing as t
+
+import pyspiel
+
+FORMAT_VERSION = 1
+
+HEADER, MOVE, END = 1, 2, 3
+
+_PREFIX = struct.Struct("<IB")  # length (kind included), kind
+_MOVE = struct.Struct("<bIf")  # player, action, seconds
+_HEADER_KEYS = {"version", "game", "bots", "start_time"}
+
+# (player, action, seconds since the previous move)
+Move = t.Tuple[int, int, float]
+
+
+class GameRecord(t.NamedTuple):
+    """A game read from a record file."""
+
+    game: str
+    bots: t.List[t.Dict[str, t.Any]]
+    start_time: float
+    moves: t.List[Move]
+    returns: t.Optional[t.List[float]]  # None if the game was not finished
+
+    @property
+    def actions(self) -> t.List[int]:
+        return [action for _, action, _ in self.moves]
+
+
+class GameRecorder:
+    """Appends the moves of one game to a record file, as they are played."""
+
+    def __init__(
+        self,
+        path: str,
+        game_name: str,
+        bots: t.List[t.Dict[str, t.Any]],
+        fsync: bool = False,
+    ):
+        """
+        Parameters:
+            path (str): record file, created if needed (games are appended to it)
+            game_name (str): name of the open_spiel game (e.g. breakthrough)
+            bots (list): configuration of the bot of each player (e.g.
+                {"type": "mcts", "params": {"time_limit": 1.0}}), stored as JSON
+            fsync (bool): if True, every record is also synced to the disk, which
+                protects it against power losses and not only against crashes
+        """
+        self._file = open(path, "a+b")
+        self._file.seek(0)
+        data = self._file.read()
+        size = _complete_size(data)
+        if size < len(data):
+            print(
+                f"Removing {len(data) - size} bytes of incomplete records at the end "
+                f"of {path}"
+            )
+            self._file.truncate(size)
+        self._fsync = fsync
+        self._last_move_time = time.time()
+        header = {
+            "version": FORMAT_VERSION,
+            "game": game_name,
+            "bots": bots,
+            "start_time": self._last_move_time,
+        }
+        self._write(HEADER, json.dumps(header, default=str).encode())
+
+    def record_move(self, player: int, action: int) -> None:
+        """
+        Appends a move, timed from the previous move (or from the start of the game).
+
+        Parameters:
+            player (int): player who played the action
+            action (int): action played
+        """
+        now = time.time()
+        seconds, self._last_move_time = now - self._last_move_time, now
+        self._write(MOVE, _MOVE.pack(player, action, seconds))
+
+    def finish(self, returns: t.List[float]) -> None:
+        """
+        Appends the end of the game.
+
+        Parameters:
+            returns (list): final return of each player
+        """
+        self._write(END, json.dumps({"returns": list(returns)}).encode())
+
+    def close(self) -> None:
+        self._file.close()
+
+    def _write(self, kind: int, payload: bytes) -> None:
+        self._file.write(_PREFIX.pack(len(payload) + 1, kind) + payload)
+        self._file.flush()
+        if self._fsync:
+            os.fsync(self._file.fileno())
+
+
+def _records(data: bytes) -> t.Iterator[t.Tuple[int, int, t.Any]]:
+    """
+    Decodes the records of the content of a record file, in order.
+
+    Decoding stops at the first record that is truncated (interrupted while
+    being written) or malformed (e.g. records appended after a truncated one).
+
+    Returns:
+        records (iterator): (kind, end offset, value) of every record, the value
+            being the header dict, the Move or the returns of the record
+    """
+    offset, size = 0, len(data)
+    while offset + _PREFIX.size <= size:
+        length, kind = _PREFIX.unpack_from(data, offset)
+        start, end = offset + _PREFIX.size, offset + 4 + length
+        if end > size:
+            return
+        try:
+            if kind == MOVE:
+                if end - start != _MOVE.size:
+                    return
+                value = _MOVE.unpack_from(data, start)
+            elif kind == HEADER:
+                value = json.loads(data[start:end])
+                if not _HEADER_KEYS <= set(value):
+                    return
+            elif kind == END:
+                value = list(json.loads(data[start:end])["returns"])
+            else:
+                return
+        except (ValueError, KeyError, TypeError):  # JSONDecodeError is a ValueError
+            return
+        yield kind, end, value
+        offset = end
+
+
+def _complete_size(data: bytes) -> int:
+    """Returns the size of the complete, well-formed records at the start of data."""
+    size = 0
+    for _, size, _ in _records(data):
+        pass
+    return size
+
+
+def read_records(path: str) -> t.Iterator[GameRecord]:
+    """
+    Returns the games of a record file, in order. Reading stops at the first
+    truncated or malformed record.
+
+    Parameters:
+        path (str): record file
+
+    Returns:
+        records (iterator): one GameRecord per game
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+
+    header, moves, returns = None, [], None
+    end = 0
+    for kind, end, value in _records(data):
+        if kind == MOVE:
+            moves.append(value)
+        elif kind == HEADER:
+            if header is not None:
+                yield _game_record(header, moves, returns)
+            header, moves, returns = value, [], None
+        elif kind == END:
+            returns = value
+    if end < len(data):
+        print(f"Ignoring {len(data) - end} bytes of incomplete records in {path}")
+    if header is not None:
+        yield _game_record(header, moves, returns)
+
+
+def _game_record(
+    header: t.Dict[str, t.Any], moves: t.List[Move], returns: t.Optional[list]
+) -> GameRecord:
+    if header["version"] > FORMAT_VERSION:
+        raise ValueError(f"Unsupported record format version {header['version']}")
+    return GameRecord(
+        header["game"], header["bots"], header["start_time"], moves, returns
+    )
+
+
+_games = {}
+
+
+def replay(record: GameRecord) -> pyspiel.State:
+    """
+    Rebuilds the final state of a recorded game (no bot is created).
+
+    Parameters:
+        record (GameRecord): recorded game
+
+    Returns:
+        state (pyspiel.State): state reached after the recorded actions
+    """
+    game = _games.get(record.game)
+    if game is None:
+        game = _games[record.game] = pyspiel.load_game(record.game)
+    state = game.new_initial_state()
+    for _, action, _ in record.moves:
+        state.apply_action(action)
+    return state
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Replay the games of a pygame_spiel record file."
+    )
+    parser.add_argument("path", help="record file")
+    parser.add_argument(
+        "--show", action="store_true", help="print the final position of every game"
+    )
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    num_games = num_moves = 0
+    for index, record in enumerate(read_records(args.path)):
+        state = replay(record)
+        num_games += 1
+        num_moves += len(record.moves)
+        bots = " vs ".join(bot["type"] for bot in record.bots)
+        result = "unfinished" if record.returns is None else f"returns {record.returns}"
+        print(
+            f"game {index}: {record.game}, {bots}, {len(record.moves)} moves, {result}"
+        )
+        if args.show:
+            print(state)
+    seconds = time.perf_counter() - start
+    print(f"{num_games} games ({num_moves} moves) replayed in {seconds:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
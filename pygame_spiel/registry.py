@@ -0,0 +1,94 @@
+import importlib
+import typing as t
+
+
+class LazyRegistry:
+    """Maps names to objects identified by an import path.
+
+    Entries are registered as "package.module:attribute" strings and the module
+    is only imported the first time the entry is loaded. This keeps heavy
+    backends (e.g. TensorFlow for the DQN bot) out of the startup path unless
+    they are actually selected.
+    """
+
+    def __init__(self, kind: str, entries: t.Optional[t.Dict[str, str]] = None):
+        """
+        Parameters:
+            kind (str): what the registry contains (used in error messages)
+            entries (dict): initial mapping from name to import path
+        """
+        self._kind = kind
+        self._paths = {}
+        self._loaded = {}
+        for name, import_path in (entries or {}).items():
+            self.register(name, import_path)
+
+    def register(self, name: str, import_path: str) -> None:
+        """
+        Adds (or replaces) an entry. Nothing is imported until load() is called.
+
+        Parameters:
+            name (str): name of the entry (e.g. "mcts")
+            import_path (str): "package.module:attribute" path of the object
+        """
+        if ":" not in import_path:
+            raise ValueError(
+                f"Invalid import path {import_path}, expected 'module:attribute'"
+            )
+        self._paths[name] = import_path
+        self._loaded.pop(name, None)
+
+    def load(self, name: str) -> t.Any:
+        """
+        Imports (once) and returns the object registered under name.
+
+        Parameters:
+            name (str): name of the entry
+
+        Returns:
+            obj (Any): the object found at the registered import path
+        """
+        if name not in self._paths:
+            raise ValueError(
+                f"Invalid {self._kind} type: {name}. Available: {self.names()}"
+            )
+        if name not in self._loaded:
+            module_name, attribute = self._paths[name].split(":")
+            module = importlib.import_module(module_name)
+            self._loaded[name] = getattr(module, attribute)
+        return self._loaded[name]
+
+    def names(self) -> t.List[str]:
+        """Returns the names of all the registered entries."""
+        return list(self._paths.keys())
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._paths
+
+
+GAMES = LazyRegistry(
+    "game",
+    {
+        "tic_tac_toe": "pygame_spiel.games.tic_tac_toe:TicTacToe",
+        "breakthrough": "pygame_spiel.games.breakthrough:Breakthrough",
+    },
+)
+
+# Bot entries point to builder functions with signature
+# builder(game, player_id, checkpoint_dir=None, seed=42, time_limit=None) -> pyspiel.Bot
+# When the moves of a bot also depend on parameters resolved by its builder (e.g.
+# the number of workers of mcts_parallel), the bot describes them in a bot_config
+# string attribute, which becomes part of its move cache key (see utils.init_bot).
+BOTS = LazyRegistry(
+    "bot",
+    {
+        "mcts": "pygame_spiel.bots.mcts:build_bot",
+        "mcts_parallel": "pygame_spiel.bots.parallel_mcts:build_bot",
+        "random": "pygame_spiel.bots.builders:build_random",
+        "human": "pygame_spiel.bots.builders:build_human",
+        "dqn": "pygame_spiel.bots.dqn_numpy:build_bot",
+        "mcts_dqn": "pygame_spiel.bots.mcts_dqn:build_bot",
+        "mcts_bitboard": "pygame_spiel.bots.breakthrough_bitboard:build_bot",
+        "solver": "pygame_spiel.bots.tic_tac_toe_solver:build_bot",
+    },
+)
@@ -0,0 +1,472 @@
+#!/usr/bin/env python
+"""Self-play data generator.
+
+Bots created with init_bot play games against each other in a pool of worker
+processes. Every move becomes a training sample (observation of the player to
+move, mask of its legal actions, action chosen, reward received, final return
+of the player). Samples are written to shards: .npy files holding a structured
+array of a fixed number of samples (the last shard of each worker may be
+shorter), with the observation and the legal mask bit-packed (np.packbits).
+
+The output folder contains the shards and index.json, which describes the
+sample layout and lists the finished shards with their number of samples. The
+index is rewritten (atomically) every time a shard is finished, so training
+can start reading while the generation goes on. Shards are opened as memory
+maps, without copying them:
+
+    index, shards = open_shards("selfplay/")
+    observations, legal_mask = unpack(shards[0][:256], index)
+
+Example:
+    pygame_spiel_selfplay --game breakthrough --bots mcts mcts --think-time 0.05 \
+        --games 1000 --workers 8 --output selfplay/
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import pathlib
+import time
+import typing as t
+from queue import Empty
+
+import numpy as np
+
+import pyspiel
+from open_spiel.python.observation import make_observation
+
+from pygame_spiel.utils import init_bot, get_breakpoint_dir
+
+INDEX_FILE = "index.json"
+
+# Seconds between two checks that the workers are still running
+_POLL_SECONDS = 1.0
+
+
+def sample_dtype(game: pyspiel.Game) -> np.dtype:
+    """
+    Returns the dtype of the samples of a game.
+
+    Fields: observation and legal_mask (bit-packed uint8), action, reward (of the
+    player after its move), outcome (final return of the player), player and last
+    (True for the last move of a game).
+    """
+    observation_size = int(np.prod(game.observation_tensor_shape()))
+    return np.dtype(
+        [
+            ("observation", np.uint8, ((observation_size + 7) // 8,)),
+            ("legal_mask", np.uint8, ((game.num_distinct_actions() + 7) // 8,)),
+            ("action", np.int32),
+            ("reward", np.float32),
+            ("outcome", np.float32),
+            ("player", np.int8),
+            ("last", np.bool_),
+        ]
+    )
+
+
+class ShardWriter:
+    """Buffers samples and writes them to .npy shards of shard_size samples."""
+
+    def __init__(self, folder: pathlib.Path, prefix: str, dtype: np.dtype, size: int):
+        """
+        Parameters:
+            folder (Path): output folder
+            prefix (str): prefix of the shard files of this writer
+            dtype (np.dtype): dtype of the samples, see sample_dtype()
+            size (int): samples per shard
+        """
+        self._folder = folder
+        self._prefix = prefix
+        self._buffer = np.zeros(size, dtype)
+        self._count = 0
+        self._num_shards = 0
+
+    def append(self, samples: np.ndarray) -> t.List[t.Dict[str, t.Any]]:
+        """
+        Adds samples and writes the shards that get full.
+
+        Returns:
+            shards (list): index entries ({"file", "num_samples"}) of the written shards
+        """
+        written = []
+        while len(samples):
+            n = min(len(samples), len(self._buffer) - self._count)
+            self._buffer[self._count : self._count + n] = samples[:n]
+            self._count += n
+            samples = samples[n:]
+            if self._count == len(self._buffer):
+                written.append(self.flush())
+        return written
+
+    def flush(self) -> t.Optional[t.Dict[str, t.Any]]:
+        """Writes the buffered samples (if any) to a new shard and returns its entry."""
+        if self._count == 0:
+            return None
+        name = f"{self._prefix}-{self._num_shards:05d}.npy"
+        tmp_path = self._folder / f".{name}.tmp"
+        shard = np.lib.format.open_memmap(
+            tmp_path, mode="w+", dtype=self._buffer.dtype, shape=(self._count,)
+        )
+        shard[:] = self._buffer[: self._count]
+        shard.flush()
+        del shard
+        os.replace(tmp_path, self._folder / name)
+        entry = {"file": name, "num_samples": self._count}
+        self._count = 0
+        self._num_shards += 1
+        return entry
+
+
+def play_game(
+    game: pyspiel.Game,
+    bots: t.List[pyspiel.Bot],
+    dtype: np.dtype,
+    observation: t.Any,
+) -> np.ndarray:
+    """
+    Plays a game between bots and returns its samples.
+
+    Parameters:
+        game (pyspiel.Game): open_spiel game
+        bots (list): one bot per player, indexed by player id
+        dtype (np.dtype): dtype of the samples, see sample_dtype()
+        observation: open_spiel Observation object of the game, written at every move
+
+    Returns:
+        samples (np.ndarray): one sample per move
+    """
+    state = game.new_initial_state()
+    for bot in bots:
+        bot.restart_at(state)
+    num_actions = game.num_distinct_actions()
+    mask = np.zeros(num_actions, np.uint8)
+    rows = []
+    while not state.is_terminal():
+        player = state.current_player()
+        observation.set_from(state, player)
+        tensor = observation.tensor.ravel()
+        if np.any((tensor != 0) & (tensor != 1)):
+            raise ValueError(f"The observations of {game} are not binary")
+        mask[:] = 0
+        mask[state.legal_actions(player)] = 1
+
+        action = bots[player].step(state)
+        for other, bot in enumerate(bots):
+            if other != player:
+                bot.inform_action(state, player, action)
+        state.apply_action(action)
+        rows.append(
+            (
+                np.packbits(tensor.astype(np.uint8)),
+                np.packbits(mask),
+                action,
+                state.rewards()[player],
+                0.0,
+                player,
+                False,
+            )
+        )
+    samples = np.array(rows, dtype)
+    returns = np.asarray(state.returns(), np.float32)
+    samples["outcome"] = returns[samples["player"]]
+    if len(samples):
+        samples["last"][-1] = True
+    return samples
+
+
+def _worker(
+    worker_index: int,
+    game_name: str,
+    bot_types: t.List[str],
+    breakpoint_dirs: t.List[t.Optional[str]],
+    num_games: int,
+    folder: str,
+    shard_size: int,
+    seed: int,
+    think_time: t.Optional[float],
+    queue: multiprocessing.Queue,
+) -> None:
+    """
+    Plays num_games games, reporting shards and statistics through queue, as
+    (kind, worker_index, payload) messages.
+    """
+    try:
+        game = pyspiel.load_game(game_name)
+        bots = [
+            init_bot(
+                bot_type,
+                game,
+                player_id=player_id,
+                breakpoint_dir=breakpoint_dir,
+                seed=seed + 1000 * worker_index + player_id,
+                time_limit=think_time,
+            )
+            for player_id, (bot_type, breakpoint_dir) in enumerate(
+                zip(bot_types, breakpoint_dirs)
+            )
+        ]
+        dtype = sample_dtype(game)
+        observation = make_observation(game)
+        writer = ShardWriter(
+            pathlib.Path(folder), f"shard-{worker_index:03d}", dtype, shard_size
+        )
+
+        start = time.process_time()
+        num_samples = 0
+        for _ in range(num_games):
+            samples = play_game(game, bots, dtype, observation)
+            num_samples += len(samples)
+            for entry in writer.append(samples):
+                queue.put(("shard", worker_index, entry))
+        entry = writer.flush()
+        if entry is not None:
+            queue.put(("shard", worker_index, entry))
+        cpu_seconds = time.process_time() - start
+        for bot in bots:
+            if hasattr(bot, "close"):
+                bot.close()
+        stats = {"samples": num_samples, "cpu_seconds": cpu_seconds}
+        queue.put(("done", worker_index, stats))
+    except Exception as e:
+        queue.put(("error", worker_index, f"worker {worker_index}: {e!r}"))
+
+
+def _write_index(folder: pathlib.Path, index: t.Dict[str, t.Any]) -> None:
+    tmp_path = folder / f".{INDEX_FILE}.tmp"
+    tmp_path.write_text(json.dumps(index, indent=2))
+    os.replace(tmp_path, folder / INDEX_FILE)
+
+
+def generate(
+    game_name: str,
+    bot_types: t.List[str],
+    num_games: int,
+    output: str,
+    num_workers: int = None,
+    shard_size: int = 65536,
+    seed: int = 0,
+    think_time: float = None,
+    overwrite: bool = False,
+) -> t.Dict[str, t.Any]:
+    """
+    Generates self-play samples with a pool of worker processes.
+
+    Parameters:
+        game_name (str): name of the game (e.g. breakthrough)
+        bot_types (list): bot type of each player (e.g. ["mcts", "mcts"])
+        num_games (int): number of games to play
+        output (str): output folder (created if needed)
+        num_workers (int): number of worker processes (default: number of CPUs)
+        shard_size (int): samples per shard
+        seed (int): base seed of the bots' random number generators
+        think_time (float): maximum thinking time per move of the bots, in seconds
+        overwrite (bool): if True, the shards and index of a previous generation in
+            the output folder are deleted, else a non-empty folder is refused
+
+    Returns:
+        summary (dict): samples written, duration and throughput
+    """
+    folder = pathlib.Path(output)
+    folder.mkdir(parents=True, exist_ok=True)
+    if any(folder.iterdir()):
+        if not overwrite:
+            raise FileExistsError(
+                f"The output folder {folder} is not empty (overwrite it with "
+                "--overwrite)"
+            )
+        shards = [*folder.glob("shard-*.npy"), *folder.glob(".*.tmp")]
+        for path in [folder / INDEX_FILE, *shards]:
+            path.unlink(missing_ok=True)
+    game = pyspiel.load_game(game_name)
+    dtype = sample_dtype(game)
+    # Weights are downloaded once, here, rather than by every worker
+    breakpoint_dirs = [
+        get_breakpoint_dir(bot_type, game_name) for bot_type in bot_types
+    ]
+    num_workers = min(num_workers or os.cpu_count(), num_games)
+
+    index = {
+        "game": game_name,
+        "bots": bot_types,
+        "think_time": think_time,
+        "observation_shape": list(game.observation_tensor_shape()),
+        "num_actions": game.num_distinct_actions(),
+        "dtype": [
+            (name, str(dtype[name].base), dtype[name].shape) for name in dtype.names
+        ],
+        "shards": [],
+    }
+    _write_index(folder, index)
+
+    queue = multiprocessing.Queue()
+    processes = []
+    for worker_index in range(num_workers):
+        worker_games = num_games // num_workers
+        worker_games += worker_index < num_games % num_workers
+        process = multiprocessing.Process(
+            target=_worker,
+            args=(
+                worker_index,
+                game_name,
+                bot_types,
+                [None if d is None else str(d) for d in breakpoint_dirs],
+                worker_games,
+                str(folder),
+                shard_size,
+                seed,
+                think_time,
+                queue,
+            ),
+            daemon=True,
+        )
+        process.start()
+        processes.append(process)
+
+    start = time.perf_counter()
+    stats, errors = [], []
+    reported = set()
+    # Workers found dead without having reported: their last messages may still be
+    # in transit, so they are only counted as failed at the next timeout
+    dead = set()
+    try:
+        while len(reported) < num_workers:
+            try:
+                kind, worker_index, payload = queue.get(timeout=_POLL_SECONDS)
+            except Empty:
+                for worker_index in dead - reported:
+                    exitcode = processes[worker_index].exitcode
+                    errors.append(
+                        f"worker {worker_index} exited with code {exitcode} "
+                        "without reporting"
+                    )
+                    reported.add(worker_index)
+                dead = {
+                    worker_index
+                    for worker_index, process in enumerate(processes)
+                    if worker_index not in reported and not process.is_alive()
+                }
+                continue
+            if kind == "shard":
+                index["shards"].append(payload)
+                _write_index(folder, index)
+            else:
+                reported.add(worker_index)
+                if kind == "done":
+                    stats.append(payload)
+                else:
+                    errors.append(payload)
+    finally:
+        for process in processes:
+            process.join(timeout=1)
+            if process.is_alive():
+                process.terminate()
+    if errors:
+        raise RuntimeError("Self-play failed: " + "; ".join(errors))
+
+    seconds = time.perf_counter() - start
+    num_samples = sum(s["samples"] for s in stats)
+    cpu_seconds = sum(s["cpu_seconds"] for s in stats)
+    per_core = num_samples / cpu_seconds if cpu_seconds else 0.0
+    return {
+        "samples": num_samples,
+        "shards": len(index["shards"]),
+        "seconds": seconds,
+        "samples_per_second": num_samples / seconds,
+        "samples_per_second_per_core": per_core,
+        "workers": num_workers,
+    }
+
+
+def open_shards(folder: str) -> t.Tuple[t.Dict[str, t.Any], t.List[np.ndarray]]:
+    """
+    Opens the finished shards of a self-play folder as read-only memory maps.
+
+    Parameters:
+        folder (str): folder written by generate()
+
+    Returns:
+        index (dict): content of index.json
+        shards (list): one structured array (memory-mapped) per shard
+    """
+    folder = pathlib.Path(folder)
+    index = json.loads((folder / INDEX_FILE).read_text())
+    shards = [
+        np.load(folder / entry["file"], mmap_mode="r") for entry in index["shards"]
+    ]
+    return index, shards
+
+
+def unpack(
+    samples: np.ndarray, index: t.Dict[str, t.Any]
+) -> t.Tuple[np.ndarray, np.ndarray]:
+    """
+    Unpacks the observations and legal masks of samples.
+
+    Parameters:
+        samples (np.ndarray): samples (e.g. a slice of a shard)
+        index (dict): index of the folder, see open_shards()
+
+    Returns:
+        observations (np.ndarray): float32 array of shape [len(samples), size]
+        legal_mask (np.ndarray): boolean array of shape [len(samples), num_actions]
+    """
+    size = int(np.prod(index["observation_shape"]))
+    observations = np.unpackbits(samples["observation"], axis=1, count=size)
+    legal_mask = np.unpackbits(
+        samples["legal_mask"], axis=1, count=index["num_actions"]
+    )
+    return observations.astype(np.float32), legal_mask.astype(bool)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generate self-play training samples on a process pool."
+    )
+    parser.add_argument("--game", default="breakthrough")
+    parser.add_argument(
+        "--bots", nargs=2, default=["mcts", "mcts"], help="bot type of each player"
+    )
+    parser.add_argument("--games", type=int, default=100, help="number of games")
+    parser.add_argument(
+        "--workers", type=int, default=None, help="worker processes (default: CPUs)"
+    )
+    parser.add_argument("--output", default="selfplay", help="output folder")
+    parser.add_argument(
+        "--shard-size", type=int, default=65536, help="samples per shard"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="base random seed")
+    parser.add_argument(
+        "--think-time",
+        type=float,
+        default=None,
+        help="maximum thinking time per move in seconds (default: no limit)",
+    )
+    parser.add_argument(
+        "--overwrite",
+        action="store_true",
+        help="replace the shards of a previous generation in the output folder",
+    )
+    args = parser.parse_args()
+
+    summary = generate(
+        args.game,
+        args.bots,
+        args.games,
+        args.output,
+        num_workers=args.workers,
+        shard_size=args.shard_size,
+        seed=args.seed,
+        think_time=args.think_time,
+        overwrite=args.overwrite,
+    )
+    print(
+        f"{summary['samples']} samples in {summary['shards']} shards, "
+        f"{summary['seconds']:.1f}s with {summary['workers']} workers"
+    )
+    print(f"  {summary['samples_per_second']:.0f} samples/s")
+    print(f"  {summary['samples_per_second_per_core']:.0f} samples/s per core")
+
+
+if __name__ == "__main__":
+    main()
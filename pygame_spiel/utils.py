@@ -1,88 +1,132 @@
-import numpy as np
-import gdown
 import pathlib
-import shutil
 import os
+import typing as t
 
 import pyspiel
-from pygame_spiel.bots import dqn
 
-from open_spiel.python.bots import uniform_random, human
-from open_spiel.python.algorithms import mcts
+from pygame_spiel.registry import BOTS
+from pygame_spiel.games.settings import BREAKPOINTS_DRIVE_IDS, BOT_WEIGHTS
+
+CACHE_DIR_ENV = "PYGAME_SPIEL_CACHE_DIR"
+
+# Bots whose moves are never cached: they are not computed, already looked up in
+# a table, or meant to vary
+UNCACHED_BOTS = ["human", "random", "solver"]
 
 
 def init_bot(
-    bot_type: str, game: pyspiel.Game, player_id: int, breakpoint_dir: str = None
-) -> None:
+    bot_type: str,
+    game: pyspiel.Game,
+    player_id: int,
+    breakpoint_dir: str = None,
+    seed: int = 42,
+    time_limit: float = None,
+    move_cache: bool = False,
+) -> pyspiel.Bot:
     """
     Returns a bot of type bot_type for the player specified by player_id.
 
+    Bot types are resolved through the lazy registry pygame_spiel.registry.BOTS,
+    so the backend of a bot (e.g. TensorFlow for dqn) is only imported when that
+    bot type is requested.
+
     Parameters:
-        bot_type (str): Bot type (mcts, random or dqn)
+        bot_type (str): Bot type (mcts, random, human or dqn)
         game (pyspiel.Game): open_spiel game
         player_id (int): id of the player that the bot will be driving
         breakpoint_dir (str): Path to the DQN weigths (optional)
+        seed (int): seed of the bot's random number generator
+        time_limit (float): maximum thinking time per move in seconds, for bots that
+            search (e.g. mcts). If None, the bot's default budget is used.
+        move_cache (bool): if True, the bot's moves are stored in the move cache
+            (see pygame_spiel.bots.cached) and positions seen before are answered
+            without searching. Ignored for the bots in UNCACHED_BOTS. The cache key
+            holds the bot type, seed, time limit and weights, and the bot's own
+            bot_config attribute if it has one (the parameters resolved by its
+            builder, e.g. num_workers for mcts_parallel).
 
     Returns:
-        None
+        bot (pyspiel.Bot): the bot
     """
-    rng = np.random.RandomState(42)
-    if bot_type == "mcts":
-        utc = 2  # UCT's exploration constant
-        max_simulations = 1000
-        rollout_count = 1
-        evaluator = mcts.RandomRolloutEvaluator(rollout_count, rng)
-        solve = True  # Whether to use MCTS-Solver.
-        verbose = False
-        bot = mcts.MCTSBot(
-            game,
-            utc,
-            max_simulations,
-            evaluator,
-            random_state=rng,
-            solve=solve,
-            verbose=verbose,
+    build_bot = BOTS.load(bot_type)
+    bot = build_bot(
+        game,
+        player_id,
+        checkpoint_dir=breakpoint_dir,
+        seed=seed,
+        time_limit=time_limit,
+    )
+    if move_cache and bot_type not in UNCACHED_BOTS:
+        from pygame_spiel.bots.cached import CachedBot  # cached imports this module
+
+        bot_config = (
+            f"{bot_type} seed={seed} time_limit={time_limit} "
+            f"weights={breakpoint_dir}"
         )
-        return bot
-    if bot_type == "random":
-        bot = uniform_random.UniformRandomBot(1, rng)
-        return bot
-    if bot_type == "dqn":
-        # We need to load bots for both players, because the models have been trained
-        # using the script breakthrough_dqn.py, causing the issue reported in
-        # https://github.com/deepmind/open_spiel/issues/1104.
-        # Only the both related to the specified player is returned.
-        bot0 = dqn.DQNBot(game, player_id=0, checkpoint_dir=breakpoint_dir)
-        bot1 = dqn.DQNBot(game, player_id=1, checkpoint_dir=breakpoint_dir)
-        return bot0 if player_id == 0 else bot1
-    if bot_type == "human":
-        return human.HumanBot()
-    raise ValueError("Invalid bot type: %s" % bot_type)
-
-
-def download_weights(file_id, dest_folder):
+        if getattr(bot, "bot_config", None):
+            bot_config += f" {bot.bot_config}"
+        bot = CachedBot(bot, bot_config)
+    return bot
+
+
+def cache_dir() -> pathlib.Path:
+    """
+    Returns the user-level cache folder of pygame_spiel (weights, assets, ...).
+
+    It is $PYGAME_SPIEL_CACHE_DIR if set, else $XDG_CACHE_HOME/pygame_spiel,
+    else ~/.cache/pygame_spiel. The folder is not created by this function.
+
+    Returns:
+        cache_dir (Path): the cache folder
+    """
+    if os.environ.get(CACHE_DIR_ENV):
+        return pathlib.Path(os.environ[CACHE_DIR_ENV]).expanduser()
+    xdg_cache_home = os.environ.get("XDG_CACHE_HOME") or pathlib.Path("~", ".cache")
+    return pathlib.Path(xdg_cache_home, "pygame_spiel").expanduser()
+
+
+def get_breakpoint_dir(bot_type: str, game_name: str) -> t.Optional[pathlib.Path]:
     """
-    Download breakpoints from Google Drive. This function downloads the zip
-    file containing the weights, un-compress it in a specified folder and
-    delete the temporary zip file.
+    Returns the folder containing the weights of a bot, fetching them if needed.
+
+    Only bots listed in BREAKPOINTS_DRIVE_IDS for the given game have weights;
+    for every other bot type None is returned. Bots listed in BOT_WEIGHTS share
+    the weights of another bot type. Weights are kept in the local cache managed
+    by pygame_spiel.weights.
+
+    Parameters:
+        bot_type (str): Bot type (e.g. dqn)
+        game_name (str): name of the open_spiel game
+
+    Returns:
+        breakpoint_dir (Path): folder of the weights, or None
+    """
+    bot_type = BOT_WEIGHTS.get(bot_type, bot_type)
+    if bot_type not in BREAKPOINTS_DRIVE_IDS.get(game_name, {}):
+        return None
+
+    from pygame_spiel.weights import get_weights  # weights imports this module
+
+    return pathlib.Path(get_weights(bot_type, game_name), "weights_default")
+
+
+def weights_available(bot_type: str, game_name: str) -> bool:
+    """
+    Returns whether a bot can be created for a game as far as its weights are
+    concerned: True for bots without weights, else whether the weights are in the
+    local cache or may be fetched from a source (see pygame_spiel.weights).
 
     Parameters:
-        file_id (str): Google Drive file id
-        dest_folder (str): folder where the breakpoints are saved
+        bot_type (str): Bot type (e.g. dqn)
+        game_name (str): name of the open_spiel game
 
     Returns:
-        None
+        available (bool): False if get_breakpoint_dir() is bound to fail
     """
+    bot_type = BOT_WEIGHTS.get(bot_type, bot_type)
+    if bot_type not in BREAKPOINTS_DRIVE_IDS.get(game_name, {}):
+        return True
+
+    from pygame_spiel.weights import available  # weights imports this module
 
-    pathlib.Path(dest_folder).mkdir(parents=True, exist_ok=True)
-    prefix = "https://drive.google.com/uc?/export=download&id="
-    url = prefix + file_id
-    file_name, suffix = "file", ".zip"
-    dest_file_path = pathlib.Path(dest_folder, file_name).with_suffix(suffix)
-
-    # Download the zip file containing the weights
-    gdown.download(url, str(dest_file_path), quiet=False)
-    # Uncompress the zip file in dest_folder
-    shutil.unpack_archive(dest_file_path, dest_folder)
-    # Destroy the temporary zip file
-    os.remove(dest_file_path)
+    return available(bot_type, game_name)
@@ -0,0 +1,341 @@
+"""Local cache of the weights of the bots.
+
+Weights are distributed as zip archives. The cache, under utils.cache_dir(), is
+laid out as follows:
+
+    weights/objects/<sha256>/   content of the archive whose SHA-256 is <sha256>
+    weights/refs/<bot>/<game>   SHA-256 of the weights installed for a bot and game
+    weights/exports/<sha256>/   files derived from an object (see exports_dir())
+    weights/locks/              lock files serializing installs between processes
+    weights/tmp/                downloads and extractions in progress
+
+An archive is downloaded and extracted under tmp/, then moved into objects/
+with a single rename, and the ref is written last (also through a rename). A
+process interrupted at any point leaves at most garbage in tmp/, never a
+partial object or a ref to one. A lock per bot and game makes concurrent
+processes wait for the first one's install instead of downloading again.
+
+Archives are fetched from the first source that has them. Sources are tried
+in order: mirrors listed in the PYGAME_SPIEL_WEIGHTS_MIRROR environment
+variable (local folders or file:// URLs, separated by os.pathsep), then Google
+Drive, unless PYGAME_SPIEL_OFFLINE is set. Other sources can be added with
+register_source().
+
+Archives are checked against the SHA-256 pinned in settings.WEIGHTS_SHA256.
+Weights without a pinned SHA-256 are trusted on first use: the SHA-256 of the
+first archive installed from a remote source (Google Drive, and registered
+sources unless they say otherwise) is printed and recorded in its ref, and
+archives of these weights fetched later from remote sources (e.g. after the
+object was deleted) must have the same SHA-256. Local mirrors are trusted like
+the code itself.
+"""
+import abc
+import contextlib
+import hashlib
+import os
+import pathlib
+import re
+import shutil
+import tempfile
+import typing as t
+import urllib.parse
+import urllib.request
+
+from pygame_spiel.games.settings import BREAKPOINTS_DRIVE_IDS, WEIGHTS_SHA256
+from pygame_spiel.utils import cache_dir
+
+MIRROR_ENV = "PYGAME_SPIEL_WEIGHTS_MIRROR"
+OFFLINE_ENV = "PYGAME_SPIEL_OFFLINE"
+
+
+class WeightsNotFoundError(FileNotFoundError):
+    """Raised when no source can provide the weights of a bot."""
+
+
+class WeightSource(metaclass=abc.ABCMeta):
+    """Somewhere to fetch weight archives from."""
+
+    # Whether archives come from another machine: they are then only accepted if
+    # their SHA-256 is pinned or trusted on first use
+    remote = True
+
+    @abc.abstractmethod
+    def fetch(self, bot_type: str, game_name: str, dest_file: pathlib.Path) -> bool:
+        """
+        Writes the weight archive of a bot for a game to dest_file.
+
+        Parameters:
+            bot_type (str): bot type (e.g. dqn)
+            game_name (str): name of the open_spiel game
+            dest_file (Path): where to write the zip archive
+
+        Returns:
+            found (bool): False if the source does not have these weights
+        """
+
+    def has_weights(self, bot_type: str, game_name: str) -> bool:
+        """
+        Returns False if the source is known not to have the weights of a bot for
+        a game (without fetching them). By default, sources may have any weights.
+        """
+        return True
+
+
+class MirrorSource(WeightSource):
+    """Folder (or file:// URL) holding the archives as <bot>/<game>.zip."""
+
+    remote = False
+
+    def __init__(self, location: str):
+        """
+        Parameters:
+            location (str): path of the folder, or file:// URL
+        """
+        if location.startswith("file://"):
+            location = urllib.request.url2pathname(urllib.parse.urlparse(location).path)
+        self.root = pathlib.Path(location).expanduser()
+
+    def has_weights(self, bot_type: str, game_name: str) -> bool:
+        return (self.root / bot_type / f"{game_name}.zip").is_file()
+
+    def fetch(self, bot_type: str, game_name: str, dest_file: pathlib.Path) -> bool:
+        if not self.has_weights(bot_type, game_name):
+            return False
+        shutil.copyfile(self.root / bot_type / f"{game_name}.zip", dest_file)
+        return True
+
+    def __repr__(self) -> str:
+        return f"MirrorSource({str(self.root)!r})"
+
+
+class GoogleDriveSource(WeightSource):
+    """The Google Drive files listed in settings.BREAKPOINTS_DRIVE_IDS."""
+
+    def has_weights(self, bot_type: str, game_name: str) -> bool:
+        return bot_type in BREAKPOINTS_DRIVE_IDS.get(game_name, {})
+
+    def fetch(self, bot_type: str, game_name: str, dest_file: pathlib.Path) -> bool:
+        file_id = BREAKPOINTS_DRIVE_IDS.get(game_name, {}).get(bot_type)
+        if file_id is None:
+            return False
+        import gdown  # Only needed (and imported) when weights are downloaded
+
+        url = "https://drive.google.com/uc?/export=download&id=" + file_id
+        return gdown.download(url, str(dest_file), quiet=False) is not None
+
+    def __repr__(self) -> str:
+        return "GoogleDriveSource()"
+
+
+_extra_sources = []
+
+
+def register_source(source: WeightSource, first: bool = False) -> None:
+    """
+    Adds a source to the ones returned by sources().
+
+    Parameters:
+        source (WeightSource): the source
+        first (bool): if True, try it before the default ones, else after them
+    """
+    _extra_sources.append((first, source))
+
+
+def sources() -> t.List[WeightSource]:
+    """Returns the sources of weights, in the order in which they are tried."""
+    # Split on os.pathsep, except in "file://" (os.pathsep is ":" on Unix)
+    sep = re.escape(os.pathsep)
+    locations = re.findall(f"file://[^{sep}]*|[^{sep}]+", os.environ.get(MIRROR_ENV, ""))
+    mirrors = [MirrorSource(location) for location in locations]
+    defaults = mirrors
+    if not os.environ.get(OFFLINE_ENV):
+        defaults = defaults + [GoogleDriveSource()]
+    return (
+        [source for first, source in _extra_sources if first]
+        + defaults
+        + [source for first, source in _extra_sources if not first]
+    )
+
+
+def _root() -> pathlib.Path:
+    return cache_dir() / "weights"
+
+
+def _ref_path(bot_type: str, game_name: str) -> pathlib.Path:
+    return _root() / "refs" / bot_type / game_name
+
+
+def cached_weights(bot_type: str, game_name: str) -> t.Optional[pathlib.Path]:
+    """
+    Returns the folder of the installed weights of a bot, or None.
+
+    Weights installed with another SHA-256 than the one pinned in
+    settings.WEIGHTS_SHA256 are ignored.
+    """
+    try:
+        sha256 = _ref_path(bot_type, game_name).read_text().strip()
+    except FileNotFoundError:
+        return None
+    expected = WEIGHTS_SHA256.get(game_name, {}).get(bot_type)
+    if expected is not None and sha256 != expected:
+        return None
+    folder = _root() / "objects" / sha256
+    return folder if folder.is_dir() else None
+
+
+def available(bot_type: str, game_name: str) -> bool:
+    """
+    Returns whether the weights of a bot are installed, or may be fetched from
+    one of the sources (without fetching them).
+    """
+    return cached_weights(bot_type, game_name) is not None or any(
+        source.has_weights(bot_type, game_name) for source in sources()
+    )
+
+
+def exports_dir(weights_dir: t.Union[str, pathlib.Path]) -> pathlib.Path:
+    """
+    Returns the folder where files derived from some weights are written (e.g. the
+    .npz exports of the DQN Q-networks), so that installed objects are never
+    modified. The folder is not created by this function.
+
+    Parameters:
+        weights_dir (Path): folder of weights, e.g. a subfolder of an installed
+            object, or a folder of checkpoints outside of the cache
+
+    Returns:
+        exports_dir (Path): weights/exports/<sha256>/<subfolder> for a subfolder of
+            the object <sha256>, else weights/exports/<digest of the files of
+            weights_dir>
+    """
+    folder = pathlib.Path(weights_dir).resolve()
+    objects = (_root() / "objects").resolve()
+    if objects in folder.parents:
+        return _root() / "exports" / folder.relative_to(objects)
+    digest = hashlib.sha256()
+    for path in sorted(path for path in folder.rglob("*") if path.is_file()):
+        name = path.relative_to(folder).as_posix()
+        digest.update(f"{name} {_sha256(path)}\n".encode())
+    return _root() / "exports" / digest.hexdigest()
+
+
+def get_weights(bot_type: str, game_name: str) -> pathlib.Path:
+    """
+    Returns the folder of the weights of a bot, installing them if needed.
+
+    Parameters:
+        bot_type (str): bot type (e.g. dqn)
+        game_name (str): name of the open_spiel game
+
+    Returns:
+        folder (Path): folder with the content of the weight archive
+    """
+    folder = cached_weights(bot_type, game_name)
+    if folder is not None:
+        return folder
+    with _lock(f"{bot_type}-{game_name}"):
+        # Another process may have installed the weights while we were waiting
+        folder = cached_weights(bot_type, game_name)
+        if folder is None:
+            folder = _install(bot_type, game_name)
+    return folder
+
+
+def _install(bot_type: str, game_name: str) -> pathlib.Path:
+    """Fetches, verifies and installs the weights. Must be called with the lock."""
+    tmp_root = _root() / "tmp"
+    tmp_root.mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryDirectory(dir=tmp_root) as tmp:
+        archive = pathlib.Path(tmp, "weights.zip")
+        expected = WEIGHTS_SHA256.get(game_name, {}).get(bot_type)
+        tried = []
+        for source in sources():
+            tried.append(source)
+            print(f"Fetching weights for bot {bot_type} and game {game_name}: {source}")
+            try:
+                if source.fetch(bot_type, game_name, archive):
+                    break
+            except Exception as e:  # A failing source must not hide the next ones
+                print(f"Could not fetch the weights from {source}: {e}")
+        else:
+            raise WeightsNotFoundError(
+                f"No weights for bot {bot_type} and game {game_name} in {tried}"
+            )
+
+        sha256 = _sha256(archive)
+        if expected is not None and sha256 != expected:
+            raise ValueError(
+                f"SHA-256 mismatch for the weights of bot {bot_type} and game "
+                f"{game_name}: expected {expected}, got {sha256}"
+            )
+        if expected is None and source.remote:
+            # Trust on first use: the SHA-256 recorded in the ref by the first
+            # install is the expected one from then on
+            ref = _ref_path(bot_type, game_name)
+            trusted = ref.read_text().strip() if ref.is_file() else None
+            if trusted is not None and sha256 != trusted:
+                raise ValueError(
+                    f"SHA-256 mismatch for the weights of bot {bot_type} and game "
+                    f"{game_name} from {source}: expected {trusted} (trusted on "
+                    f"first use, recorded in {ref}), got {sha256}"
+                )
+            if trusted is None:
+                print(
+                    f"No SHA-256 is pinned in settings.WEIGHTS_SHA256 for the weights "
+                    f"of bot {bot_type} and game {game_name}: trusting the archive "
+                    f"from {source} on first use, its SHA-256 is {sha256}"
+                )
+
+        folder = _root() / "objects" / sha256
+        if not folder.is_dir():
+            extracted = pathlib.Path(tmp, "extracted")
+            shutil.unpack_archive(archive, extracted, format="zip")
+            folder.parent.mkdir(parents=True, exist_ok=True)
+            os.rename(extracted, folder)
+
+        ref = _ref_path(bot_type, game_name)
+        ref.parent.mkdir(parents=True, exist_ok=True)
+        tmp_ref = pathlib.Path(tmp, "ref")
+        tmp_ref.write_text(sha256 + "\n")
+        os.replace(tmp_ref, ref)
+    return folder
+
+
+def _sha256(path: pathlib.Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@contextlib.contextmanager
+def _lock(name: str) -> t.Iterator[None]:
+    """Exclusive lock shared between processes, held while the context is active."""
+    lock_dir = _root() / "locks"
+    lock_dir.mkdir(parents=True, exist_ok=True)
+    with open(lock_dir / f"{name}.lock", "a+b") as f:
+        if os.name == "nt":
+            import msvcrt
+
+            # LK_LOCK gives up after 10 seconds: retry until the lock is acquired
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    pass
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
@@ -24,11 +24,15 @@ setup(
     ],
     install_requires=read_requirements(),
     include_package_data=True,
-    package_data={'': ['pygame_spiel/images/*']},
+    package_data={'pygame_spiel': ['images/*/*.png', 'bots/tables/*.npy']},
     python_requires=">=3.9.1",
     entry_points={
         'console_scripts': [
-            'pygame_spiel = pygame_spiel.main:pygame_spiel'
+            'pygame_spiel = pygame_spiel.main:pygame_spiel',
+            'pygame_spiel_arena = pygame_spiel.arena:main',
+            'pygame_spiel_replay = pygame_spiel.records:main',
+            'pygame_spiel_selfplay = pygame_spiel.selfplay:main',
+            'pygame_spiel_train_dqn = pygame_spiel.bots.dqn_train:main',
         ]
     }
 )
\ No newline at end of file